@@ -27,6 +27,10 @@ HOVER_RAISE = 14
 # animação do hover
 HOVER_SMOOTH_SPEED = 14.0  # maior = mais rápido (suave ainda)
 
+# selo de "cabe no campo?" (nº de células válidas, mantido pela Grid)
+BADGE_OK = (255, 230, 120)
+BADGE_SEM_LUGAR = (235, 70, 70)
+
 
 # ============================================================
 # HELPERS
@@ -66,6 +70,9 @@ class Banco:
         self._hover_scale = 1.0
         self._last_ms = None
 
+        # id(cartucho) -> nº de células válidas na grid (a Grid atualiza quando o campo muda)
+        self.jogaveis = {}
+
         # fonte cache
         self._fonte_carac = pygame.font.Font(os.path.join("Fontes", "FontePadrão.ttf"), 14)
 
@@ -208,6 +215,22 @@ class Banco:
                 self._hover_idx = i
                 break
 
+    def _draw_jogavel(self, surf, cartucho, rect):
+        n = self.jogaveis.get(id(cartucho))
+        if n is None:
+            return
+        if n == 0:
+            escurece = pygame.Surface(rect.size, pygame.SRCALPHA)
+            escurece.fill((0, 0, 0, 120))
+            surf.blit(escurece, rect.topleft)
+            draw_round_rect(surf, BADGE_SEM_LUGAR, rect, 3, 10)
+            txt = self._fonte_carac.render("sem lugar", True, BADGE_SEM_LUGAR)
+        else:
+            txt = self._fonte_carac.render(f"{n} célula{'s' if n != 1 else ''}", True, (20, 20, 24))
+        pill = txt.get_rect(bottomleft=(rect.x + 6, rect.bottom - 26)).inflate(10, 4)
+        draw_round_rect(surf, (20, 20, 24) if n == 0 else BADGE_OK, pill, 0, 8)
+        surf.blit(txt, txt.get_rect(center=pill.center))
+
     def draw(self, surf, font_title):
         self._recalc_layout()
         self.recompactar()
@@ -248,6 +271,7 @@ class Banco:
                 continue
             c.set_rect(self.slot_rects[i])
             c.draw(surf, font_title, self._fonte_carac, compact=False)
+            self._draw_jogavel(surf, c, c.rect)
 
         # desenha hover por último e ampliada (por cima) — agora animada
         if self._hover_idx is not None and 0 <= self._hover_idx < len(cartas):
@@ -265,4 +289,5 @@ class Banco:
                 old = c.rect.copy()
                 c.set_rect(scaled)
                 c.draw(surf, font_title, self._fonte_carac, compact=False)
+                self._draw_jogavel(surf, c, scaled)
                 c.set_rect(old)
@@ -1,6 +1,8 @@
 import math
 import pygame
 
+from CombatMath import CombatLog, KINDS
+
 DANO_CORES = {
     "fisico": (255, 140, 40),
     "magico": (175, 70, 255),
@@ -69,7 +71,38 @@ def draw_bola_defesa(tela, pos, raio, cor, valor=None):
     _draw_valor(tela, (x, y), valor, _cor_texto_contraste(cor))
 
 
-def build_anim_steps(logs):
+def _steps_do_log(log, inicio):
+    nomes = log.nomes
+    return [
+        {
+            "attacker": nomes[a],
+            "defender": nomes[d],
+            "kind": KINDS[k],
+            "hit": bool(h),
+            "damage": dano,
+            "raw_damage": raw,
+            "defense_block": bloq,
+            "heal": heal,
+            "applied": False,
+        }
+        for a, d, k, h, dano, heal, raw, bloq in zip(
+            log.attacker[inicio:],
+            log.defender[inicio:],
+            log.kind[inicio:],
+            log.hit[inicio:],
+            log.damage[inicio:],
+            log.heal[inicio:],
+            log.raw_damage[inicio:],
+            log.defense_block[inicio:],
+        )
+    ]
+
+
+def build_anim_steps(logs, inicio=0):
+    # CombatLog: lê direto das colunas (inicio = primeira linha do round)
+    if isinstance(logs, CombatLog):
+        return _steps_do_log(logs, inicio)
+
     steps = []
     for nome_a, nome_d, info_hit in logs:
         steps.append(
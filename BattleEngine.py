@@ -0,0 +1,233 @@
+# BattleEngine.py
+import random
+
+from Tabuleiro import Tabuleiro
+from Player import PlayerBatalha, PlayerEstrategista, ATRIBUTOS
+from CombatMath import CombatLog, CombatProfile, execute_round
+
+# ============================================================
+# MOTOR DA BATALHA (sem tela)
+# Regras de TelaBatalha sem timers nem desenho: montagem dos players,
+# "escolha" (lançar dados) -> "pre_dano" (somas -> intensificador) ->
+# "animacao" (execute_round). A tela só cuida de tempo/animação e chama
+# os mesmos métodos; a simulação headless roda tudo em sequência.
+# ============================================================
+FASE_ESCOLHA_MS = 8000
+FASE_PRE_DANO_MS = 12000
+ANIM_STEP_MS = 4200
+BONUS_VITORIA = 8
+MAX_RONDAS = 200
+
+
+def preparar_players(dados_player=None, rng=None):
+    """
+    Monta (p1_compartilhado, p1, p2) a partir do estado do estrategista,
+    com o inimigo sorteado em volta dos stats do player (igual sempre foi na tela).
+    """
+    rng = rng if rng is not None else random
+
+    p1_compartilhado = PlayerEstrategista("PLAYER", lado="aliado", ouro_inicial=0)
+    if isinstance(dados_player, dict):
+        p1_compartilhado.carregar_estado_compartilhado(dados_player)
+
+    nome_player = str(p1_compartilhado.nome or "PLAYER")
+    nivel_player = 2
+    if isinstance(dados_player, dict):
+        nivel_player = max(1, int(dados_player.get("nivel", nivel_player) or nivel_player))
+    p1 = PlayerBatalha(nome_player, lado="aliado", nivel=nivel_player)
+    p2 = PlayerBatalha("Inimigo", lado="inimigo", nivel=p1.nivel)
+
+    vida_player = max(1, int(p1_compartilhado.vida_max or 1))
+    p1.vida_max = vida_player
+    p1.vida = max(0, min(vida_player, int(p1_compartilhado.vida or vida_player)))
+
+    vida_ref = max(200, int(p1_compartilhado.vida_max or 0))
+    p2.vida_max = int(vida_ref * rng.uniform(0.85, 1.15))
+    p2.vida = p2.vida_max
+
+    ativos_aliados = [a for a in ATRIBUTOS if p1_compartilhado.dados_selecionados.get(a)]
+    for attr in ativos_aliados[:p1.max_ativos()]:
+        p1.toggle_attr_ativo(attr)
+    if not p1.ativos_lista():
+        p1.toggle_attr_ativo("regeneracao")
+        p1.toggle_attr_ativo("dano_fisico")
+        p1.toggle_attr_ativo("dano_magico")
+
+    for attr in ATRIBUTOS:
+        base_player = int(p1_compartilhado.totais.get(attr, 0))
+        p1.set_base(attr, base_player)
+        if base_player <= 0:
+            p2.set_base(attr, rng.randint(0, 40))
+        else:
+            p2.set_base(attr, int(base_player * rng.uniform(0.8, 1.2)))
+
+    p1.ouro = int(p1_compartilhado.ouro)
+    p1.set_percentuais(p1_compartilhado.percentuais)
+    p2.set_percentuais(p1_compartilhado.percentuais)
+
+    ativos_inimigos = rng.sample(ATRIBUTOS, k=min(p2.max_ativos(), len(ATRIBUTOS)))
+    for attr in ativos_inimigos:
+        p2.toggle_attr_ativo(attr)
+
+    return p1_compartilhado, p1, p2
+
+
+class MotorBatalha:
+    def __init__(self, p1, p2, *, tabuleiro=None, rng=None, com_log=True):
+        self.p1 = p1
+        self.p2 = p2
+        self.rng = rng if rng is not None else random
+        self.tabuleiro = tabuleiro if tabuleiro is not None else Tabuleiro(None, rng=self.rng)
+
+        self.fase = "escolha"
+        self.ronda = 0
+        self.vencedor = None  # player vencedor (ou None)
+        # com_log=False: ninguém lê os passos (simulação em lote), execute_round nem registra
+        self.log = CombatLog() if com_log else None
+
+        self.last_somas = {
+            "aliado": {a: 0 for a in ATRIBUTOS},
+            "inimigo": {a: 0 for a in ATRIBUTOS},
+        }
+        self._versao_somas = None  # versao_somas do tabuleiro já aplicada
+        self._perfis = [None, None]  # CombatProfile de p1/p2, refeito só do lado cujo intensificador mudou
+
+    # ----------------------------
+    # fases
+    # ----------------------------
+    def iniciar_round(self, agora=0, *, instantaneo=False):
+        """Começa a "escolha": limpa o tabuleiro, enche as mãos e o inimigo já lança."""
+        tab = self.tabuleiro
+        tab.limpar_tabuleiro()
+        tab.mao_aliada = self.p1.get_dados_ativos_para_lancar()
+        tab.mao_inimiga = self.p2.get_dados_ativos_para_lancar()
+        tab.set_lado_ativo("aliado")
+        if instantaneo:
+            tab.lancar_direto("inimigo")
+        else:
+            tab.lancar_automatico("inimigo", agora)
+        tab.set_lado_ativo("aliado")
+        self.fase = "escolha"
+
+    def encerrar_escolha(self, agora=0, *, instantaneo=False):
+        """Fim do tempo de escolha: o que sobrou na mão do player é lançado sozinho."""
+        tab = self.tabuleiro
+        if tab.mao_aliada:
+            if instantaneo:
+                tab.lancar_direto("aliado")
+            else:
+                tab.lancar_automatico("aliado", agora)
+        self.fase = "pre_dano"
+
+    def aplicar_somas(self, agora=0):
+        """Somas fixas do tabuleiro -> set_intensificador (só o que mudou)."""
+        versao = self.tabuleiro.versao_somas
+        if versao == self._versao_somas:
+            return
+        self._versao_somas = versao
+        somas = self.tabuleiro.get_somas_por_lado()
+        for i, (lado, player) in enumerate((("aliado", self.p1), ("inimigo", self.p2))):
+            ultimo = self.last_somas[lado]
+            for attr in ATRIBUTOS:
+                novo = int(somas[lado].get(attr, 0))
+                if novo != ultimo[attr]:
+                    player.set_intensificador(attr, novo, agora)
+                    ultimo[attr] = novo
+                    self._perfis[i] = None
+
+    def perfis(self):
+        """
+        (CombatProfile p1, CombatProfile p2) prontos pro round. Base e percentuais
+        não mudam na batalha, então só são refeitos quando aplicar_somas mexe
+        num intensificador (quem mudar stats por fora chama invalidar_perfis).
+        """
+        perfis = self._perfis
+        if perfis[0] is None:
+            perfis[0] = CombatProfile.from_player(self.p1)
+        if perfis[1] is None:
+            perfis[1] = CombatProfile.from_player(self.p2)
+        return perfis[0], perfis[1]
+
+    def invalidar_perfis(self):
+        self._perfis = [None, None]
+
+    def resolver_round(self):
+        """Roda o round (altera a vida dos players) e passa pra "animacao"."""
+        pa, pd = self.perfis()
+        resultado = execute_round(self.p1, self.p2, pa, pd, log=self.log if self.log is not None else False, rng=self.rng)
+        self.ronda += 1
+        self.fase = "animacao"
+        return resultado
+
+    def checar_vencedor(self):
+        if self.p1.vida <= 0:
+            self.vencedor = self.p2
+        elif self.p2.vida <= 0:
+            self.vencedor = self.p1
+        return self.vencedor
+
+    # ----------------------------
+    # headless
+    # ----------------------------
+    def simular(self, max_rondas=MAX_RONDAS):
+        """Batalha inteira sem tela nem timers. Devolve um resumo estruturado."""
+        historico = []
+        while self.vencedor is None and self.ronda < max_rondas:
+            self.iniciar_round(instantaneo=True)
+            self.encerrar_escolha(instantaneo=True)
+            self.aplicar_somas()
+            self.resolver_round()
+            historico.append({
+                "intens": (dict(self.p1.intens), dict(self.p2.intens)),
+                "vida": (int(self.p1.vida), int(self.p2.vida)),
+            })
+            self.checar_vencedor()
+
+        return {
+            "vencedor": self.vencedor.nome if self.vencedor is not None else None,
+            "vitoria_player": self.vencedor is self.p1,
+            "rondas": self.ronda,
+            "vida": (int(self.p1.vida), int(self.p2.vida)),
+            "historico": historico,
+            "log": self.log,
+        }
+
+
+def _checar_estado(dados_player):
+    # sem estado o player sai com vida 1 e toda batalha acaba no 1º round
+    if not isinstance(dados_player, dict) or int(dados_player.get("vida_max", 0) or 0) <= 0:
+        raise ValueError("dados_player: estado de exportar_estado_compartilhado com vida_max > 0")
+
+
+def simular_batalha(dados_player, *, seed=None, max_rondas=MAX_RONDAS, com_log=True):
+    """
+    Uma batalha completa headless; mesma seed = mesma batalha (com_log=False: "log" sai None).
+    `dados_player`: dict de PlayerEstrategista.exportar_estado_compartilhado.
+    """
+    _checar_estado(dados_player)
+    rng = random.Random(seed)
+    _compartilhado, p1, p2 = preparar_players(dados_player, rng)
+    return MotorBatalha(p1, p2, rng=rng, com_log=com_log).simular(max_rondas)
+
+
+def simular_batalhas(dados_player, n=1000, *, seed=0, max_rondas=MAX_RONDAS):
+    """
+    n batalhas independentes (seed, seed+1, ...). Retorna a lista de resultados
+    e um resumo com taxa de vitória e média de rounds. Os golpes não são
+    registrados (ninguém lê o log de milhares de batalhas).
+    Cada batalha roda o tabuleiro de dados de verdade: ~900-1100 batalhas/s num
+    núcleo. Pra stats fixos (sem dados), CombatSim.simular_lote faz milhares
+    de lutas por chamada.
+    """
+    resultados = [simular_batalha(dados_player, seed=seed + i, max_rondas=max_rondas, com_log=False) for i in range(n)]
+    total = max(1, len(resultados))
+    vitorias = sum(1 for r in resultados if r["vitoria_player"])
+    sem_vencedor = sum(1 for r in resultados if r["vencedor"] is None)
+    return {
+        "resultados": resultados,
+        "resumo": {
+            "vitoria_player": vitorias / total,
+            "sem_vencedor": sem_vencedor / total,
+            "rondas_media": sum(r["rondas"] for r in resultados) / total,
+        },
+    }
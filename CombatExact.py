@@ -0,0 +1,425 @@
+# CombatExact.py
+import itertools
+import math
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+
+import numpy as np
+
+from CombatSim import _perfil, _ataque, _sequencia_round
+
+# ============================================================
+# ROUND EXATO
+# A árvore de execute_round é pequena (até 4 ataques, cada um erra/acerta/crita),
+# então dá pra enumerar tudo e devolver a distribuição exata das vidas.
+# Memoizado pelos CombatProfile (hash = tupla de stats): redesenhar a prévia todo frame sai de graça.
+# ============================================================
+CACHE_ROUNDS = 8192
+
+
+@lru_cache(maxsize=64)
+def _modelo_round(pa, pb):
+    segundo, seq = _sequencia_round(pa, pb)
+    perfis = (pa, pb)
+    passos = []
+    for att_i, kind, cond in seq:
+        at = _ataque(perfis[att_i], perfis[1 - att_i], kind)
+        ramos = []
+        p_miss = 1.0 - at["p_hit"]
+        p_crit = at["p_hit"] * at["p_crit"]
+        p_norm = at["p_hit"] - p_crit
+        if p_miss > 0:
+            ramos.append((p_miss, 0, 0))
+        if p_norm > 0:
+            ramos.append((p_norm, at["dano"], at["heal"]))
+        if p_crit > 0:
+            ramos.append((p_crit, at["dano_crit"], at["heal_crit"]))
+        passos.append((att_i, cond, tuple(ramos)))
+    regen = (pa.regen, pb.regen)
+    vida_max = (pa.vida_max, pb.vida_max)
+    return segundo, tuple(passos), regen, vida_max
+
+
+def _enumera_round(pa, pb, vida_a, vida_b):
+    segundo, passos, regen, vida_max = _modelo_round(pa, pb)
+
+    # estado: (vida_a, vida_b, dentro_do_bloco_magico) -> prob
+    estados = {(vida_a, vida_b, False): 1.0}
+    for att_i, cond, ramos in passos:
+        def_i = 1 - att_i
+        novos = {}
+        for (va, vb, bloco), p in estados.items():
+            vidas = [va, vb]
+            if cond == "segundo":
+                ativo = vidas[segundo] > 0
+            elif cond == "ambos":
+                ativo = va > 0 and vb > 0
+                bloco = ativo
+            elif cond == "bloco":
+                ativo = bloco and vidas[segundo] > 0
+            else:
+                ativo = True
+
+            if not ativo:
+                k = (va, vb, bloco)
+                novos[k] = novos.get(k, 0.0) + p
+                continue
+
+            for p_ramo, dano, heal in ramos:
+                v = [va, vb]
+                if dano > 0:
+                    v[def_i] = max(0, v[def_i] - dano)
+                if heal > 0:
+                    v[att_i] = min(vida_max[att_i], v[att_i] + heal)
+                k = (v[0], v[1], bloco)
+                novos[k] = novos.get(k, 0.0) + p * p_ramo
+        estados = novos
+
+    final = {}
+    for (va, vb, _bloco), p in estados.items():
+        if regen[0] > 0 and va > 0:
+            va = min(vida_max[0], va + regen[0])
+        if regen[1] > 0 and vb > 0:
+            vb = min(vida_max[1], vb + regen[1])
+        final[(va, vb)] = final.get((va, vb), 0.0) + p
+    return final
+
+
+_distribuicao = lru_cache(maxsize=CACHE_ROUNDS)(_enumera_round)
+
+
+def distribuicao_round(a, b):
+    """
+    Distribuição exata de (vida_a, vida_b) após um execute_round(a, b).
+    a/b: CombatProfile, players ou dicts aceitos por CombatSim.
+    Retorna {(vida_a, vida_b): probabilidade}.
+    """
+    pa, pb = _perfil(a), _perfil(b)
+    return _distribuicao(pa, pb, pa.vida, pb.vida)
+
+
+@lru_cache(maxsize=CACHE_ROUNDS)
+def _previa(pa, pb, vida_a, vida_b):
+    dist = _distribuicao(pa, pb, vida_a, vida_b)
+    esp_a = esp_b = ko_a = ko_b = 0.0
+    for (va, vb), p in dist.items():
+        esp_a += va * p
+        esp_b += vb * p
+        if va <= 0:
+            ko_a += p
+        if vb <= 0:
+            ko_b += p
+    return {
+        "vida_esperada": (esp_a, esp_b),
+        "prob_ko": (ko_a, ko_b),
+        "vida_min": (min(va for va, _ in dist), min(vb for _, vb in dist)),
+        "vida_max": (max(va for va, _ in dist), max(vb for _, vb in dist)),
+    }
+
+
+def previa_round(a, b, vida_a=None, vida_b=None):
+    """
+    Resumo exato do próximo round para a fase "pre_dano":
+    vida esperada, chance de KO e faixa min/max de cada lado (índice 0 = a, 1 = b).
+    vida_a/vida_b: vidas atuais quando a/b são perfis guardados (ex.: MotorBatalha.perfis()).
+    """
+    pa, pb = _perfil(a), _perfil(b)
+    va = pa.vida if vida_a is None else int(vida_a)
+    vb = pb.vida if vida_b is None else int(vida_b)
+    return _previa(pa, pb, va, vb)
+
+
+# ============================================================
+# BATALHA COMPLETA (cadeia de Markov sobre (vida_a, vida_b))
+# Estados com os dois vivos são transientes; vida 0 de um lado é absorvente.
+# Para vida_max grande cada lado só guarda alguns níveis de vida (_niveis); uma
+# vida que cai entre dois níveis vai pros dois vizinhos com pesos que mantêm a
+# média (morte é sempre exata, e o nível mais baixo é vida 1: nada arredonda pra
+# cima). Se toda variação de vida do round é múltipla de um passo grande
+# (dano sem acaso de erro/crit), os níveis seguem esse passo e as transições
+# caem em cheio (só a cura batendo em vida_max no meio do round ainda divide).
+# Regeneração e vampirismo já entram nas transições do round.
+#
+# Erro medido contra CombatSim.simular_lote (400k lutas) com BALDES_PADRAO:
+# exato com dano fixo; com erro/crit, até ~1 ponto percentual em "vitoria_a"
+# (tipicamente 0.5), sem sinal fixo: a vida espalhada entre níveis muda quem
+# morre primeiro perto do fim. Mais baldes não garante erro menor.
+# ============================================================
+BALDES_PADRAO = 48
+MAX_ITER = 20000
+TOL = 1e-12
+
+
+def _variacoes(pa, pb):
+    """(variação de vida de a, de b) de cada caminho do round, com os dois vivos no fim."""
+    _segundo, _passos, regen, _vida_max = _modelo_round(pa, pb)
+    out = []
+    for _p, caminho in _folhas_round(pa, pb):
+        d = [regen[0], regen[1]]
+        for att_i, _cond, dano, heal in caminho:
+            d[1 - att_i] -= dano
+            d[att_i] += heal
+        out.append((d[0], d[1]))
+    return out
+
+
+def _niveis(vida_max, baldes, variacoes):
+    """
+    Níveis de vida de um lado (crescente, de 1 a vida_max). Se o mdc das
+    variações do round é >= vida_max/baldes, vida_max - k*mdc (toda transição
+    cai num nível); senão, `baldes` níveis igualmente espaçados.
+    """
+    vida_max = max(1, int(vida_max))
+    baldes = max(2, int(baldes))
+    if vida_max <= baldes:
+        return np.arange(1, vida_max + 1)
+    passo = math.gcd(*(abs(int(d)) for d in variacoes)) or vida_max
+    if passo * baldes >= vida_max:
+        niveis = np.arange(vida_max, 0, -passo)[::-1]
+        return niveis if niveis[0] == 1 else np.concatenate(([1], niveis))
+    return np.unique(np.rint(np.linspace(1, vida_max, baldes)).astype(np.int64))
+
+
+def _vizinhos(hp, niveis):
+    """Níveis vizinhos de cada vida (> 0) e pesos que mantêm a média: (lo, peso_lo, hi, peso_hi)."""
+    hi = np.minimum(np.searchsorted(niveis, hp), len(niveis) - 1)
+    lo = np.maximum(hi - 1, 0)
+    base, topo = niveis[lo], niveis[hi]
+    exato = topo <= hp  # caiu num nível (ou acima do último)
+    peso_hi = np.where(exato, 1.0, (hp - base) / np.maximum(1, topo - base))
+    return np.where(exato, hi, lo), 1.0 - peso_hi, hi, peso_hi
+
+
+def _folhas_round(pa, pb):
+    """Todos os caminhos erra/acerta/crita do round: [(prob, ((att_i, cond, dano, heal), ...))]."""
+    _segundo, passos, _regen, _vida_max = _modelo_round(pa, pb)
+    folhas = []
+    for escolha in itertools.product(*(ramos for _att, _cond, ramos in passos)):
+        p = 1.0
+        caminho = []
+        for (att_i, cond, _ramos), (p_ramo, dano, heal) in zip(passos, escolha):
+            p *= p_ramo
+            caminho.append((att_i, cond, dano, heal))
+        if p > 0:
+            folhas.append((p, tuple(caminho)))
+    return folhas
+
+
+def _aplicar_folha(pa, pb, caminho, hp_a, hp_b):
+    """Aplica um caminho do round em todos os estados de uma vez (mesmas regras de _enumera_round)."""
+    segundo, _passos, regen, vida_max = _modelo_round(pa, pb)
+    v = [hp_a.copy(), hp_b.copy()]
+    bloco = None
+    for att_i, cond, dano, heal in caminho:
+        def_i = 1 - att_i
+        if cond == "segundo":
+            ativo = v[segundo] > 0
+        elif cond == "ambos":
+            ativo = (v[0] > 0) & (v[1] > 0)
+            bloco = ativo
+        elif cond == "bloco":
+            ativo = bloco & (v[segundo] > 0)
+        else:
+            ativo = None
+        if dano > 0:
+            novo = np.maximum(0, v[def_i] - dano)
+            v[def_i] = novo if ativo is None else np.where(ativo, novo, v[def_i])
+        if heal > 0:
+            novo = np.minimum(vida_max[att_i], v[att_i] + heal)
+            v[att_i] = novo if ativo is None else np.where(ativo, novo, v[att_i])
+    for i in (0, 1):
+        if regen[i] > 0:
+            v[i] = np.where(v[i] > 0, np.minimum(vida_max[i], v[i] + regen[i]), v[i])
+    return v[0], v[1]
+
+
+@lru_cache(maxsize=32)
+def _resolver_markov(pa, pb, baldes, max_iter=MAX_ITER):
+    variacoes = _variacoes(pa, pb)
+    niv_a = _niveis(pa.vida_max, baldes, [da for da, _db in variacoes])
+    niv_b = _niveis(pb.vida_max, baldes, [db for _da, db in variacoes])
+    na, nb = len(niv_a), len(niv_b)
+
+    # índice transiente: ia * nb + ib (ia, ib = posição nos níveis de cada lado)
+    total = na * nb
+    ia, ib = np.meshgrid(np.arange(na), np.arange(nb), indexing="ij")
+    hp_a, hp_b = niv_a[ia.ravel()], niv_b[ib.ravel()]
+    estados = np.arange(total)
+
+    ganha = np.zeros(total)   # prob de ir direto pra b morto
+    perde = np.zeros(total)   # prob de ir direto pra a morto
+    src, dst, prob = [], [], []
+
+    for p, caminho in _folhas_round(pa, pb):
+        va, vb = _aplicar_folha(pa, pb, caminho, hp_a, hp_b)
+        morto_b = vb <= 0
+        morto_a = (va <= 0) & ~morto_b
+        ganha += p * morto_b
+        perde += p * morto_a
+
+        vivos = ~(morto_a | morto_b)
+        s = estados[vivos]
+        a_lo, a_wlo, a_hi, a_whi = _vizinhos(va[vivos], niv_a)
+        b_lo, b_wlo, b_hi, b_whi = _vizinhos(vb[vivos], niv_b)
+        for ja, wa in ((a_lo, a_wlo), (a_hi, a_whi)):
+            for jb, wb in ((b_lo, b_wlo), (b_hi, b_whi)):
+                w = p * wa * wb
+                m = w > 0
+                src.append(s[m])
+                dst.append(ja[m] * nb + jb[m])
+                prob.append(w[m])
+
+    # junta arestas repetidas (src, dst)
+    if src:
+        chave = np.concatenate(src) * total + np.concatenate(dst)
+        chave, inv = np.unique(chave, return_inverse=True)
+        prob = np.bincount(inv, weights=np.concatenate(prob))
+        src, dst = chave // total, chave % total
+    else:
+        src = dst = np.zeros(0, dtype=np.int64)
+        prob = np.zeros(0)
+
+    def passo(v):
+        return np.bincount(src, weights=prob * v[dst], minlength=total)
+
+    # vitória: w = ganha + P w ; derrota: l = perde + P l
+    w = ganha.copy()
+    l = perde.copy()
+    for _ in range(max_iter):
+        w2 = ganha + passo(w)
+        l2 = perde + passo(l)
+        delta = max(np.abs(w2 - w).max(), np.abs(l2 - l).max())
+        w, l = w2, l2
+        if delta <= TOL:
+            break
+
+    # rondas só das lutas que terminam: g = E[T; fim] = fim_direto + P (fim + g)
+    fim = w + l
+    c = ganha + perde + passo(fim)
+    g = c.copy()
+    for _ in range(max_iter):
+        g2 = c + passo(g)
+        delta = np.abs(g2 - g).max()
+        g = g2
+        if delta <= TOL * max(1.0, g.max()):
+            break
+    with np.errstate(divide="ignore", invalid="ignore"):
+        e = np.where(fim > 0, g / fim, np.inf)
+
+    forma = (na, nb)
+    return {
+        "niveis": (niv_a, niv_b),
+        "vitoria_a": w.reshape(forma),
+        "vitoria_b": l.reshape(forma),
+        "rondas": e.reshape(forma),
+    }
+
+
+def _consulta(tabela, chave, vida_a, vida_b):
+    if vida_b <= 0:
+        return 1.0 if chave == "vitoria_a" else 0.0
+    if vida_a <= 0:
+        return 1.0 if chave == "vitoria_b" else 0.0
+    niv_a, niv_b = tabela["niveis"]
+    arr = tabela[chave]
+    a_lo, a_wlo, a_hi, a_whi = _vizinhos(np.array([vida_a]), niv_a)
+    b_lo, b_wlo, b_hi, b_whi = _vizinhos(np.array([vida_b]), niv_b)
+    val = 0.0
+    for ia, wa in ((a_lo[0], a_wlo[0]), (a_hi[0], a_whi[0])):
+        for ib, wb in ((b_lo[0], b_wlo[0]), (b_hi[0], b_whi[0])):
+            w = float(wa * wb)
+            if w > 0:
+                val += w * float(arr[ia, ib])
+    return val
+
+
+def prob_vitoria(a, b, *, baldes=BALDES_PADRAO, max_iter=MAX_ITER):
+    """
+    Resolve a batalha inteira de a (atacante) x b (defensor) como cadeia de Markov.
+
+    Retorna {"vitoria_a", "vitoria_b", "sem_fim", "rondas_esperadas"} a partir das
+    vidas atuais; "rondas_esperadas" conta só as lutas que terminam. A tabela por stats fica memoizada: consultar de novo com outras
+    vidas (ex.: indicador "win %" durante a batalha) é só uma leitura.
+    `baldes` limita os níveis de vida de cada lado (vida_max <= baldes é exato;
+    erro esperado no comentário da seção).
+    `max_iter` limita as rondas somadas; o que não termina até lá sai em "sem_fim".
+    """
+    pa, pb = _perfil(a), _perfil(b)
+    return _resumo(_resolver_markov(pa, pb, int(baldes), int(max_iter)), pa.vida, pb.vida)
+
+
+def _resumo(tabela, va, vb):
+    win = _consulta(tabela, "vitoria_a", va, vb)
+    lose = _consulta(tabela, "vitoria_b", va, vb)
+    return {
+        "vitoria_a": win,
+        "vitoria_b": lose,
+        "sem_fim": max(0.0, 1.0 - win - lose),
+        "rondas_esperadas": _consulta(tabela, "rondas", va, vb),
+    }
+
+
+# ============================================================
+# INDICADOR "WIN %" (fora do frame)
+# Cada dado que pousa muda os stats e pede uma tabela nova; resolver a cadeia
+# no frame trava a tela (empates de regeneração chegam a segundos). A tabela
+# sai numa thread, guardada por stats (LRU); trocar só as vidas é leitura.
+# ============================================================
+CACHE_INDICADOR = 32
+
+
+class PreviaVitoria:
+    """
+    atualizar(pa, pb) a cada frame é barato (só enfileira stats novos);
+    consultar(pa, pb, vida_a, vida_b) devolve o resumo de prob_vitoria ou None
+    enquanto a thread não terminou aqueles stats. fechar() encerra a thread.
+    """
+
+    def __init__(self, *, baldes=BALDES_PADRAO, max_iter=MAX_ITER):
+        self.baldes = int(baldes)
+        self.max_iter = int(max_iter)
+        self._cond = threading.Condition()
+        self._tabelas = OrderedDict()  # (pa, pb) -> tabela de _resolver_markov
+        self._pedido = None            # (pa, pb) mais recente ainda sem tabela
+        self._fechado = False
+        self._thread = None
+
+    def atualizar(self, pa, pb):
+        chave = (pa, pb)
+        with self._cond:
+            if self._fechado or chave in self._tabelas or chave == self._pedido:
+                return
+            self._pedido = chave
+            self._cond.notify()
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._rodar, name="previa-vitoria", daemon=True)
+            self._thread.start()
+
+    def consultar(self, pa, pb, vida_a, vida_b):
+        with self._cond:
+            tabela = self._tabelas.get((pa, pb))
+        return None if tabela is None else _resumo(tabela, int(vida_a), int(vida_b))
+
+    def fechar(self):
+        with self._cond:
+            self._fechado = True
+            self._pedido = None
+            self._cond.notify()
+
+    def _rodar(self):
+        while True:
+            with self._cond:
+                while self._pedido is None and not self._fechado:
+                    self._cond.wait()
+                if self._fechado:
+                    return
+                pa, pb = self._pedido
+
+            tabela = _resolver_markov(pa, pb, self.baldes, self.max_iter)
+            with self._cond:
+                self._tabelas[(pa, pb)] = tabela
+                while len(self._tabelas) > CACHE_INDICADOR:
+                    self._tabelas.popitem(last=False)
+                if self._pedido == (pa, pb):
+                    self._pedido = None
@@ -1,27 +1,103 @@
 import random
+from array import array
 
 
 def _clamp(v, a, b):
     return a if v < a else b if v > b else v
 
 
-def _total(player, attr):
-    return float(player.get_total(attr))
-
-
-def _pct(player, key, default=0):
-    return float(getattr(player, "percentuais", {}).get(key, default))
-
-
-def _hit(attacker):
-    return random.random() <= _clamp(_pct(attacker, "assertividade", 100) / 100.0, 0.0, 1.0)
-
-
-def _crit_multiplier(attacker):
-    chance = _clamp(_pct(attacker, "chance_crit", 0) / 100.0, 0.0, 1.0)
-    if random.random() > chance:
-        return 1.0
-    return 1.0 + max(0.0, _pct(attacker, "dano_crit", 0) / 100.0)
+_ATTRS_PERFIL = ("velocidade", "dano_fisico", "dano_magico", "defesa_fisica", "defesa_magica", "penetracao", "regeneracao")
+
+
+class CombatProfile:
+    """
+    Snapshot dos stats de combate de um player, montado 1x por round.
+    Já guarda defesas, multiplicadores e probabilidades prontos pro loop de ataques.
+    Não mude os campos depois de criado (== / hash dependem deles).
+    `vida` é só a foto do momento (não entra em == / hash); quem muda a vida
+    durante o round continua sendo o player.
+    """
+
+    __slots__ = (
+        "velocidade",
+        "raw_fisico",
+        "raw_magico",
+        "defesa_fisica",
+        "defesa_magica",
+        "pen_split",
+        "regen",
+        "p_hit",
+        "p_crit",
+        "crit_mult",
+        "amp",
+        "red",
+        "vamp",
+        "vida",
+        "vida_max",
+    )
+
+    def __init__(self, totais: dict, percentuais: dict | None = None, *, vida: int = 0, vida_max: int = 0):
+        # atribuição direta nos slots: sai montado por round, então nada de dict/closure aqui
+        get = totais.get
+        perc = (percentuais or {}).get
+        self.velocidade = float(get("velocidade", 0) or 0)
+        self.raw_fisico = max(0.0, float(get("dano_fisico", 0) or 0))
+        self.raw_magico = max(0.0, float(get("dano_magico", 0) or 0))
+        self.defesa_fisica = float(get("defesa_fisica", 0) or 0)
+        self.defesa_magica = float(get("defesa_magica", 0) or 0)
+        self.pen_split = max(0.0, float(get("penetracao", 0) or 0)) / 2.0
+        self.regen = max(0, int(round(float(get("regeneracao", 0) or 0))))
+        self.p_hit = _clamp(float(perc("assertividade", 100) or 0) / 100.0, 0.0, 1.0)
+        self.p_crit = _clamp(float(perc("chance_crit", 0) or 0) / 100.0, 0.0, 1.0)
+        self.crit_mult = 1.0 + max(0.0, float(perc("dano_crit", 0) or 0) / 100.0)
+        self.amp = 1.0 + float(perc("amp_dano", 0) or 0) / 100.0
+        self.red = max(0.0, 1.0 - float(perc("red_dano", 0) or 0) / 100.0)
+        self.vamp = max(0.0, float(perc("vampirismo", 0) or 0) / 100.0)
+        self.vida = int(vida)
+        self.vida_max = max(0, int(vida_max))
+
+    @classmethod
+    def from_player(cls, player):
+        get_total = player.get_total
+        totais = {k: get_total(k) for k in _ATTRS_PERFIL}  # __init__ já converte pra float
+        vida_max = int(getattr(player, "vida_max", 0) or 0)
+        vida = int(getattr(player, "vida", vida_max) or 0)
+        return cls(totais, getattr(player, "percentuais", {}) or {}, vida=vida, vida_max=vida_max)
+
+    @classmethod
+    def from_estado(cls, dados: dict):
+        """Aceita o dict de PlayerEstrategista.exportar_estado_compartilhado."""
+        vida_max = int(dados.get("vida_max", 0) or 0)
+        vida = int(dados.get("vida", vida_max) or 0)
+        return cls(dados.get("totais") or {}, dados.get("percentuais") or {}, vida=vida, vida_max=vida_max)
+
+    @classmethod
+    def of(cls, fonte):
+        if isinstance(fonte, cls):
+            return fonte
+        if isinstance(fonte, dict):
+            return cls.from_estado(fonte)
+        return cls.from_player(fonte)
+
+    # pickle (ProcessPoolExecutor): estado compacto em tupla, na ordem dos slots
+    def __getstate__(self):
+        return tuple(getattr(self, k) for k in self.__slots__)
+
+    def __setstate__(self, estado):
+        for k, v in zip(self.__slots__, estado):
+            setattr(self, k, v)
+
+    def chave(self):
+        return tuple(getattr(self, k) for k in self.__slots__ if k != "vida")
+
+    def __eq__(self, other):
+        return isinstance(other, CombatProfile) and self.chave() == other.chave()
+
+    def __hash__(self):
+        return hash(self.chave())
+
+    def __repr__(self):
+        return f"CombatProfile(vida={self.vida}/{self.vida_max}, vel={self.velocidade:g})"
 
 
 def _armor_multiplier_lol(armor):
@@ -30,61 +106,139 @@ def _armor_multiplier_lol(armor):
     return 2.0 - (100.0 / (100.0 - armor))
 
 
-def _damage_after_mods(base_damage, attacker, defender):
-    if base_damage <= 0:
-        return 0
-
-    amp = 1.0 + (_pct(attacker, "amp_dano", 0) / 100.0)
-    red = max(0.0, 1.0 - (_pct(defender, "red_dano", 0) / 100.0))
-    final_damage = max(0.0, base_damage * amp * red * _crit_multiplier(attacker))
-    return int(round(final_damage))
-
-
-def _effective_defenses(attacker, defender):
-    pen_total = max(0.0, _total(attacker, "penetracao"))
-    pen_split = pen_total / 2.0
-    df = _total(defender, "defesa_fisica") - pen_split
-    dm = _total(defender, "defesa_magica") - pen_split
-    return df, dm
-
-
-def _compute_hit(attacker, defender, kind):
-    if not _hit(attacker):
-        return {
-            "kind": kind,
-            "hit": False,
-            "damage": 0,
-            "heal": 0,
-            "raw_damage": 0,
-            "defense_block": 0,
-        }
-
-    df, dm = _effective_defenses(attacker, defender)
+def _golpe(att: CombatProfile, deff: CombatProfile, kind):
+    """(raw_damage, dano_base_sem_crit, rola_crit) de um ataque att -> deff; não muda dentro do round."""
     if kind == "fisico":
-        raw = max(0.0, _total(attacker, "dano_fisico"))
-        mitigado = raw * _armor_multiplier_lol(df)
+        raw = att.raw_fisico
+        mitigado = raw * _armor_multiplier_lol(deff.defesa_fisica - att.pen_split)
     else:
-        raw = max(0.0, _total(attacker, "dano_magico"))
-        mitigado = raw * _armor_multiplier_lol(dm)
-
-    raw_damage = int(round(raw))
-    damage = _damage_after_mods(mitigado, attacker, defender)
-    defense_block = max(0, raw_damage - damage)
-    vamp = max(0.0, _pct(attacker, "vampirismo", 0) / 100.0)
-    heal = int(round(damage * vamp))
-    return {
-        "kind": kind,
-        "hit": True,
-        "damage": damage,
-        "heal": heal,
-        "raw_damage": raw_damage,
-        "defense_block": defense_block,
-    }
-
-
-def _hit_slots(attacker, defender):
-    a_spd = max(1.0, _total(attacker, "velocidade"))
-    d_spd = max(1.0, _total(defender, "velocidade"))
+        raw = att.raw_magico
+        mitigado = raw * _armor_multiplier_lol(deff.defesa_magica - att.pen_split)
+    if mitigado <= 0:
+        return int(round(raw)), 0.0, False
+    return int(round(raw)), mitigado * att.amp * deff.red, True
+
+
+def _compute_hit(att: CombatProfile, golpe, rng=random):
+    """(hit, damage, heal, raw_damage, defense_block) de um ataque."""
+    if rng.random() > att.p_hit:
+        return 0, 0, 0, 0, 0
+
+    raw_damage, base, rola_crit = golpe
+    if rola_crit:
+        mult = att.crit_mult if rng.random() <= att.p_crit else 1.0
+        damage = int(round(max(0.0, base * mult)))
+    else:
+        damage = 0
+
+    return 1, damage, int(round(damage * att.vamp)), raw_damage, max(0, raw_damage - damage)
+
+
+# ============================================================
+# LOG DE COMBATE (colunar)
+# Uma linha por ação, em colunas array('i') paralelas; os nomes ficam 1x em
+# `nomes` e as linhas guardam só o índice. Nada de dict por golpe.
+# ============================================================
+KINDS = ("fisico", "magico", "regen")
+KIND_FISICO = 0
+KIND_MAGICO = 1
+KIND_REGEN = 2
+_KIND_CODIGO = {k: i for i, k in enumerate(KINDS)}
+
+COLUNAS_LOG = ("attacker", "defender", "kind", "hit", "damage", "heal", "raw_damage", "defense_block")
+
+
+class LogView:
+    """Visão leve de uma linha do CombatLog; lê como o antigo dict de hit."""
+
+    __slots__ = ("log", "i")
+
+    def __init__(self, log, i):
+        self.log = log
+        self.i = i
+
+    def get(self, key, default=None):
+        log, i = self.log, self.i
+        if key == "kind":
+            return KINDS[log.kind[i]]
+        if key == "hit":
+            return bool(log.hit[i])
+        if key in ("attacker", "defender"):
+            return log.nomes[getattr(log, key)[i]]
+        if key in COLUNAS_LOG:
+            return getattr(log, key)[i]
+        return default
+
+    def __getitem__(self, key):
+        v = self.get(key, self)
+        if v is self:
+            raise KeyError(key)
+        return v
+
+    def __repr__(self):
+        return f"LogView({self.i}, {self.get('attacker')}->{self.get('defender')}, {self.get('kind')})"
+
+
+class CombatLog:
+    """
+    Log de um ou mais rounds. Iterar devolve (nome_atacante, nome_defensor, LogView),
+    o mesmo formato do log antigo de tuplas.
+    """
+
+    __slots__ = ("nomes", "_idx_nome") + COLUNAS_LOG
+
+    def __init__(self):
+        self.nomes = []
+        self._idx_nome = {}
+        for col in COLUNAS_LOG:
+            setattr(self, col, array("i"))
+
+    def limpar(self):
+        """Esvazia as colunas sem realocar (log reaproveitado round a round)."""
+        for col in COLUNAS_LOG:
+            del getattr(self, col)[:]
+
+    def indice(self, nome):
+        i = self._idx_nome.get(nome)
+        if i is None:
+            i = self._idx_nome[nome] = len(self.nomes)
+            self.nomes.append(nome)
+        return i
+
+    def append(self, att_i, def_i, kind, hit, damage, heal, raw_damage, defense_block):
+        self.attacker.append(att_i)
+        self.defender.append(def_i)
+        self.kind.append(kind)
+        self.hit.append(hit)
+        self.damage.append(damage)
+        self.heal.append(heal)
+        self.raw_damage.append(raw_damage)
+        self.defense_block.append(defense_block)
+
+    def __len__(self):
+        return len(self.kind)
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        return self.nomes[self.attacker[i]], self.nomes[self.defender[i]], LogView(self, i)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def as_numpy(self):
+        """Colunas como arrays NumPy (sem cópia) pra análise pós-batalha."""
+        import numpy as np
+
+        return {col: np.frombuffer(getattr(self, col), dtype=np.intc) for col in COLUNAS_LOG}
+
+
+def _hit_slots(attacker: CombatProfile, defender: CombatProfile):
+    a_spd = max(1.0, attacker.velocidade)
+    d_spd = max(1.0, defender.velocidade)
     ratio = a_spd / d_spd
     if ratio >= 3.0:
         return 2
@@ -93,43 +247,69 @@ def _hit_slots(attacker, defender):
     return 0
 
 
-def execute_round(attacker, defender):
-    a_spd = _total(attacker, "velocidade")
-    d_spd = _total(defender, "velocidade")
-
-    first, second = (attacker, defender) if a_spd >= d_spd else (defender, attacker)
-    logs = []
-
-    first_pre_hits = _hit_slots(first, second)
-
-    def apply(att, deff, kind):
-        hit = _compute_hit(att, deff, kind)
-        if hit["damage"] > 0:
-            deff.vida = max(0, deff.vida - hit["damage"])
-        if hit["heal"] > 0:
-            att.vida = min(att.vida_max, att.vida + hit["heal"])
-        logs.append((att.nome, deff.nome, hit))
+def execute_round(attacker, defender, attacker_profile=None, defender_profile=None, log=None, rng=None):
+    """
+    Um round entre dois players (a vida deles é alterada aqui).
+    Os perfis podem vir prontos (CombatProfile); senão são montados 1x no começo.
+    `log` (CombatLog) recebe as linhas do round; sem ele, um log novo é criado;
+    log=False não registra nada (quem só quer o resultado, ex. simulação em lote).
+    `rng` (random.Random) pra rounds reproduzíveis; padrão = random global.
+    """
+    pa = attacker_profile or CombatProfile.from_player(attacker)
+    pd = defender_profile or CombatProfile.from_player(defender)
+    if log is None:
+        log = CombatLog()
+    if rng is None:
+        rng = random
+    if log is False:
+        log = None
+        ia = idf = 0
+    else:
+        ia, idf = log.indice(attacker.nome), log.indice(defender.nome)
 
-    apply(first, second, "fisico")
+    if pa.velocidade >= pd.velocidade:
+        first, second, pf, ps, i_first, i_second = attacker, defender, pa, pd, ia, idf
+    else:
+        first, second, pf, ps, i_first, i_second = defender, attacker, pd, pa, idf, ia
+    inicio = len(log) if log is not None else 0
+
+    first_pre_hits = _hit_slots(pf, ps)
+    golpes = {}
+
+    def apply(att, deff, p_att, p_def, i_att, i_def, kind):
+        chave = (att is first, kind)
+        if chave not in golpes:
+            golpes[chave] = _golpe(p_att, p_def, kind)
+        hit, damage, heal, raw_damage, block = _compute_hit(p_att, golpes[chave], rng)
+        if damage > 0:
+            deff.vida = max(0, deff.vida - damage)
+        if heal > 0:
+            att.vida = min(att.vida_max, att.vida + heal)
+        if log is not None:
+            log.append(i_att, i_def, _KIND_CODIGO[kind], hit, damage, heal, raw_damage, block)
+
+    apply(first, second, pf, ps, i_first, i_second, "fisico")
     if second.vida > 0 and first_pre_hits < 1:
-        apply(second, first, "fisico")
+        apply(second, first, ps, pf, i_second, i_first, "fisico")
 
     if second.vida > 0 and first_pre_hits >= 2:
-        apply(first, second, "magico")
+        apply(first, second, pf, ps, i_first, i_second, "magico")
 
     if first.vida > 0 and second.vida > 0 and first_pre_hits < 2:
-        apply(first, second, "magico")
+        apply(first, second, pf, ps, i_first, i_second, "magico")
         if second.vida > 0:
-            apply(second, first, "magico")
+            apply(second, first, ps, pf, i_second, i_first, "magico")
 
-    for p in (attacker, defender):
-        regen = max(0, int(round(_total(p, "regeneracao"))))
+    for p, perfil, i_p in ((attacker, pa, ia), (defender, pd, idf)):
+        regen = perfil.regen
         if regen > 0 and p.vida > 0:
             p.vida = min(p.vida_max, p.vida + regen)
-            logs.append((p.nome, p.nome, {"kind": "regen", "hit": True, "damage": 0, "heal": regen}))
+            if log is not None:
+                log.append(i_p, i_p, KIND_REGEN, 1, 0, regen, 0, 0)
 
     return {
-        "logs": logs,
+        "logs": log,
+        "inicio_log": inicio,
         "vencedor": attacker if defender.vida <= 0 else defender if attacker.vida <= 0 else None,
         "ordem_inicial": (first.nome, second.nome),
     }
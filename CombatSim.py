@@ -0,0 +1,174 @@
+# CombatSim.py
+import numpy as np
+
+from CombatMath import CombatProfile, _golpe, _hit_slots
+
+# ============================================================
+# SIMULADOR EM LOTE (Monte Carlo vetorizado)
+# Mesmas regras de CombatMath.execute_round, mas N rounds/lutas
+# independentes de uma vez, com arrays NumPy no lugar de random().
+# ============================================================
+# vencedor por tentativa
+SEM_VENCEDOR = 0
+VENCE_A = 1
+VENCE_B = 2
+
+
+def _perfil(fonte):
+    """Player, dict de exportar_estado_compartilhado ou CombatProfile pronto."""
+    return CombatProfile.of(fonte)
+
+
+def _ataque(att, deff, kind):
+    """Constantes de um ataque att -> deff: só existem 2 danos possíveis (normal/crit)."""
+    raw, base, rola_crit = _golpe(att, deff, kind)
+    if rola_crit:
+        dano = int(round(max(0.0, base)))
+        dano_crit = int(round(max(0.0, base * att.crit_mult)))
+    else:
+        dano = dano_crit = 0
+
+    return {
+        "p_hit": att.p_hit,
+        "p_crit": att.p_crit if rola_crit else 0.0,
+        "raw": raw,
+        "dano": dano,
+        "dano_crit": dano_crit,
+        "heal": int(round(dano * att.vamp)),
+        "heal_crit": int(round(dano_crit * att.vamp)),
+    }
+
+
+def _sequencia_round(a, b):
+    """
+    Ordem fixa dos ataques do round (igual execute_round), como
+    (idx_atacante, kind, condicao). idx 0 = a, 1 = b. Toda condição olha a vida
+    do segundo a agir: "segundo" = ele vive, "ambos" = os dois vivem (abre o bloco
+    mágico), "bloco" = dentro do bloco mágico e o segundo ainda vive.
+    """
+    primeiro, segundo = (0, 1) if a.velocidade >= b.velocidade else (1, 0)
+    perfis = (a, b)
+    pre = _hit_slots(perfis[primeiro], perfis[segundo])
+
+    seq = [(primeiro, "fisico", None)]
+    if pre < 1:
+        seq.append((segundo, "fisico", "segundo"))
+    if pre >= 2:
+        seq.append((primeiro, "magico", "segundo"))
+    else:
+        seq.append((primeiro, "magico", "ambos"))
+        seq.append((segundo, "magico", "bloco"))
+    return segundo, seq
+
+
+def _round_lote(vida, vida_max, ataques, segundo, seq, regen, rng, acc, idx):
+    """Aplica um round em todas as linhas de `vida` (shape (n, 2)), acumulando em acc[idx]."""
+    n = vida.shape[0]
+    bloco = None
+    for att_i, kind, cond in seq:
+        def_i = 1 - att_i
+        at = ataques[(att_i, kind)]
+
+        if cond is None:
+            ativo = np.ones(n, dtype=bool)
+        elif cond == "segundo":
+            ativo = vida[:, segundo] > 0
+        elif cond == "ambos":
+            ativo = (vida[:, 0] > 0) & (vida[:, 1] > 0)
+            bloco = ativo
+        else:
+            ativo = bloco & (vida[:, segundo] > 0)
+
+        hit = ativo & (rng.random(n) <= at["p_hit"])
+        crit = hit & (rng.random(n) <= at["p_crit"])
+
+        dano = np.where(crit, at["dano_crit"], np.where(hit, at["dano"], 0))
+        heal = np.where(crit, at["heal_crit"], np.where(hit, at["heal"], 0))
+
+        vida[:, def_i] = np.maximum(0, vida[:, def_i] - dano)
+        vida[:, att_i] = np.where(heal > 0, np.minimum(vida_max[att_i], vida[:, att_i] + heal), vida[:, att_i])
+
+        raw = np.where(hit, at["raw"], 0)
+        acc["damage"][idx, att_i] += dano
+        acc["heal"][idx, att_i] += heal
+        acc["raw_damage"][idx, att_i] += raw
+        acc["defense_block"][idx, att_i] += np.maximum(0, raw - dano)
+
+    for p in (0, 1):
+        if regen[p] <= 0:
+            continue
+        vivo = vida[:, p] > 0
+        vida[vivo, p] = np.minimum(vida_max[p], vida[vivo, p] + regen[p])
+        acc["heal"][idx, p] += np.where(vivo, regen[p], 0)
+
+
+def _resumo(valores):
+    v = np.asarray(valores, dtype=float)
+    if v.size == 0:
+        return {"media": 0.0, "desvio": 0.0, "p5": 0.0, "p50": 0.0, "p95": 0.0}
+    p5, p50, p95 = np.percentile(v, (5, 50, 95))
+    return {"media": float(v.mean()), "desvio": float(v.std()), "p5": float(p5), "p50": float(p50), "p95": float(p95)}
+
+
+def simular_lote(a, b, n, *, ate_vencedor=False, max_rondas=500, seed=None):
+    """
+    Simula `n` tentativas independentes de a (atacante) x b (defensor).
+    a/b: CombatProfile, player ou dict de exportar_estado_compartilhado.
+
+    ate_vencedor=False: 1 round por tentativa (igual a uma chamada de execute_round).
+    ate_vencedor=True: repete rounds até sair vencedor (ou max_rondas).
+
+    Retorna arrays por tentativa (coluna 0 = a, coluna 1 = b) de damage, heal,
+    raw_damage e defense_block, vida final, rondas e vencedor
+    (SEM_VENCEDOR / VENCE_A / VENCE_B), mais um "resumo" agregado.
+    """
+    pa, pb = _perfil(a), _perfil(b)
+    n = max(0, int(n))
+    rng = np.random.default_rng(seed)
+
+    segundo, seq = _sequencia_round(pa, pb)
+    perfis = (pa, pb)
+    ataques = {(i, kind): _ataque(perfis[i], perfis[1 - i], kind) for i, kind, _ in seq}
+    regen = (pa.regen, pb.regen)
+    vida_max = np.array([pa.vida_max, pb.vida_max], dtype=np.int64)
+
+    vida = np.empty((n, 2), dtype=np.int64)
+    vida[:, 0] = pa.vida
+    vida[:, 1] = pb.vida
+
+    acc = {k: np.zeros((n, 2), dtype=np.int64) for k in ("damage", "heal", "raw_damage", "defense_block")}
+    rondas = np.zeros(n, dtype=np.int32)
+
+    vivos = np.arange(n)
+    limite = max(1, int(max_rondas)) if ate_vencedor else 1
+    for _ in range(limite):
+        if vivos.size == 0:
+            break
+        sub = vida[vivos]
+        _round_lote(sub, vida_max, ataques, segundo, seq, regen, rng, acc, vivos)
+        vida[vivos] = sub
+        rondas[vivos] += 1
+        vivos = vivos[(sub[:, 0] > 0) & (sub[:, 1] > 0)]
+
+    vencedor = np.full(n, SEM_VENCEDOR, dtype=np.int8)
+    vencedor[vida[:, 1] <= 0] = VENCE_A
+    vencedor[(vida[:, 1] > 0) & (vida[:, 0] <= 0)] = VENCE_B
+
+    total = max(1, n)
+    resumo = {
+        "vitoria_a": float(np.count_nonzero(vencedor == VENCE_A)) / total,
+        "vitoria_b": float(np.count_nonzero(vencedor == VENCE_B)) / total,
+        "sem_vencedor": float(np.count_nonzero(vencedor == SEM_VENCEDOR)) / total,
+        "rondas": _resumo(rondas),
+    }
+    for k, arr in acc.items():
+        resumo[k] = (_resumo(arr[:, 0]), _resumo(arr[:, 1]))
+
+    return {
+        "n": n,
+        "vida": vida,
+        "rondas": rondas,
+        "vencedor": vencedor,
+        **acc,
+        "resumo": resumo,
+    }
@@ -0,0 +1,235 @@
+# DiceStats.py
+from functools import lru_cache
+
+import numpy as np
+
+# ============================================================
+# ESTATÍSTICA DOS DADOS (exata, sem lançar nada)
+# Um dado é a lista de faces (equiprováveis). Média/variância e a
+# distribuição da soma saem direto das faces, com cache pelo multiconjunto
+# de faces: [1, 3, 3] e [3, 1, 3] são o mesmo dado.
+# Soma de vários dados = convolução das distribuições (FFT quando a mão é grande).
+# ============================================================
+LIMIAR_FFT = 8  # a partir de quantos dados a soma vai por FFT
+CACHE_SOMAS = 4096
+
+
+def chave_faces(faces):
+    """Multiconjunto de faces como tupla ordenada (dado sem faces = [1], igual o Tabuleiro)."""
+    chave = tuple(sorted(int(f) for f in (faces or ())))
+    return chave or (1,)
+
+
+def _somente_leitura(arr):
+    arr.setflags(write=False)
+    return arr
+
+
+@lru_cache(maxsize=1024)
+def _stats_dado(chave):
+    v = np.array(chave, dtype=np.float64)
+    return {
+        "media": float(v.mean()),
+        "variancia": float(v.var()),
+        "min": int(chave[0]),
+        "max": int(chave[-1]),
+    }
+
+
+@lru_cache(maxsize=1024)
+def _pmf_dado(chave):
+    """(menor_valor, pmf) com pmf[i] = P(face == menor_valor + i)."""
+    base = chave[0]
+    pmf = np.bincount(np.array(chave) - base).astype(np.float64) / len(chave)
+    return base, _somente_leitura(pmf)
+
+
+def estatisticas_dado(faces):
+    """{"media", "variancia", "min", "max"} de um dado."""
+    return _stats_dado(chave_faces(faces))
+
+
+def _convolve_todas(pmfs):
+    if len(pmfs) == 1:
+        return pmfs[0]
+    tamanho = sum(len(p) - 1 for p in pmfs) + 1
+    if len(pmfs) < LIMIAR_FFT:
+        out = pmfs[0]
+        for p in pmfs[1:]:
+            out = np.convolve(out, p)
+        return out
+
+    n = 1 << (tamanho - 1).bit_length()
+    espectro = np.ones(n // 2 + 1, dtype=np.complex128)
+    for p in pmfs:
+        espectro *= np.fft.rfft(p, n)
+    out = np.fft.irfft(espectro, n)[:tamanho]
+    out = np.clip(out, 0.0, None)  # ruído numérico
+    return out / out.sum()
+
+
+@lru_cache(maxsize=CACHE_SOMAS)
+def _soma(chaves):
+    if not chaves:
+        return 0, _somente_leitura(np.ones(1))
+    partes = [_pmf_dado(c) for c in chaves]
+    base = sum(b for b, _ in partes)
+    pmf = _convolve_todas([p for _, p in partes])
+    return base, _somente_leitura(np.asarray(pmf, dtype=np.float64))
+
+
+def distribuicao_soma(lista_faces):
+    """
+    Distribuição exata da soma de vários dados.
+    Retorna {"min", "pmf", "media", "variancia"}; pmf[i] = P(soma == min + i).
+    """
+    chaves = tuple(sorted(chave_faces(f) for f in lista_faces))
+    base, pmf = _soma(chaves)
+    media = sum(_stats_dado(c)["media"] for c in chaves)
+    variancia = sum(_stats_dado(c)["variancia"] for c in chaves)
+    return {"min": base, "pmf": pmf, "media": media, "variancia": variancia}
+
+
+def prob_soma_ao_menos(lista_faces, alvo):
+    """P(soma >= alvo)."""
+    d = distribuicao_soma(lista_faces)
+    i = int(alvo) - d["min"]
+    if i <= 0:
+        return 1.0
+    return float(d["pmf"][i:].sum())
+
+
+def distribuicao_por_attr(mao):
+    """
+    Mão no formato do Tabuleiro ([{"attr", "faces", ...}, ...]) ->
+    {attr: distribuicao_soma dos dados daquele atributo}.
+    """
+    por_attr = {}
+    for dado in mao or ():
+        por_attr.setdefault(dado.get("attr"), []).append(dado.get("faces"))
+    return {attr: distribuicao_soma(faces) for attr, faces in por_attr.items()}
+
+
+# ============================================================
+# ONDE OS DADOS CAEM (mesmo sorteio do Tabuleiro._escolher_alvos)
+# Cada tentativa: distância Chebyshev d ~ pesos, offset uniforme no anel d,
+# célula presa na borda; célula já usada é descartada e sorteia de novo.
+# Isso é amostragem sucessiva sem reposição proporcional a q (massa de cada
+# célula). P(x entre os n primeiros) vem da corrida de exponenciais:
+#   π_x = ∫ q_x e^{-q_x t} P(menos de n outras chegaram até t) dt
+# com o Poisson-binomial dos outros por DP e Gauss-Legendre em s = e^{-q_min t}
+# (erro ~1e-14). Células com a mesma massa têm o mesmo π: calcula uma por classe.
+# Bases simétricas (giros/espelhos do tabuleiro) reaproveitam o resultado.
+# O teto de 2200 tentativas do Tabuleiro é ignorado (chance desprezível).
+# ============================================================
+NOS_QUADRATURA = 64
+CACHE_POUSO = 16
+
+
+def massa_pouso(base_c, base_r, tamanho, max_dist, pesos):
+    """(tamanho, tamanho) com q[r, c] = chance de uma tentativa cair em (c, r)."""
+    pesos = np.asarray(pesos, dtype=np.float64)[: max_dist + 1]
+    pesos = pesos / pesos.sum()
+    q = np.zeros((tamanho, tamanho))
+    q[base_r, base_c] += pesos[0]
+    for d in range(1, len(pesos)):
+        faixa = np.arange(-d, d + 1)
+        dx, dy = np.meshgrid(faixa, faixa)
+        anel = np.maximum(np.abs(dx), np.abs(dy)) == d
+        cs = np.clip(base_c + dx[anel], 0, tamanho - 1)
+        rs = np.clip(base_r + dy[anel], 0, tamanho - 1)
+        np.add.at(q, (rs, cs), pesos[d] / anel.sum())
+    return q
+
+
+def _inclusao(w, n):
+    """π de cada item (pesos w, soma 1) numa amostra sucessiva de n sem reposição."""
+    classes, inv = np.unique(np.round(w, 15), return_inverse=True)
+    rep = np.array([np.flatnonzero(inv == k)[0] for k in range(len(classes))])
+
+    x, g = np.polynomial.legendre.leggauss(NOS_QUADRATURA)
+    s, g = (x + 1) / 2, g / 2
+    q_min = w.min()
+    t = -np.log(s) / q_min
+    chegou_nao = np.exp(-np.outer(t, w))  # (nós, m): e^{-w_j t}
+
+    # dp[:, k, i] = P(exatamente i dos outros (≠ rep[k]) chegaram), i < n
+    dp = np.zeros((len(t), len(rep), n))
+    dp[:, :, 0] = 1.0
+    for j in range(len(w)):
+        e = chegou_nao[:, j, None, None]
+        novo = dp * e
+        novo[:, :, 1:] += dp[:, :, :-1] * (1 - e)
+        proprio = rep == j
+        novo[:, proprio] = dp[:, proprio]
+        dp = novo
+
+    w_rep = w[rep]
+    integrando = w_rep * chegou_nao[:, rep] * dp.sum(axis=2) / (s[:, None] * q_min)
+    return (g @ integrando)[inv]
+
+
+def mapa_pouso(base_c, base_r, n, tamanho, max_dist, pesos):
+    """
+    (tamanho, tamanho): nº esperado dos n dados de um lançamento em (base_c, base_r)
+    que caem em cada célula. Soma = n; fora da base é a chance de cair ali.
+    Mão maior que as células alcançáveis: todas recebem 1 e o resto cai na base.
+    """
+    q = massa_pouso(base_c, base_r, tamanho, max_dist, pesos)
+    onde = q > 0
+    w = q[onde]
+    mapa = np.zeros_like(q)
+    n = int(n)
+    if n <= 0:
+        return mapa
+    if n >= len(w):
+        mapa[onde] = 1.0
+        mapa[base_r, base_c] += n - len(w)
+        return mapa
+    mapa[onde] = _inclusao(w, n)
+    return mapa
+
+
+def _simetrias(tamanho):
+    """As 8 simetrias do quadrado: (função na célula (c, r), função no array [r, c])."""
+    ult = tamanho - 1
+    out = []
+    for giros in range(4):
+        for espelho in (False, True):
+            def cel(c, r, giros=giros, espelho=espelho):
+                for _ in range(giros):  # np.rot90: [r, c] -> [ult - c, r]
+                    c, r = r, ult - c
+                return (r, c) if espelho else (c, r)
+
+            def arr(a, giros=giros, espelho=espelho):
+                a = np.rot90(a, giros)
+                return a.T if espelho else a
+
+            out.append((cel, arr))
+    return out
+
+
+@lru_cache(maxsize=CACHE_POUSO)
+def tabela_pouso(n, tamanho, modos):
+    """
+    Tabela (tamanho², tamanho², len(modos)), só leitura:
+    [r*tamanho + c da base, r*tamanho + c da célula, modo] = mapa_pouso.
+    `modos` = ((max_dist, pesos), ...) na ordem dos modos do Tabuleiro.
+    """
+    celulas = tamanho * tamanho
+    tabela = np.zeros((celulas, celulas, len(modos)))
+    simetrias = _simetrias(tamanho)
+    for m, (max_dist, pesos) in enumerate(modos):
+        feito = np.zeros(celulas, dtype=bool)
+        for base in range(celulas):
+            if feito[base]:
+                continue
+            r, c = divmod(base, tamanho)
+            mapa = mapa_pouso(c, r, n, tamanho, max_dist, tuple(pesos))
+            for cel, arr in simetrias:
+                c2, r2 = cel(c, r)
+                outra = r2 * tamanho + c2
+                if not feito[outra]:
+                    tabela[outra, :, m] = arr(mapa).ravel()
+                    feito[outra] = True
+    return _somente_leitura(tabela)
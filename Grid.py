@@ -6,14 +6,14 @@ import os
 
 from Painel_Personagem import draw_painel_personagem
 from Brawl_Stars.Brawl import gerar_imagem_cartucho_grid
+from GridRules import GridRules, GRID_COLS, GRID_ROWS
+from GridSolver import sugerir_layout, ORCAMENTO_MS, PreviaImpacto
+from Historico import Historico, Retrato
 
 
 # ============================================================
 # CONFIG
 # ============================================================
-GRID_COLS = 10
-GRID_ROWS = 10
-
 CELL_W = 80
 CELL_H = 60
 
@@ -31,22 +31,27 @@ HOVER_BAD = (235, 70, 70)
 PLACE_YELLOW = (255, 230, 120)
 
 SYNERGY_STROKE = 9
+PULSO_DEGRAUS = 12  # brilho do contorno em hover: nº de camadas pré-renderizadas
 
 # ZOOM (simples, sempre centraliza)
 ZOOM_MIN = 0.65
 ZOOM_MAX = 1.85
 ZOOM_STEP = 1.12
 
+# CÂMERA: arrasta com botão do meio/direito ou setas (em células)
+PAN_BOTOES = (2, 3)
+PAN_TECLAS = {pygame.K_LEFT: (1, 0), pygame.K_RIGHT: (-1, 0), pygame.K_UP: (0, 1), pygame.K_DOWN: (0, -1)}
+
+# desfazer / refazer (Ctrl+Z; Ctrl+Y ou Ctrl+Shift+Z)
+TECLA_DESFAZER = pygame.K_z
+TECLA_REFAZER = pygame.K_y
+
 # ============================================================
 # HELPERS
 # ============================================================
 def _norm_sym(x) -> str:
     return str(x).strip().lower()
 
-def _get_syms(cartucho):
-    raw = getattr(cartucho, "sinergias", None) or getattr(cartucho, "synergies", []) or []
-    return [_norm_sym(s) for s in raw]
-
 def _blink_strength(ms: int, period_ms: int = 520) -> float:
     t = (ms % period_ms) / period_ms
     return 0.5 - 0.5 * math.cos(t * math.tau)
@@ -84,23 +89,23 @@ def _color_for_synergy(sym: str, cache: dict):
 # ============================================================
 class Grid:
     """
-    REGRAS:
-      - Grid imaginária (divisórias só quando arrasta)
-      - 1º cartucho livre
-      - Depois: adjacente a 1+ ocupado e conecta com TODOS os vizinhos adjacentes
-      - Retas (sem L): sinergia ativa só se já foi usada numa conexão real
-      - 1 reta (row/col) pode pertencer a APENAS 1 sinergia
+    Grid imaginária (divisórias só quando arrasta). As regras de posicionamento
+    e de sinergia ficam em self.regras (GridRules, sem pygame); aqui é só
+    ocupação com os Cartuchos de verdade, eventos e desenho.
     """
-    def __init__(self, tela):
+    def __init__(self, tela, cols=GRID_COLS, rows=GRID_ROWS):
         self.tela = tela
-        self.cols, self.rows = GRID_COLS, GRID_ROWS
+        self.cols, self.rows = int(cols), int(rows)
 
         self.base_cell = int(min(CELL_W, CELL_H))
         self.zoom = 1.0
         self.cell_w = self.cell_h = self.base_cell
 
         self.occ = {}  # (c,r) -> Cartucho
+        self.regras = GridRules(self.cols, self.rows)
         self.origin = (0, 0)
+        self.pan = (0, 0)          # deslocamento da câmera (px) em relação ao centro
+        self._pan_arrasto = None   # (mouse_inicio, pan_inicio) enquanto arrasta a câmera
         self._recalc_layout()
 
         self.banco = self.loja = self.painel_sinergia = None
@@ -118,16 +123,31 @@ class Grid:
         self.fonte_hover_txt = pygame.font.Font(self.fonte_path, 16)
         self.fonte_hover_micro = pygame.font.Font(self.fonte_path, 14)
 
-        self._valid_cells = set()
-        self._active_cache = None
-        self._active_cache_tick = -1
+        self._valid_cells = frozenset()
+
+        # prévia "e se" das cartas da loja/banco (thread própria)
+        self.previa = PreviaImpacto()
+
+        # selos do banco: nº de células válidas por carta, refeito só quando
+        # a versão do campo ou o conteúdo do banco muda
+        self._jogaveis_chave = None
 
         # ---------------- flag para recalcular stats do campo
         self.campo_dirty = True
 
+        # ---------------- desfazer/refazer: criado em iniciar_historico (precisa de banco/loja);
+        # _mudancas junta as células tocadas desde o último passo registrado
+        self.historico = None
+        self._mudancas = {}
+
         # ---------------- cores dinâmicas das sinergias (estáveis)
         self._syn_color_cache = {}
 
+        # ---------------- contornos: geometria por versão do campo, camadas por zoom
+        self._contorno_geo_versao = None
+        self._contorno_geo = {}
+        self._contorno_camadas = {}
+
         # arrasto de dado (da grade para a ficha do player)
         self.dragging_dado = None
         self._dragging_dado_icon = None
@@ -138,14 +158,30 @@ class Grid:
 
     def remove_at(self, c, r):
         if (c, r) in self.occ:
+            self.regras.remove_at(c, r)
             del self.occ[(c, r)]
+            self._mudancas[(c, r)] = None
             self.campo_dirty = True
 
+    @property
+    def versao(self):
+        return self.regras.versao
+
+    def fechar(self):
+        """Fim da tela: encerra a thread da prévia de impacto (e solta a cópia das regras)."""
+        self.previa.fechar()
+
     # ---------------- refs / layout ----------------
     def set_refs(self, banco, loja, painel_sinergia, player=None):
         self.banco, self.loja, self.painel_sinergia = banco, loja, painel_sinergia
         if player is not None:
             self.player = player
+        self.iniciar_historico()
+
+    def iniciar_historico(self):
+        """Raiz do desfazer = estado atual; a tela chama de novo depois de semear banco/loja."""
+        self._mudancas = {}
+        self.historico = Historico(Retrato.do_campo(self.occ, self.rows, **self._estado_fora_do_campo()))
 
     def _ui_rects(self):
         W, H = self.tela.get_width(), self.tela.get_height()
@@ -165,15 +201,47 @@ class Grid:
             self.zoom = max(ZOOM_MIN, self.zoom / ZOOM_STEP)
         if abs(self.zoom - old) < 1e-6:
             return
+        # mantém no centro da vista o mesmo ponto da grade
+        old_cell = self.cell_w
         self.cell_w = self.cell_h = max(8, int(self.base_cell * self.zoom))
+        k = self.cell_w / old_cell
+        self.pan = (self.pan[0] * k, self.pan[1] * k)
         self._recalc_layout()
 
-    def _recalc_layout(self):
+    def _viewport(self):
+        """Área da tela reservada pra grade (fora do painel da direita e do banco)."""
         W, H = self.tela.get_width(), self.tela.get_height()
+        return pygame.Rect(MARGIN, MARGIN, W - RIGHT_PANEL_W - 2 * MARGIN, H - BOTTOM_BANK_H - 2 * MARGIN)
+
+    def _recalc_layout(self):
+        vp = self._viewport()
         grid_w, grid_h = self.cols * self.cell_w, self.rows * self.cell_h
-        area_w = W - RIGHT_PANEL_W - 2 * MARGIN
-        area_h = H - BOTTOM_BANK_H - 2 * MARGIN
-        self.origin = (int(MARGIN + (area_w - grid_w) // 2), int(MARGIN + (area_h - grid_h) // 2))
+
+        # grade menor que a vista fica centralizada; maior, a câmera não deixa sobrar borda
+        pan = []
+        for p, grade, vista in ((self.pan[0], grid_w, vp.w), (self.pan[1], grid_h, vp.h)):
+            folga = max(0, (grade - vista) / 2)
+            pan.append(max(-folga, min(folga, p)))
+        self.pan = (pan[0], pan[1])
+        self.origin = (int(vp.x + (vp.w - grid_w) // 2 + self.pan[0]), int(vp.y + (vp.h - grid_h) // 2 + self.pan[1]))
+
+    def mover_camera(self, dx, dy):
+        self.pan = (self.pan[0] + dx, self.pan[1] + dy)
+        self._recalc_layout()
+
+    def _faixa_visivel(self):
+        """(c0, c1, r0, r1): colunas/linhas (fim exclusivo) que aparecem na vista."""
+        vp = self._viewport()
+        ox, oy = self.origin
+        c0 = max(0, (vp.left - ox) // self.cell_w)
+        c1 = min(self.cols, -(-(vp.right - ox) // self.cell_w))
+        r0 = max(0, (vp.top - oy) // self.cell_h)
+        r1 = min(self.rows, -(-(vp.bottom - oy) // self.cell_h))
+        return c0, max(c0, c1), r0, max(r0, r1)
+
+    def _visivel(self, c, r):
+        c0, c1, r0, r1 = self._faixa_visivel()
+        return c0 <= c < c1 and r0 <= r < r1
 
     # ---------------- geometry ----------------
     def rect(self):
@@ -186,75 +254,21 @@ class Grid:
 
     def in_cell(self, pos):
         gr = self.rect()
-        if not gr.collidepoint(pos):
+        if not (gr.collidepoint(pos) and self._viewport().collidepoint(pos)):
             return None
         mx, my = pos
         return int((mx - gr.x) // self.cell_w), int((my - gr.y) // self.cell_h)
 
     def neighbors4(self, c, r):
-        for dc, dr in ((1,0), (-1,0), (0,1), (0,-1)):
-            nc, nr = c + dc, r + dr
-            if 0 <= nc < self.cols and 0 <= nr < self.rows:
-                yield (nc, nr)
+        return self.regras.neighbors4(c, r)
 
-    # ---------------- active synergies ----------------
+    # ---------------- active synergies (GridRules) ----------------
     def _active_synergy_positions(self):
-        pos = {}
-        for (c, r), a in self.occ.items():
-            sa = set(_get_syms(a))
-            for (dc, dr) in ((1, 0), (0, 1)):
-                b = self.occ.get((c + dc, r + dr))
-                if not b:
-                    continue
-                for s in (sa & set(_get_syms(b))):
-                    st = pos.setdefault(s, set())
-                    st.add((c, r))
-                    st.add((c + dc, r + dr))
-        return pos
+        # sym -> set[(c,r)]; é o próprio índice das regras (não alterar)
+        return self.regras.posicoes_ativas()
 
     def _get_active_cached(self, tick_ms: int):
-        if self._active_cache_tick == tick_ms and self._active_cache is not None:
-            return self._active_cache
-        self._active_cache_tick = tick_ms
-        self._active_cache = self._active_synergy_positions()
-        return self._active_cache
-
-    def _line_ok(self, existing: set, new_cell):
-        if not existing:
-            return True
-        nc, nr = new_cell
-        if len(existing) == 1:
-            c0, r0 = next(iter(existing))
-            return nr == r0 or nc == c0
-        rows = {r for _, r in existing}
-        cols = {c for c, _ in existing}
-        if len(rows) == 1:
-            return nr == next(iter(rows))
-        if len(cols) == 1:
-            return nc == next(iter(cols))
-        return False
-
-    def _line_owners(self, active_pos: dict):
-        owners = {}
-        for s, positions in active_pos.items():
-            if not positions or len(positions) < 2:
-                continue
-            rows = {r for _, r in positions}
-            cols = {c for c, _ in positions}
-            if len(rows) == 1:
-                owners[("H", next(iter(rows)))] = s
-            elif len(cols) == 1:
-                owners[("V", next(iter(cols)))] = s
-        return owners
-
-    def _conn_line_key(self, c, r, nc, nr):
-        if nr == r:
-            return ("H", r)
-        return ("V", c)
-
-    def _line_free_for(self, owners: dict, key, synergy: str):
-        cur = owners.get(key)
-        return (cur is None) or (cur == synergy)
+        return self.regras.posicoes_ativas()
 
     def _tipo_dado_para_attr(self, tipo: str):
         t = str(tipo or "").strip().lower()
@@ -283,74 +297,156 @@ class Grid:
 
     # ---------------- placement rules ----------------
     def can_place(self, cartucho, c, r):
-        if not (0 <= c < self.cols and 0 <= r < self.rows):
-            return False
-
-        occupying = self.occ.get((c, r))
-        if occupying is not None:
-            # Sobreposição só é válida no mesmo brawler (vira estrela).
-            new_id = str(getattr(cartucho, "id", "") or "").strip().lower()
-            new_nome = str(getattr(cartucho, "nome", "") or "").strip().lower()
-            occ_id = str(getattr(occupying, "id", "") or "").strip().lower()
-            occ_nome = str(getattr(occupying, "nome", "") or "").strip().lower()
-            same = (new_id and occ_id == new_id) or (new_nome and occ_nome == new_nome)
-            return bool(same)
-
-        if not self.occ:
-            return True
-
-        s_new = _get_syms(cartucho)
-        if not s_new:
-            return False
-
-        neighbor_cells = [(nc, nr) for (nc, nr) in self.neighbors4(c, r) if (nc, nr) in self.occ]
-        if not neighbor_cells:
-            return False
-
-        active = self._active_synergy_positions()
-        owners = self._line_owners(active)
+        return self.regras.can_place(cartucho, c, r)
 
-        for (nc, nr) in neighbor_cells:
-            other = self.occ[(nc, nr)]
-            shared = set(s_new) & set(_get_syms(other))
-            if not shared:
-                return False
+    def mascara_validas(self, cartucho):
+        return self.regras.mascara_validas(cartucho)
 
-            key = self._conn_line_key(c, r, nc, nr)
-
-            ok = False
-            for s in shared:
-                if not self._line_free_for(owners, key, s):
-                    continue
-                if (s not in active) or self._line_ok(active[s], (c, r)):
-                    ok = True
-                    break
-            if not ok:
-                return False
-
-        return True
+    def valid_cells_for(self, cartucho):
+        return self.regras.valid_cells_for(cartucho)
 
     def place(self, cartucho, c, r):
         existing = self.occ.get((c, r))
+        self.regras.place(cartucho, c, r)
         if existing is not None:
             estrelas = int(getattr(existing, "estrelas", 0) or 0) + 1
             existing.estrelas = max(0, min(3, estrelas))
+            self._mudancas[(c, r)] = (existing, existing.estrelas)
             self.campo_dirty = True
             return
 
         self.occ[(c, r)] = cartucho
         cartucho.set_location_grid(c, r, self.cell_rect(c, r))
+        self._mudancas[(c, r)] = (cartucho, int(getattr(cartucho, "estrelas", 0) or 0))
+        self.campo_dirty = True
+
+    # ---------------- desfazer / refazer ----------------
+    def _dono_do_ouro(self):
+        return getattr(self.loja, "player", None) or self.player
+
+    def _estado_fora_do_campo(self):
+        dono = self._dono_do_ouro()
+        return {
+            "banco": tuple(self.banco.slots) if self.banco else (),
+            "loja": tuple(getattr(self.loja, "cartuchos", ())),
+            "ouro": getattr(dono, "ouro", 0) if dono is not None else 0,
+            "gasto": getattr(self.loja, "gasto_total", 0),
+        }
+
+    def registrar_passo(self):
+        """Fecha um passo do histórico com o que mudou desde o último (O(células tocadas))."""
+        if self.historico is None:
+            self._mudancas = {}
+            return False
+        atual = self.historico.atual
+        resto = self._estado_fora_do_campo()
+        if not self._mudancas and all(getattr(atual, k) == v for k, v in resto.items()):
+            return False
+        self.historico.registrar(atual.com_mudancas(self._mudancas, **resto))
+        self._mudancas = {}
+        return True
+
+    def _ponto_sem_volta(self):
+        # venda/reroll mexem no deck da loja: o histórico recomeça daqui
+        if self.historico is not None:
+            self.historico.limpar(self.historico.atual.com_mudancas(self._mudancas, **self._estado_fora_do_campo()))
+        self._mudancas = {}
+
+    def _fechar_pendente(self):
+        # ouro/loja que mudaram por fora (bônus de batalha, rolagem de rodada) não
+        # são desfeitos: viram ponto sem volta; o resto vira um passo normal
+        if self.historico is None:
+            return
+        atual, resto = self.historico.atual, self._estado_fora_do_campo()
+        externo = any(getattr(atual, k) != resto[k] for k in ("loja", "ouro", "gasto"))
+        if externo and not self._mudancas and atual.banco == resto["banco"]:
+            self._ponto_sem_volta()
+        else:
+            self.registrar_passo()
+
+    def desfazer(self):
+        self._fechar_pendente()
+        return self._restaurar(self.historico.desfazer() if self.historico else None)
+
+    def refazer(self):
+        self._fechar_pendente()
+        return self._restaurar(self.historico.refazer() if self.historico else None)
+
+    def _restaurar(self, passo):
+        """Leva o estado de `de` pra `para` mexendo só nas células que diferem."""
+        if passo is None:
+            return False
+        de, para = passo
+        difs = de.diferencas(para)
+
+        # primeiro tira o que sai (a célula pode ganhar outro cartucho), depois põe
+        for cell, entrada in difs.items():
+            atual = self.occ.get(cell)
+            if atual is not None and (entrada is None or entrada[0] is not atual):
+                self.regras.remove_at(*cell)
+                del self.occ[cell]
+        for (c, r), (cartucho, estrelas) in ((k, v) for k, v in difs.items() if v is not None):
+            if self.occ.get((c, r)) is not cartucho:
+                self.regras.place(cartucho, c, r)
+                self.occ[(c, r)] = cartucho
+                cartucho.set_location_grid(c, r, self.cell_rect(c, r))
+            cartucho.estrelas = estrelas
+
+        if self.banco:
+            slots = list(para.banco)[: self.banco.slots_n]
+            self.banco.slots = slots + [None] * (self.banco.slots_n - len(slots))
+            self.banco.recompactar()
+        if self.loja is not None:
+            self.loja.cartuchos = list(para.loja)
+            for i, cartucho in enumerate(self.loja.cartuchos):
+                if cartucho is not None:
+                    cartucho.set_location_shop(self.loja.slot_rects[i])
+            self.loja.gasto_total = para.gasto
+        dono = self._dono_do_ouro()
+        if dono is not None:
+            dono.ouro = para.ouro
+
+        self._mudancas = {}
+        self._valid_cells = frozenset()
         self.campo_dirty = True
+        return True
+
+    # ---------------- sugestão de layout ----------------
+    def sugerir_layout(self, orcamento_ms=ORCAMENTO_MS, **kwargs):
+        """Melhor sequência (slot do banco, célula) pros cartuchos do banco, sem mexer em nada."""
+        slots = list(self.banco.slots) if self.banco else []
+        return sugerir_layout(self.regras, slots, orcamento_ms=orcamento_ms, **kwargs)
+
+    def aplicar_layout(self, sugestao):
+        """Tira do banco e posiciona os passos de uma sugestão (para no 1º que não valer mais)."""
+        if not self.banco:
+            return 0
+        feitos = 0
+        for slot, (c, r) in sugestao.get("passos", ()):
+            cartucho = self.banco.slots[slot] if 0 <= slot < len(self.banco.slots) else None
+            if cartucho is None or not self.can_place(cartucho, c, r):
+                break
+            self.banco.slots[slot] = None
+            self.place(cartucho, c, r)
+            feitos += 1
+        if feitos:
+            self.banco.recompactar()
+            self.registrar_passo()
+        return feitos
+
+    def _atualiza_jogaveis(self):
+        """banco.jogaveis = {id(cartucho): nº de células válidas}; nada a fazer se nada mudou."""
+        if not self.banco:
+            return
+        chave = (self.versao, tuple(self.banco.slots))
+        if chave == self._jogaveis_chave:
+            return
+        self._jogaveis_chave = chave
+        self.banco.jogaveis = {id(c): self.regras.n_validas(c) for c in self.banco.slots if c is not None}
 
     # ---------------- events ----------------
     def _recompute_valid_cells(self):
-        self._valid_cells.clear()
-        if not self.dragging:
-            return
-        for rr in range(self.rows):
-            for cc in range(self.cols):
-                if self.can_place(self.dragging, cc, rr):
-                    self._valid_cells.add((cc, rr))
+        self._valid_cells = self.valid_cells_for(self.dragging) if self.dragging else frozenset()
 
     def _handle_events(self, events, mouse_pos):
         if not (self.banco and self.loja and self.painel_sinergia):
@@ -364,11 +460,28 @@ class Grid:
                     self._apply_zoom_centered(-1)
                 continue
 
+            if e.type == pygame.KEYDOWN and e.key in (TECLA_DESFAZER, TECLA_REFAZER) and e.mod & pygame.KMOD_CTRL:
+                if not (self.dragging or self.dragging_dado):
+                    if e.key == TECLA_REFAZER or e.mod & pygame.KMOD_SHIFT:
+                        self.refazer()
+                    else:
+                        self.desfazer()
+                continue
+
+            if e.type == pygame.KEYDOWN and e.key in PAN_TECLAS:
+                dx, dy = PAN_TECLAS[e.key]
+                self.mover_camera(dx * self.cell_w, dy * self.cell_h)
+                continue
+
             if e.type == pygame.MOUSEBUTTONDOWN:
                 if e.button in (4, 5) and self._can_zoom_here(mouse_pos):
                     self._apply_zoom_centered(+1 if e.button == 4 else -1)
                     continue
 
+                if e.button in PAN_BOTOES and self._viewport().collidepoint(mouse_pos):
+                    self._pan_arrasto = (mouse_pos, self.pan)
+                    continue
+
                 if e.button == 1:
                     dado_pick = self._pick_dado_cartucho_grid(mouse_pos)
                     if dado_pick is not None:
@@ -381,6 +494,7 @@ class Grid:
 
                     if self.loja.btn_reroll.collidepoint(mouse_pos):
                         self.loja.handle_click(mouse_pos)
+                        self._ponto_sem_volta()
                         continue
 
                     # Compra direta da loja para o banco
@@ -389,6 +503,7 @@ class Grid:
                         if bought is not None:
                             self.banco.add_to_first_free(bought)
                             self.campo_dirty = True
+                            self.registrar_passo()
                             continue
 
                     picked = self.banco.pick_at_pos(mouse_pos)
@@ -397,6 +512,9 @@ class Grid:
                         self.dragging.start_drag(mouse_pos)
                         self._recompute_valid_cells()
 
+            elif e.type == pygame.MOUSEBUTTONUP and e.button in PAN_BOTOES:
+                self._pan_arrasto = None
+
             elif e.type == pygame.MOUSEBUTTONUP and e.button == 1:
                 if self.dragging_dado is not None:
                     if self.player is not None:
@@ -422,8 +540,9 @@ class Grid:
                             self.loja.player.ouro = getattr(self.loja.player, "ouro", 0) + sell_value
                         self.loja.deck_defs.append(self.dragging.to_def())
                         self.dragging = None
-                        self._valid_cells.clear()
+                        self._valid_cells = frozenset()
                         self.campo_dirty = True
+                        self._ponto_sem_volta()
                         continue
 
                     cell = self.in_cell(mouse_pos)
@@ -431,31 +550,41 @@ class Grid:
                         self.place(self.dragging, *cell)
                         self.dragging.stop_drag()
                         self.dragging = None
-                        self._valid_cells.clear()
+                        self._valid_cells = frozenset()
                     else:
                         self.dragging.stop_drag()
                         self.banco.return_to_slot(self.dragging)
                         self.dragging = None
-                        self._valid_cells.clear()
+                        self._valid_cells = frozenset()
+                    self.registrar_passo()
 
             elif e.type == pygame.MOUSEMOTION:
                 if self.dragging:
                     self.dragging.drag_update(mouse_pos)
+                if self._pan_arrasto is not None:
+                    (mx0, my0), (px0, py0) = self._pan_arrasto
+                    self.pan = (px0 + mouse_pos[0] - mx0, py0 + mouse_pos[1] - my0)
+                    self._recalc_layout()
 
     # ---------------- draw ----------------
     def _draw_grid_base(self, surf):
         pygame.draw.rect(surf, GRID_BORDER, self.rect(), 3)
 
     def _draw_grid_dividers(self, surf):
-        gr = self.rect()
-        overlay = pygame.Surface((gr.w, gr.h), pygame.SRCALPHA)
-        for c in range(1, self.cols):
-            x = c * self.cell_w
-            pygame.draw.line(overlay, (*GRID_LINE, GRID_LINE_ALPHA), (x, 0), (x, gr.h), 2)
-        for r in range(1, self.rows):
-            y = r * self.cell_h
-            pygame.draw.line(overlay, (*GRID_LINE, GRID_LINE_ALPHA), (0, y), (gr.w, y), 2)
-        surf.blit(overlay, (gr.x, gr.y))
+        # só o pedaço visível da grade
+        vis = self.rect().clip(self._viewport())
+        if vis.w <= 0 or vis.h <= 0:
+            return
+        ox, oy = self.origin
+        c0, c1, r0, r1 = self._faixa_visivel()
+        overlay = pygame.Surface(vis.size, pygame.SRCALPHA)
+        for c in range(max(1, c0), min(self.cols, c1 + 1)):
+            x = ox + c * self.cell_w - vis.x
+            pygame.draw.line(overlay, (*GRID_LINE, GRID_LINE_ALPHA), (x, 0), (x, vis.h), 2)
+        for r in range(max(1, r0), min(self.rows, r1 + 1)):
+            y = oy + r * self.cell_h - vis.y
+            pygame.draw.line(overlay, (*GRID_LINE, GRID_LINE_ALPHA), (0, y), (vis.w, y), 2)
+        surf.blit(overlay, vis.topleft)
 
     # ============================
     # CONTORNO "ELÁSTICO" COMO NA IMAGEM:
@@ -464,84 +593,132 @@ class Grid:
     # - quando sobrepõe, é literalmente um desenho por cima do outro (sem mesclar/split)
     # ============================
     def _components_4(self, cells: set):
-        visited = set()
-        comps = []
-        for start in cells:
-            if start in visited:
-                continue
-            stack = [start]
-            visited.add(start)
-            comp = {start}
-            while stack:
-                c, r = stack.pop()
-                for nc, nr in self.neighbors4(c, r):
-                    if (nc, nr) in cells and (nc, nr) not in visited:
-                        visited.add((nc, nr))
-                        stack.append((nc, nr))
-                        comp.add((nc, nr))
-            comps.append(comp)
-        return comps
-
-    def _perimeter_edges(self, comp: set):
-        edges = []
+        return self.regras.componentes(cells)
+
+    def _contornos(self, comp: set):
+        """
+        Perímetro de uma componente como polilinhas fechadas, em vértices da grade
+        (c, r); só os cantos ficam (trechos colineares viram um segmento só).
+        """
+        arestas = set()
         for (c, r) in comp:
-            rect = self.cell_rect(c, r)
-            x1, y1, x2, y2 = rect.left, rect.top, rect.right, rect.bottom
-
-            if (c, r - 1) not in comp: edges.append((x1, y1, x2, y1))  # top
-            if (c, r + 1) not in comp: edges.append((x1, y2, x2, y2))  # bottom
-            if (c - 1, r) not in comp: edges.append((x1, y1, x1, y2))  # left
-            if (c + 1, r) not in comp: edges.append((x2, y1, x2, y2))  # right
-
-        return edges
+            if (c, r - 1) not in comp: arestas.add(frozenset(((c, r), (c + 1, r))))          # top
+            if (c, r + 1) not in comp: arestas.add(frozenset(((c, r + 1), (c + 1, r + 1))))  # bottom
+            if (c - 1, r) not in comp: arestas.add(frozenset(((c, r), (c, r + 1))))          # left
+            if (c + 1, r) not in comp: arestas.add(frozenset(((c + 1, r), (c + 1, r + 1))))  # right
+
+        adj = {}
+        for aresta in arestas:
+            a, b = tuple(aresta)
+            adj.setdefault(a, []).append(b)
+            adj.setdefault(b, []).append(a)
+
+        caminhos = []
+        livres = set(arestas)
+        while livres:
+            inicio, atual = tuple(livres.pop())
+            pontos = [inicio]
+            while atual != inicio:
+                pontos.append(atual)
+                prox = next((v for v in adj[atual] if frozenset((atual, v)) in livres), None)
+                if prox is None:
+                    break
+                livres.discard(frozenset((atual, prox)))
+                atual = prox
+
+            # tira vértices no meio de trecho reto (laço fechado: vizinhos com wrap)
+            n = len(pontos)
+            cantos = []
+            for i, (x, y) in enumerate(pontos):
+                (px, py), (nx, ny) = pontos[i - 1], pontos[(i + 1) % n]
+                if (x - px) * (ny - y) != (y - py) * (nx - x):
+                    cantos.append((x, y))
+            caminhos.append(cantos or pontos)
+        return caminhos
+
+    def _geometria_contornos(self, active_pos: dict):
+        """sym -> polilinhas (vértices da grade); refeita só quando o campo muda."""
+        if self._contorno_geo_versao != self.versao:
+            self._contorno_geo = {
+                sym: [p for comp in self._components_4(pos_set) for p in self._contornos(comp)]
+                for sym, pos_set in active_pos.items() if pos_set
+            }
+            self._contorno_geo_versao = self.versao
+            self._contorno_camadas = {}
+        return self._contorno_geo
+
+    def _render_contornos(self, caminhos_por_cor, thick):
+        """
+        Camada SRCALPHA só do retângulo que os contornos ocupam (+ margem do traço);
+        devolve (layer, (dx, dy)) com o deslocamento em relação à origem da grade.
+        """
+        pad = thick + 4
+        cw, ch = self.cell_w, self.cell_h
+        vertices = [v for _color, caminhos in caminhos_por_cor for caminho in caminhos for v in caminho]
+        if not vertices:
+            return pygame.Surface((1, 1), pygame.SRCALPHA), (0, 0)
+        c_min = min(c for c, _ in vertices)
+        r_min = min(r for _, r in vertices)
+        c_max = max(c for c, _ in vertices)
+        r_max = max(r for _, r in vertices)
+
+        layer = pygame.Surface(((c_max - c_min) * cw + 2 * pad, (r_max - r_min) * ch + 2 * pad), pygame.SRCALPHA)
+        rad = max(2, thick // 2)
+        for color, caminhos in caminhos_por_cor:
+            for caminho in caminhos:
+                pts = [(pad + (c - c_min) * cw, pad + (r - r_min) * ch) for (c, r) in caminho]
+                if len(pts) >= 2:
+                    pygame.draw.lines(layer, color, True, pts, thick)
+                for p in pts:
+                    pygame.draw.circle(layer, color, p, rad)
+        # quase tudo transparente: RLE deixa o blit por frame bem mais barato
+        layer.set_alpha(255, pygame.RLEACCEL)
+        return layer, (c_min * cw - pad, r_min * ch - pad)
+
+    def _camada_contornos(self, chave, caminhos_por_cor, thick):
+        camadas = self._contorno_camadas
+        if camadas.get("_zoom") != (self.cell_w, self.cell_h):
+            camadas.clear()
+            camadas["_zoom"] = (self.cell_w, self.cell_h)
+        if chave not in camadas:
+            camadas[chave] = self._render_contornos(caminhos_por_cor, thick)
+        return camadas[chave]
 
     def _draw_synergy_outlines(self, surf, active_pos: dict, agora_ms: int, hovered_synergy: str | None = None):
         if not active_pos:
             return
 
         thick = SYNERGY_STROKE
-        rad = max(2, thick // 2)
-
-        # ordem estável para sobreposição previsível
-        items = sorted(active_pos.items(), key=lambda kv: kv[0])
-
-        hover_pulse = 0.78 + 0.28 * _blink_strength(agora_ms, period_ms=640)
-
-        non_hover = []
-        hover_item = None
-        for sym, pos_set in items:
-            if hovered_synergy is not None and _norm_sym(sym) == _norm_sym(hovered_synergy):
-                hover_item = (sym, pos_set)
-            else:
-                non_hover.append((sym, pos_set))
-
-        draw_order = non_hover + ([hover_item] if hover_item else [])
-
-        for sym, pos_set in draw_order:
-            if not pos_set:
-                continue
-            color = _color_for_synergy(sym, self._syn_color_cache)
-            is_hover = hovered_synergy is not None and _norm_sym(sym) == _norm_sym(hovered_synergy)
-            draw_thick = thick + 4 if is_hover else thick
-            draw_color = (
-                min(255, int(color[0] * hover_pulse)),
-                min(255, int(color[1] * hover_pulse)),
-                min(255, int(color[2] * hover_pulse)),
-            ) if is_hover else color
-
-            for comp in self._components_4(set(pos_set)):
-                for (x1, y1, x2, y2) in self._perimeter_edges(comp):
-                    pygame.draw.line(surf, draw_color, (x1, y1), (x2, y2), draw_thick)
-                    pygame.draw.circle(surf, draw_color, (x1, y1), max(2, draw_thick // 2))
-                    pygame.draw.circle(surf, draw_color, (x2, y2), max(2, draw_thick // 2))
+        geo = self._geometria_contornos(active_pos)
+        ox, oy = self.origin
+
+        # todas as sinergias numa camada só (ordem estável para sobreposição previsível)
+        todas = [(_color_for_synergy(sym, self._syn_color_cache), geo[sym]) for sym in sorted(geo)]
+        layer, (dx, dy) = self._camada_contornos("todas", todas, thick)
+        surf.blit(layer, (ox + dx, oy + dy))
+
+        # hover por cima, mais grosso e pulsando (pulso em degraus, cada um renderizado 1x)
+        hover_sym = None
+        if hovered_synergy is not None:
+            hover_sym = next((sym for sym in geo if _norm_sym(sym) == _norm_sym(hovered_synergy)), None)
+        if hover_sym is None:
+            return
+        degrau = int(_blink_strength(agora_ms, period_ms=640) * (PULSO_DEGRAUS - 1) + 0.5)
+        hover_pulse = 0.78 + 0.28 * degrau / (PULSO_DEGRAUS - 1)
+        color = _color_for_synergy(hover_sym, self._syn_color_cache)
+        draw_color = tuple(min(255, int(v * hover_pulse)) for v in color)
+        layer, (dx, dy) = self._camada_contornos(("hover", hover_sym, degrau), [(draw_color, geo[hover_sym])], thick + 4)
+        surf.blit(layer, (ox + dx, oy + dy))
 
     def _draw_placed_cartuchos(self, surf):
+        vp = self._viewport()
         for (c, r), cartucho in self.occ.items():
             if cartucho.dragging:
                 continue
             cartucho.set_rect(self.cell_rect(c, r))
         for cartucho in self.occ.values():
-            cartucho.draw(surf, self.fonte_nome, self.fonte_carac, compact=True)
+            if cartucho.rect.colliderect(vp):
+                cartucho.draw(surf, self.fonte_nome, self.fonte_carac, compact=True)
 
     def _draw_highlights(self, surf, mouse_pos, agora_ms: int):
         if not self.dragging:
@@ -552,7 +729,10 @@ class Grid:
         blink = _blink_strength(agora_ms)
         glow_strength = 0.35 + 0.65 * blink
 
+        c0, c1, r0, r1 = self._faixa_visivel()
         for (c, r) in self._valid_cells:
+            if not (c0 <= c < c1 and r0 <= r < r1):
+                continue
             rect = self.cell_rect(c, r)
             draw_glow_rect(surf, rect, PLACE_YELLOW, strength=glow_strength)
             pygame.draw.rect(surf, PLACE_YELLOW, rect, 3)
@@ -574,7 +754,7 @@ class Grid:
         if not self.dragging:
             return
         cell = self.in_cell(mouse_pos)
-        hl = PLACE_YELLOW if (cell and self.can_place(self.dragging, *cell)) else (HOVER_BAD if cell else None)
+        hl = PLACE_YELLOW if (cell and cell in self._valid_cells) else (HOVER_BAD if cell else None)
         self.dragging.draw(surf, self.fonte_nome, self.fonte_carac, highlight=hl, compact=False)
 
 
@@ -599,8 +779,9 @@ class Grid:
     def _all_visible_cartuchos(self):
         cards = []
 
+        vp = self._viewport()
         for c in self.occ.values():
-            if not getattr(c, "dragging", False):
+            if not getattr(c, "dragging", False) and c.rect.colliderect(vp):
                 cards.append(c)
 
         for c in getattr(self.loja, "cartuchos", []):
@@ -643,6 +824,26 @@ class Grid:
                 "micro": self.fonte_hover_micro,
             },
         )
+        if getattr(cartucho, "location", None) != "grid":
+            self._draw_previa_impacto(surf, cartucho, panel)
+
+    def _draw_previa_impacto(self, surf, cartucho, panel):
+        previa = self.previa.consultar(self.versao, cartucho)
+        if previa is None:
+            txt = "Calculando melhor posição..."
+        elif previa["celula"] is None:
+            txt = "Sem posição válida no campo"
+        else:
+            c, r = previa["celula"]
+            txt = f"Melhor célula ({c + 1}, {r + 1}): {previa['conexoes']} conexões, +{previa['ganho']} pts de sinergia"
+            # a ficha é desenhada fora do recorte da grade: recorta de novo na vista
+            clip_antes = surf.get_clip()
+            surf.set_clip(self._viewport().inflate(6, 6).clip(clip_antes))
+            pygame.draw.rect(surf, PLACE_YELLOW, self.cell_rect(c, r), 3, border_radius=6)
+            surf.set_clip(clip_antes)
+
+        t = self.fonte_hover_txt.render(txt, True, (235, 235, 245))
+        surf.blit(t, (panel.x + 10, panel.y - t.get_height() - 6))
 
     def draw_dragging_dado_overlay(self, surf, mouse_pos):
         self._draw_dragging_dado(surf, mouse_pos)
@@ -654,19 +855,28 @@ class Grid:
 
         if self.dragging:
             self._recompute_valid_cells()
+        self._atualiza_jogaveis()
+        if self.banco and self.loja:
+            self.previa.atualizar(self.regras, list(getattr(self.loja, "cartuchos", [])) + list(self.banco.slots))
 
         self.tela.fill(BG)
-        self._draw_grid_base(self.tela)
 
         self._draw_banco(self.tela)
         self._draw_right_panel(self.tela)
 
+        # tudo que é da grade fica recortado na vista (grades maiores que a tela)
+        clip_antes = self.tela.get_clip()
+        self.tela.set_clip(self._viewport().inflate(6, 6))
+        self._draw_grid_base(self.tela)
+
         active = self._get_active_cached(agora)
         hovered = getattr(self.painel_sinergia, "hovered_synergy", None) if self.painel_sinergia else None
         self._draw_synergy_outlines(self.tela, active, agora, hovered)
 
         self._draw_placed_cartuchos(self.tela)
         self._draw_highlights(self.tela, mouse_pos, agora)
+        self.tela.set_clip(clip_antes)
+
         self._draw_dragging(self.tela, mouse_pos)
         hovered_cartucho = self._hovered_cartucho(mouse_pos)
         self._draw_hover_ficha(self.tela, hovered_cartucho)
@@ -0,0 +1,415 @@
+# GridRules.py
+from collections import OrderedDict
+
+# ============================================================
+# REGRAS DA GRADE (sem pygame)
+# Posicionamento, sinergias conectadas e retas, separados do desenho da Grid.
+# Só guarda o que as regras precisam de cada célula (sinergias e id/nome do
+# brawler), então copia barato e vai por pickle pra workers de busca/balanceamento.
+# Qualquer objeto com .sinergias (ou .dados["características"]) e .id/.nome serve
+# como cartucho.
+#
+# REGRAS:
+#   - 1º cartucho livre
+#   - Depois: adjacente a 1+ ocupado e conecta com TODOS os vizinhos adjacentes
+#   - Retas (sem L): sinergia ativa só se já foi usada numa conexão real
+#   - 1 reta (row/col) pode pertencer a APENAS 1 sinergia
+#   - Sobreposição só no mesmo brawler (vira estrela)
+# ============================================================
+GRID_COLS = 10
+GRID_ROWS = 10
+
+# mapas de células válidas guardados (por versão do tabuleiro + brawler arrastado)
+CACHE_VALIDAS = 16
+
+
+def _norm_sym(x) -> str:
+    return str(x).strip().lower()
+
+
+def sinergias_de(cartucho):
+    """Sinergias normalizadas de um cartucho (ou de qualquer objeto parecido)."""
+    raw = getattr(cartucho, "sinergias", None) or getattr(cartucho, "synergies", None)
+    if not raw:
+        dados = getattr(cartucho, "dados", {}) or {}
+        raw = dados.get("características", []) or []
+    if not isinstance(raw, (list, tuple, set, frozenset)):
+        return []
+    return [_norm_sym(s) for s in raw if str(s).strip()]
+
+
+def chaves_brawler(cartucho):
+    """(("id", ...), ("nome", ...)) normalizados: mesmo brawler = alguma chave igual."""
+    chaves = []
+    for campo in ("id", "nome"):
+        v = str(getattr(cartucho, campo, "") or "").strip().lower()
+        if v:
+            chaves.append((campo, v))
+    return tuple(chaves)
+
+
+class GridRules:
+    def __init__(self, cols=GRID_COLS, rows=GRID_ROWS):
+        self.cols, self.rows = int(cols), int(rows)
+        self._init_mascaras()
+
+        self._cell_syms = {}   # (c,r) -> frozenset de sinergias do ocupante
+        self._cell_chaves = {} # (c,r) -> chaves_brawler do ocupante
+        self._syn_grau = {}    # ((c,r), sym) -> nº de vizinhos que compartilham sym
+        self._syn_pos = {}     # sym -> set[(c,r)] conectadas
+        self._syn_bits = {}    # sym -> bitboard das células conectadas
+        self._sym_membros = {} # sym -> bitboard das células cujo ocupante tem sym
+        self._occ_bits = 0     # bitboard das células ocupadas
+        self._brawler_bits = {}  # ("id"/"nome", valor) -> bitboard (sobreposição = estrela)
+        self._syn_linha = {}   # sym -> ("H", r) / ("V", c) se a sinergia é uma reta
+        self._line_donos = {}  # ("H", r) / ("V", c) -> set de sinergias donas da reta
+
+        # versão do tabuleiro (place/remove_at incrementam) + LRU dos mapas válidos
+        self.versao = 0
+        self._cache_validas = OrderedDict()
+
+    @classmethod
+    def de_ocupacao(cls, occ, cols=GRID_COLS, rows=GRID_ROWS):
+        """Regras montadas a partir de um {(c,r): cartucho} já pronto (sem checar regra)."""
+        regras = cls(cols, rows)
+        for (c, r), cartucho in occ.items():
+            regras.place(cartucho, c, r)
+        return regras
+
+    def copy(self):
+        novo = object.__new__(GridRules)
+        novo.__setstate__(self.__getstate__())
+        return novo
+
+    # pickle/cópia: tudo são ints, tuplas e sets; o cache de mapas válidos não vai junto
+    def __getstate__(self):
+        estado = dict(self.__dict__)
+        estado["_cache_validas"] = None
+        return estado
+
+    def __setstate__(self, estado):
+        self.__dict__.update(estado)
+        self._syn_pos = {sym: set(pos) for sym, pos in self._syn_pos.items()}
+        self._line_donos = {k: set(v) for k, v in self._line_donos.items()}
+        for k in ("_cell_syms", "_cell_chaves", "_syn_grau", "_syn_bits", "_sym_membros", "_brawler_bits", "_syn_linha"):
+            setattr(self, k, dict(getattr(self, k)))
+        self._cache_validas = OrderedDict()
+
+    def __len__(self):
+        return len(self._cell_syms)
+
+    def __contains__(self, cell):
+        return cell in self._cell_syms
+
+    def ocupadas(self):
+        return self._cell_syms.keys()
+
+    def sinergias_em(self, cell):
+        return self._cell_syms.get(cell, frozenset())
+
+    def neighbors4(self, c, r):
+        for dc, dr in ((1,0), (-1,0), (0,1), (0,-1)):
+            nc, nr = c + dc, r + dr
+            if 0 <= nc < self.cols and 0 <= nr < self.rows:
+                yield (nc, nr)
+
+    # ---------------- bitboards ----------------
+    # Célula (c, r) = bit r*cols + c. Ocupação, membros de cada sinergia e
+    # células conectadas viram inteiros; vizinhança é shift + máscara de borda.
+    def _init_mascaras(self):
+        cols, rows = self.cols, self.rows
+        self._bit_cheio = (1 << (cols * rows)) - 1
+        linha0 = (1 << cols) - 1
+        self._bit_linha = [linha0 << (r * cols) for r in range(rows)]
+        col0 = sum(1 << (r * cols) for r in range(rows))
+        self._bit_coluna = [col0 << c for c in range(cols)]
+        self._bit_sem_esq = self._bit_cheio & ~self._bit_coluna[0]
+        self._bit_sem_dir = self._bit_cheio & ~self._bit_coluna[cols - 1]
+
+    def _bit(self, c, r):
+        return 1 << (r * self.cols + c)
+
+    def _celulas(self, bits):
+        """Bitboard -> (c, r) de cada bit ligado."""
+        cols = self.cols
+        while bits:
+            low = bits & -bits
+            i = low.bit_length() - 1
+            yield (i % cols, i // cols)
+            bits ^= low
+
+    def _viz_h(self, bits):
+        """Células com vizinho (esq/dir) em `bits`."""
+        return ((bits >> 1) & self._bit_sem_dir) | ((bits << 1) & self._bit_sem_esq)
+
+    def _viz_v(self, bits):
+        """Células com vizinho (cima/baixo) em `bits`."""
+        return (bits >> self.cols) | ((bits << self.cols) & self._bit_cheio)
+
+    def _dilata(self, bits):
+        return self._viz_h(bits) | self._viz_v(bits)
+
+    def _componentes_bits(self, bits):
+        """Componentes 4-conexas por flood fill bit-paralelo (uma camada por passo)."""
+        while bits:
+            comp = bits & -bits
+            while True:
+                maior = (comp | self._dilata(comp)) & bits
+                if maior == comp:
+                    break
+                comp = maior
+            yield comp
+            bits &= ~comp
+
+    def _mascara_reta(self, bits):
+        """Células que mantêm `bits` numa reta só (sem L) se entrarem."""
+        i = (bits & -bits).bit_length() - 1
+        linha, coluna = self._bit_linha[i // self.cols], self._bit_coluna[i % self.cols]
+        m = 0
+        if not bits & ~linha:
+            m |= linha
+        if not bits & ~coluna:
+            m |= coluna
+        return m
+
+    # ---------------- active synergies (índice incremental) ----------------
+    def _pos_add(self, sym, cell):
+        self._syn_pos.setdefault(sym, set()).add(cell)
+        self._syn_bits[sym] = self._syn_bits.get(sym, 0) | self._bit(*cell)
+
+    def _pos_remove(self, sym, cell):
+        pos = self._syn_pos[sym]
+        pos.discard(cell)
+        self._syn_bits[sym] &= ~self._bit(*cell)
+        if not pos:
+            del self._syn_pos[sym], self._syn_bits[sym]
+
+    def _atualiza_linha(self, sym):
+        """Recalcula de qual reta (se alguma) a sinergia é dona: O(1) pelas máscaras."""
+        nova = None
+        bits = self._syn_bits.get(sym, 0)
+        if bits & (bits - 1):  # 2+ células
+            i = (bits & -bits).bit_length() - 1
+            r, c = divmod(i, self.cols)
+            if not bits & ~self._bit_linha[r]:
+                nova = ("H", r)
+            elif not bits & ~self._bit_coluna[c]:
+                nova = ("V", c)
+
+        antiga = self._syn_linha.get(sym)
+        if antiga == nova:
+            return
+        if antiga is not None:
+            donos = self._line_donos[antiga]
+            donos.discard(sym)
+            if not donos:
+                del self._line_donos[antiga]
+            del self._syn_linha[sym]
+        if nova is not None:
+            self._line_donos.setdefault(nova, set()).add(sym)
+            self._syn_linha[sym] = nova
+
+    def _link(self, cell, other, delta):
+        """Conecta (+1) ou desconecta (-1) duas células vizinhas nas sinergias em comum."""
+        for sym in self._cell_syms[cell] & self._cell_syms[other]:
+            for x in (cell, other):
+                chave = (x, sym)
+                antes = self._syn_grau.get(chave, 0)
+                depois = antes + delta
+                if depois > 0:
+                    self._syn_grau[chave] = depois
+                else:
+                    self._syn_grau.pop(chave, None)
+                if antes == 0 and depois > 0:
+                    self._pos_add(sym, x)
+                elif antes > 0 and depois <= 0:
+                    self._pos_remove(sym, x)
+            self._atualiza_linha(sym)
+
+    def posicoes_ativas(self):
+        """sym -> set[(c,r)] das células conectadas; é o próprio índice (não alterar)."""
+        return self._syn_pos
+
+    def contagem_ativas(self):
+        """sym -> nº de brawlers conectados (formato de PlayerEstrategista.sinergias_ativas)."""
+        return {sym: len(pos) for sym, pos in self._syn_pos.items()}
+
+    def componentes(self, cells):
+        """Componentes 4-conexas de um conjunto de células (lista de sets)."""
+        bits = 0
+        for c, r in cells:
+            bits |= self._bit(c, r)
+        return [set(self._celulas(comp)) for comp in self._componentes_bits(bits)]
+
+    def _line_ok(self, sym, new_cell):
+        """A sinergia continua uma reta (sem L) se ganhar new_cell?"""
+        bits = self._syn_bits.get(sym)
+        if bits is None:
+            return True
+        return bool(self._mascara_reta(bits) & self._bit(*new_cell))
+
+    def _conn_line_key(self, c, r, nc, nr):
+        if nr == r:
+            return ("H", r)
+        return ("V", c)
+
+    def _line_free_for(self, key, synergy: str):
+        donos = self._line_donos.get(key)
+        return (not donos) or (synergy in donos)
+
+    def _mascaras_livres(self, synergy: str):
+        """(linhas, colunas) livres pra `synergy` como bitboards: retas sem dono ou já dela."""
+        livres_h = livres_v = self._bit_cheio
+        for (eixo, k), donos in self._line_donos.items():
+            if synergy in donos:
+                continue
+            if eixo == "H":
+                livres_h &= ~self._bit_linha[k]
+            else:
+                livres_v &= ~self._bit_coluna[k]
+        return livres_h, livres_v
+
+    # ---------------- placement rules ----------------
+    def can_place(self, cartucho, c, r):
+        if not (0 <= c < self.cols and 0 <= r < self.rows):
+            return False
+
+        if (c, r) in self._cell_syms:
+            # Sobreposição só é válida no mesmo brawler (vira estrela).
+            return bool(set(chaves_brawler(cartucho)) & set(self._cell_chaves[(c, r)]))
+
+        if not self._cell_syms:
+            return True
+
+        s_new = set(sinergias_de(cartucho))
+        if not s_new:
+            return False
+
+        neighbor_cells = [(nc, nr) for (nc, nr) in self.neighbors4(c, r) if (nc, nr) in self._cell_syms]
+        if not neighbor_cells:
+            return False
+
+        for (nc, nr) in neighbor_cells:
+            shared = s_new & self._cell_syms[(nc, nr)]
+            if not shared:
+                return False
+
+            key = self._conn_line_key(c, r, nc, nr)
+
+            ok = False
+            for s in shared:
+                if not self._line_free_for(key, s):
+                    continue
+                if self._line_ok(s, (c, r)):
+                    ok = True
+                    break
+            if not ok:
+                return False
+
+        return True
+
+    def mascara_validas(self, cartucho):
+        """
+        Bitboard de todas as células onde can_place(cartucho, c, r) vale,
+        com algumas operações de máscara por sinergia do cartucho (sem 100 can_place).
+        """
+        estrelas = 0
+        for chave in chaves_brawler(cartucho):
+            estrelas |= self._brawler_bits.get(chave, 0)
+
+        if not self._cell_syms:
+            return self._bit_cheio
+
+        livres = self._dilata(self._occ_bits) & ~self._occ_bits
+        s_new = set(sinergias_de(cartucho))
+        if not s_new or not livres:
+            return estrelas
+
+        # por direção (vizinho à dir, esq, baixo, cima): células cujo vizinho
+        # daquele lado tem sinergia em comum numa reta livre e sem L
+        cols, cheio = self.cols, self._bit_cheio
+        desloca = (
+            lambda m: (m >> 1) & self._bit_sem_dir,
+            lambda m: (m << 1) & self._bit_sem_esq,
+            lambda m: m >> cols,
+            lambda m: (m << cols) & cheio,
+        )
+        ok = [0, 0, 0, 0]
+        for s in s_new:
+            membros = self._sym_membros.get(s, 0)
+            if not membros:
+                continue
+            reta = self._mascara_reta(self._syn_bits[s]) if s in self._syn_bits else cheio
+            livres_h, livres_v = self._mascaras_livres(s)
+            for d, f in enumerate(desloca):
+                ok[d] |= f(membros) & reta & (livres_h if d < 2 else livres_v)
+
+        # qualquer vizinho ocupado que não aceita derruba a célula
+        ruins = 0
+        for d, f in enumerate(desloca):
+            ruins |= f(self._occ_bits) & ~ok[d]
+        return (livres & ~ruins) | estrelas
+
+    # ---------------- ocupação ----------------
+    def place(self, cartucho, c, r):
+        """Ocupa (c, r). Se já tem alguém lá (estrela), só muda a versão; devolve se ocupou."""
+        self.versao += 1
+        if (c, r) in self._cell_syms:
+            return False
+
+        self._cell_syms[(c, r)] = syms = frozenset(sinergias_de(cartucho))
+        self._cell_chaves[(c, r)] = chaves = chaves_brawler(cartucho)
+        bit = self._bit(c, r)
+        self._occ_bits |= bit
+        for chave in chaves:
+            self._brawler_bits[chave] = self._brawler_bits.get(chave, 0) | bit
+        for sym in syms:
+            self._sym_membros[sym] = self._sym_membros.get(sym, 0) | bit
+        for viz in self.neighbors4(c, r):
+            if viz in self._cell_syms:
+                self._link((c, r), viz, +1)
+        return True
+
+    def remove_at(self, c, r):
+        if (c, r) not in self._cell_syms:
+            return False
+        for viz in self.neighbors4(c, r):
+            if viz in self._cell_syms:
+                self._link((c, r), viz, -1)
+        bit = self._bit(c, r)
+        for sym in self._cell_syms.pop((c, r)):
+            self._sym_membros[sym] &= ~bit
+            if not self._sym_membros[sym]:
+                del self._sym_membros[sym]
+        self._occ_bits &= ~bit
+        for chave in self._cell_chaves.pop((c, r)):
+            self._brawler_bits[chave] &= ~bit
+            if not self._brawler_bits[chave]:
+                del self._brawler_bits[chave]
+        self.versao += 1
+        return True
+
+    # ---------------- mapa de células válidas ----------------
+    def n_validas(self, cartucho):
+        """Quantas células aceitam o cartucho agora (inclui sobreposição de estrela)."""
+        return self.mascara_validas(cartucho).bit_count()
+
+    def vazias_validas(self, cartucho):
+        """Células livres onde o cartucho entra (sem as sobreposições de estrela)."""
+        return list(self._celulas(self.mascara_validas(cartucho) & ~self._occ_bits))
+
+    def valid_cells_for(self, cartucho):
+        """
+        frozenset das células válidas pro cartucho, memorizado por
+        (versão do tabuleiro, id/nome do brawler, sinergias): durante o arrasto é só lookup.
+        """
+        chave = (self.versao, chaves_brawler(cartucho), frozenset(sinergias_de(cartucho)))
+        cache = self._cache_validas
+        cells = cache.get(chave)
+        if cells is not None:
+            cache.move_to_end(chave)
+            return cells
+        cells = cache[chave] = frozenset(self._celulas(self.mascara_validas(cartucho)))
+        if len(cache) > CACHE_VALIDAS:
+            cache.popitem(last=False)
+        return cells
@@ -0,0 +1,209 @@
+# GridSolver.py
+import threading
+import time
+from types import SimpleNamespace
+
+from GridRules import chaves_brawler, sinergias_de
+
+# ============================================================
+# SUGESTÃO DE LAYOUT (beam search sobre as GridRules)
+# Procura a sequência de posicionamentos dos cartuchos do banco que deixa
+# mais sinergias ativas (e maiores), respeitando todas as regras de can_place.
+# Cada filho é avaliado com place + remove_at no próprio estado (O(grau)),
+# só os `largura` melhores de cada nível viram cópia. Anytime: estourou o
+# orçamento, devolve o melhor achado até ali.
+# ============================================================
+ORCAMENTO_MS = 30       # na thread da UI; worker em background pode passar mais
+LARGURA_BEAM = 8
+PESO_SINERGIA = 2       # cada sinergia ativa vale isso além do nº de brawlers nela
+
+
+def pontuacao(regras):
+    """Brawlers conectados somados por sinergia + bônus por sinergia ativa."""
+    pos = regras.posicoes_ativas()
+    return sum(len(p) for p in pos.values()) + PESO_SINERGIA * len(pos)
+
+
+def _assinatura(cartucho):
+    # cartuchos com mesma assinatura são intercambiáveis pra busca
+    return chaves_brawler(cartucho), frozenset(sinergias_de(cartucho))
+
+
+def _candidatas(regras, cartucho):
+    """Células vazias válidas (tabuleiro vazio: só o centro, o resto é simétrico o bastante)."""
+    if not len(regras):
+        return [(regras.cols // 2, regras.rows // 2)]
+    return regras.vazias_validas(cartucho)
+
+
+def sugerir_layout(regras, cartuchos, *, orcamento_ms=ORCAMENTO_MS, largura=LARGURA_BEAM):
+    """
+    `regras`: GridRules do campo atual (não é alterada). `cartuchos`: lista
+    (ex. Banco.slots, None = slot vazio). Retorna {"passos": [(índice, (c, r)), ...],
+    "pontuacao", "sinergias" (contagem final), "completo", "tempo_ms"}.
+    `completo` = False quando o orçamento acabou antes da busca terminar.
+    """
+    t0 = time.perf_counter()
+    limite = t0 + max(0.0, orcamento_ms) / 1000.0
+    largura = max(1, int(largura))
+
+    itens = [(i, c) for i, c in enumerate(cartuchos) if c is not None]
+    assin = {i: _assinatura(c) for i, c in itens}
+
+    base = regras.copy()
+    melhor_pts, melhor_passos = pontuacao(base), ()
+    # (pontuação, passos, regras, índices usados, chave do estado)
+    feixe = [(melhor_pts, (), base, frozenset(), frozenset())]
+    completo = True
+
+    while feixe and completo:
+        filhos = {}
+        for _pts, passos, estado, usados, chave in feixe:
+            vistos = set()
+            for i, cartucho in itens:
+                if i in usados or assin[i] in vistos:
+                    continue
+                vistos.add(assin[i])
+                for cell in _candidatas(estado, cartucho):
+                    if time.perf_counter() > limite:
+                        completo = False
+                        break
+                    estado.place(cartucho, *cell)
+                    pts = pontuacao(estado)
+                    estado.remove_at(*cell)
+
+                    chave_filho = chave | {(cell, assin[i])}
+                    atual = filhos.get(chave_filho)
+                    if atual is None or pts > atual[0]:
+                        filhos[chave_filho] = (pts, passos, estado, usados, i, cell)
+                if not completo:
+                    break
+            if not completo:
+                break
+
+        escolhidos = sorted(filhos.items(), key=lambda kv: -kv[1][0])[:largura]
+        feixe = []
+        for chave_filho, (pts, passos, estado, usados, i, cell) in escolhidos:
+            filho = estado.copy()
+            filho.place(cartuchos[i], *cell)
+            novos_passos = passos + ((i, cell),)
+            feixe.append((pts, novos_passos, filho, usados | {i}, chave_filho))
+            if pts > melhor_pts:
+                melhor_pts, melhor_passos = pts, novos_passos
+
+    final = regras.copy()
+    for i, cell in melhor_passos:
+        final.place(cartuchos[i], *cell)
+
+    return {
+        "passos": list(melhor_passos),
+        "pontuacao": melhor_pts,
+        "sinergias": final.contagem_ativas(),
+        "completo": completo,
+        "tempo_ms": (time.perf_counter() - t0) * 1000.0,
+    }
+
+
+# ============================================================
+# PRÉVIA "E SE" (hover em carta da loja/banco)
+# Pra cada carta: melhor célula, quanto a pontuação sobe e quantas conexões
+# (vizinho, sinergia) ela abre. Roda numa thread contra uma cópia das regras;
+# a UI só compara versão e faz lookup no cache (versão, assinatura).
+# ============================================================
+def impacto(regras, cartucho):
+    """{"celula", "ganho", "conexoes", "validas"} da melhor célula pro cartucho (regras voltam iguais)."""
+    base = pontuacao(regras)
+    syms = frozenset(sinergias_de(cartucho))
+    cands = _candidatas(regras, cartucho)
+    melhor = {"celula": None, "ganho": 0, "conexoes": 0, "validas": len(cands)}
+    for cell in cands:
+        conexoes = sum(len(syms & regras.sinergias_em(v)) for v in regras.neighbors4(*cell))
+        regras.place(cartucho, *cell)
+        ganho = pontuacao(regras) - base
+        regras.remove_at(*cell)
+        if melhor["celula"] is None or (ganho, conexoes) > (melhor["ganho"], melhor["conexoes"]):
+            melhor.update(celula=cell, ganho=ganho, conexoes=conexoes)
+    return melhor
+
+
+def _ficha(assinatura):
+    # só o que as regras leem; a thread não toca no Cartucho (pygame)
+    chaves, syms = assinatura
+    campos = dict(chaves)
+    return SimpleNamespace(id=campos.get("id", ""), nome=campos.get("nome", ""), sinergias=sorted(syms))
+
+
+class PreviaImpacto:
+    """
+    Impacto das cartas calculado em background. atualizar() a cada frame é barato
+    (só enfileira quando a versão do campo ou as cartas mudam); consultar() é lookup
+    e devolve None enquanto a thread não terminou aquela carta. fechar() encerra a
+    thread (cada Grid nova cria a sua; a tela fecha a dela ao sair).
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._cache = {}      # (versao, assinatura) -> impacto
+        self._pedido = None   # (versao, regras copiadas, [assinaturas]) mais recente
+        self._versao = None
+        self._ultimo = None
+        self._ultimas_cartas = None
+        self._fechado = False
+        self._thread = None
+
+    def atualizar(self, regras, cartuchos):
+        cartas = (regras.versao, tuple(cartuchos))
+        if cartas == self._ultimas_cartas:
+            return  # mesmo campo, mesmas cartas (por identidade): nada a fazer
+        self._ultimas_cartas = cartas
+
+        assinaturas = {_assinatura(c) for c in cartuchos if c is not None}
+        chave = (regras.versao, frozenset(assinaturas))
+        if chave == self._ultimo:
+            return
+        self._ultimo = chave
+
+        versao = regras.versao
+        with self._cond:
+            if self._fechado:
+                return
+            if versao != self._versao:
+                self._cache = {}
+                self._versao = versao
+            faltam = [a for a in assinaturas if (versao, a) not in self._cache]
+            if not faltam:
+                return
+            self._pedido = (versao, regras.copy(), faltam)
+            self._cond.notify()
+
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._rodar, name="previa-impacto", daemon=True)
+            self._thread.start()
+
+    def consultar(self, versao, cartucho):
+        return self._cache.get((versao, _assinatura(cartucho)))
+
+    def fechar(self):
+        with self._cond:
+            self._fechado = True
+            self._pedido = None
+            self._cond.notify()
+
+    def _rodar(self):
+        while True:
+            with self._cond:
+                while self._pedido is None and not self._fechado:
+                    self._cond.wait()
+                if self._fechado:
+                    return
+                versao, regras, faltam = self._pedido
+                self._pedido = None
+
+            for assinatura in faltam:
+                resultado = impacto(regras, _ficha(assinatura))
+                with self._cond:
+                    if self._fechado:
+                        return
+                    if self._versao != versao:
+                        break  # campo mudou: o pedido novo já está na fila
+                    self._cache[(versao, assinatura)] = resultado
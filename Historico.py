@@ -0,0 +1,113 @@
+# Historico.py
+
+# ============================================================
+# DESFAZER / REFAZER (retratos com compartilhamento estrutural)
+# Um Retrato é o estado da tela do estrategista: campo (por linha),
+# banco, loja, ouro e gasto. O campo é uma tupla de linhas e cada linha um
+# dict {c: (cartucho, estrelas)} que nunca muda depois de criado; um passo
+# novo só recria as linhas que mudaram e reaproveita as outras. Os Cartuchos
+# não são copiados: o retrato guarda a referência + as estrelas daquele momento.
+# O índice de sinergias não entra no retrato: a Grid refaz só as células que
+# diferem (place/remove_at nas GridRules são O(grau)).
+# ============================================================
+LIMITE_HISTORICO = 64
+_VAZIA = {}
+
+
+class Retrato:
+    __slots__ = ("linhas", "banco", "loja", "ouro", "gasto")
+
+    def __init__(self, linhas, banco=(), loja=(), ouro=0, gasto=0):
+        self.linhas = tuple(linhas)
+        self.banco = tuple(banco)
+        self.loja = tuple(loja)
+        self.ouro = int(ouro)
+        self.gasto = int(gasto)
+
+    @classmethod
+    def do_campo(cls, occ, rows, **resto):
+        """Retrato inicial a partir de um {(c,r): Cartucho} (O(ocupadas), só 1x)."""
+        linhas = [dict() for _ in range(rows)]
+        for (c, r), cartucho in occ.items():
+            linhas[r][c] = (cartucho, int(getattr(cartucho, "estrelas", 0) or 0))
+        return cls([linha or _VAZIA for linha in linhas], **resto)
+
+    def com_mudancas(self, mudancas, **resto):
+        """
+        Novo retrato: `mudancas` = {(c,r): (cartucho, estrelas) ou None}.
+        Só as linhas tocadas são recriadas; banco/loja/ouro/gasto vêm em `resto`.
+        """
+        linhas = list(self.linhas)
+        por_linha = {}
+        for (c, r), entrada in mudancas.items():
+            por_linha.setdefault(r, {})[c] = entrada
+        for r, cells in por_linha.items():
+            linha = dict(linhas[r])
+            for c, entrada in cells.items():
+                if entrada is None:
+                    linha.pop(c, None)
+                else:
+                    linha[c] = entrada
+            linhas[r] = linha or _VAZIA
+        return Retrato(linhas, **resto)
+
+    def celula(self, c, r):
+        return self.linhas[r].get(c)
+
+    def diferencas(self, outro):
+        """(c, r) -> entrada em `outro`, só das células que diferem (linhas iguais por identidade são puladas)."""
+        difs = {}
+        for r, (a, b) in enumerate(zip(self.linhas, outro.linhas)):
+            if a is b:
+                continue
+            for c in a.keys() | b.keys():
+                ea, eb = a.get(c), b.get(c)
+                if ea is None or eb is None or ea[0] is not eb[0] or ea[1] != eb[1]:
+                    difs[(c, r)] = eb
+        return difs
+
+
+class Historico:
+    """Pilhas de retratos; `atual` é sempre o estado registrado mais recente."""
+
+    def __init__(self, atual, limite=LIMITE_HISTORICO):
+        self.atual = atual
+        self.limite = max(1, int(limite))
+        self.passado = []
+        self.futuro = []
+
+    def registrar(self, novo):
+        self.passado.append(self.atual)
+        if len(self.passado) > self.limite:
+            del self.passado[0]
+        self.atual = novo
+        self.futuro.clear()
+
+    def pode_desfazer(self):
+        return bool(self.passado)
+
+    def pode_refazer(self):
+        return bool(self.futuro)
+
+    def desfazer(self):
+        """Volta um passo; devolve (retrato_de, retrato_para) ou None."""
+        if not self.passado:
+            return None
+        de = self.atual
+        self.futuro.append(de)
+        self.atual = self.passado.pop()
+        return de, self.atual
+
+    def refazer(self):
+        if not self.futuro:
+            return None
+        de = self.atual
+        self.passado.append(de)
+        self.atual = self.futuro.pop()
+        return de, self.atual
+
+    def limpar(self, atual):
+        """Ponto sem volta (venda, reroll): começa de novo a partir de `atual`."""
+        self.atual = atual
+        self.passado.clear()
+        self.futuro.clear()
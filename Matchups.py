@@ -0,0 +1,165 @@
+# Matchups.py
+import argparse
+import hashlib
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from Brawl_Stars.Brawl import CSV_PATH, carregar_cartuchos_de_csv
+from CombatMath import CombatProfile
+from CombatSim import _ataque, _sequencia_round, simular_lote
+from Player import MAPA_STATS_CSV, PERCENT_LABELS, multiplicador_estrelas
+
+# ============================================================
+# MATRIZ DE MATCHUPS (todos x todos, 0..3 estrelas)
+# Cada brawler vira um CombatProfile como se estivesse sozinho em campo e
+# escalado (status em dobro, igual sync_from_grid). Cada par é simulado com
+# CombatSim até sair vencedor. O trabalho é dividido por linha (brawler atacante)
+# num ProcessPoolExecutor, e o resultado fica num .npz ao lado do CSV,
+# com o sha256 do CSV no nome: catálogo igual = nada recalculado.
+# ============================================================
+ESTRELAS = (0, 1, 2, 3)
+TENTATIVAS_PADRAO = 200
+SEED_PADRAO = 1234
+MAX_RONDAS = 200
+
+_PERCENTUAIS = {k: 0 for k, _ in PERCENT_LABELS}
+_PERCENTUAIS["assertividade"] = 100
+
+
+def hash_csv(caminho_csv):
+    h = hashlib.sha256()
+    with open(caminho_csv, "rb") as f:
+        for bloco in iter(lambda: f.read(1 << 16), b""):
+            h.update(bloco)
+    return h.hexdigest()
+
+
+def caminho_cache(caminho_csv, sha, tentativas, seed):
+    base = os.path.dirname(os.path.abspath(caminho_csv))
+    return os.path.join(base, f"matchups_{sha[:16]}_n{tentativas}_s{seed}.npz")
+
+
+def perfil_brawler(dados: dict, estrelas: int) -> CombatProfile:
+    """CombatProfile de um brawler sozinho em campo e escalado (conta 2x)."""
+    mult = multiplicador_estrelas(estrelas)
+    st = dados.get("stats", {}) or {}
+
+    def stat(k):
+        return 2 * int(round(int(st.get(k, 0) or 0) * mult))
+
+    totais = {attr: stat(k) for k, attr in MAPA_STATS_CSV.items()}
+    vida = stat("vida")
+    return CombatProfile(totais, _PERCENTUAIS, vida=vida, vida_max=vida)
+
+
+def _sem_fim(pa, pb):
+    """
+    True se ninguém pode morrer: o dano máximo de um round (tudo crítico) de cada
+    lado não passa da regen do outro. A vida nunca cai de um round pro outro,
+    então simular até MAX_RONDAS seria só tempo jogado fora.
+    """
+    _segundo, seq = _sequencia_round(pa, pb)
+    perfis = (pa, pb)
+    maximo = [0, 0]
+    for i, kind, _ in seq:
+        maximo[i] += _ataque(perfis[i], perfis[1 - i], kind)["dano_crit"]
+    return (
+        maximo[0] <= pb.regen and maximo[0] < pb.vida
+        and maximo[1] <= pa.regen and maximo[1] < pa.vida
+    )
+
+
+def _linha(args):
+    """Uma linha da matriz: brawler i (todas as estrelas) contra todo o catálogo."""
+    i, perfis, tentativas, seed = args
+    n_b, n_e = len(perfis), len(ESTRELAS)
+    vitoria = np.zeros((n_e, n_b, n_e), dtype=np.float32)
+    rondas = np.zeros((n_e, n_b, n_e), dtype=np.float32)
+    for ei in range(n_e):
+        pa = perfis[i][ei]
+        for j in range(n_b):
+            for ej in range(n_e):
+                if _sem_fim(pa, perfis[j][ej]):
+                    rondas[ei, j, ej] = np.inf
+                    continue
+                res = simular_lote(
+                    pa,
+                    perfis[j][ej],
+                    tentativas,
+                    ate_vencedor=True,
+                    max_rondas=MAX_RONDAS,
+                    seed=(seed, i, ei, j, ej),
+                )
+                vitoria[ei, j, ej] = res["resumo"]["vitoria_a"]
+                rondas[ei, j, ej] = res["resumo"]["rondas"]["media"]
+    return i, vitoria, rondas
+
+
+def calcular_matriz(cartuchos, *, tentativas=TENTATIVAS_PADRAO, seed=SEED_PADRAO, workers=None):
+    """
+    vitoria[i, ei, j, ej] = chance de i (ei estrelas, atacante) vencer j (ej estrelas).
+    rondas[...] = média de rounds até o fim (inf = luta sem fim).
+    """
+    perfis = [[perfil_brawler(c, e) for e in ESTRELAS] for c in cartuchos]
+    n_b, n_e = len(perfis), len(ESTRELAS)
+    vitoria = np.zeros((n_b, n_e, n_b, n_e), dtype=np.float32)
+    rondas = np.zeros((n_b, n_e, n_b, n_e), dtype=np.float32)
+
+    tarefas = [(i, perfis, tentativas, seed) for i in range(n_b)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for i, v, r in pool.map(_linha, tarefas):
+            vitoria[i] = v
+            rondas[i] = r
+    return vitoria, rondas
+
+
+def carregar_ou_calcular(caminho_csv=CSV_PATH, *, tentativas=TENTATIVAS_PADRAO, seed=SEED_PADRAO, workers=None, forcar=False):
+    """Lê a matriz do cache se o CSV não mudou; senão calcula e salva."""
+    sha = hash_csv(caminho_csv)
+    cache = caminho_cache(caminho_csv, sha, tentativas, seed)
+    if not forcar and os.path.exists(cache):
+        with np.load(cache) as dados:
+            if str(dados["sha256"]) == sha:
+                return {k: dados[k] for k in dados.files}
+
+    cartuchos = carregar_cartuchos_de_csv(caminho_csv)
+    vitoria, rondas = calcular_matriz(cartuchos, tentativas=tentativas, seed=seed, workers=workers)
+    resultado = {
+        "sha256": np.array(sha),
+        "nomes": np.array([c["nome"] for c in cartuchos]),
+        "estrelas": np.array(ESTRELAS, dtype=np.int8),
+        "vitoria": vitoria,
+        "rondas": rondas,
+    }
+    np.savez_compressed(cache, **resultado)
+    return resultado
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Matriz de matchups de todos os brawlers (0..3 estrelas).")
+    ap.add_argument("--csv", default=CSV_PATH)
+    ap.add_argument("--tentativas", type=int, default=TENTATIVAS_PADRAO)
+    ap.add_argument("--seed", type=int, default=SEED_PADRAO)
+    ap.add_argument("--workers", type=int, default=None)
+    ap.add_argument("--forcar", action="store_true", help="ignora o cache e recalcula")
+    args = ap.parse_args(argv)
+
+    t0 = time.perf_counter()
+    res = carregar_ou_calcular(args.csv, tentativas=args.tentativas, seed=args.seed, workers=args.workers, forcar=args.forcar)
+    dt = time.perf_counter() - t0
+
+    # média de vitória de cada brawler (3 estrelas) contra o catálogo todo (3 estrelas)
+    media = res["vitoria"][:, -1, :, -1].mean(axis=1)
+    ordem = np.argsort(-media)
+    print(f"{len(res['nomes'])} brawlers em {dt:.1f}s ({np.isinf(res['rondas']).mean() * 100:.1f}% sem fim)")
+    for i in ordem:
+        print(f"{res['nomes'][i]:<20} {media[i] * 100:5.1f}%")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,6 +2,8 @@ import pygame
 import os
 import math
 from Brawl_Stars.Brawl import gerar_imagem_cartucho_grid
+from DiceStats import distribuicao_por_attr, distribuicao_soma
+from GridRules import GridRules
 
 ATRIBUTOS = [
     "dano_fisico",
@@ -54,6 +56,23 @@ PERCENT_LABELS = [
     ("dano_crit", "Dano crit"),
 ]
 
+# stat do CSV -> atributo de combate (sync_from_grid, Matchups, TeamCombat)
+MAPA_STATS_CSV = {
+    "dano_fisico": "dano_fisico",
+    "dano_especial": "dano_magico",
+    "defesa_fisica": "defesa_fisica",
+    "defesa_especial": "defesa_magica",
+    "regeneracao": "regeneracao",
+    "mana": "mana",
+    "velocidade": "velocidade",
+    "perfuracao": "penetracao",
+}
+
+
+def multiplicador_estrelas(estrelas) -> float:
+    """Escala dos stats de um brawler: 1x sem estrela, +0.5x por estrela."""
+    return 1.0 + 0.5 * max(0, int(estrelas or 0))
+
 
 def _lerp(a, b, t):
     return a + (b - a) * t
@@ -245,6 +264,10 @@ class PlayerBatalha:
             out.append({"attr": d["attr"], "pot": d.get("pot", "std"), "faces": list(d.get("faces", [1]))})
         return out
 
+    def estatisticas_mao(self):
+        """{attr: distribuição exata da soma (DiceStats)} dos dados ativos, sem lançar nada."""
+        return distribuicao_por_attr(self.get_dados_ativos_para_lancar())
+
     # ----------------------------
     # posição ficha
     # ----------------------------
@@ -627,10 +650,6 @@ class PlayerEstrategista:
         except (ValueError, TypeError):
             return 0
 
-    def _star_mult(self, cartucho) -> float:
-        estrelas = max(0, int(getattr(cartucho, "estrelas", 0) or 0))
-        return 1.0 + 0.5 * estrelas
-
     def _set_total_animado(self, attr: str, novo_val: int, agora_ms: int):
         novo_val = int(novo_val)
         atual_vis = float(self.display_val.get(attr, 0.0))
@@ -677,37 +696,32 @@ class PlayerEstrategista:
 
     def _calcula_sinergias_ativas_conectadas(self):
         """
-        Sinergia "ativa" = só se existe conexão adjacente real (igual sua regra do contorno).
-        Aqui eu calculo a partir de adjacências na occ, contando brawlers envolvidos.
+        Sinergia "ativa" = só se existe conexão adjacente real (igual a regra do contorno).
+        Vem das GridRules da grid (índice incremental); sem elas, monta a partir da occ.
         """
         if not self.grid:
             return {}
 
+        regras = getattr(self.grid, "regras", None)
+        if isinstance(regras, GridRules):
+            return regras.contagem_ativas()
+
         occ = getattr(self.grid, "occ", {}) or {}
         if not isinstance(occ, dict) or not occ:
             return {}
-
-        active_pos = {}  # sym -> set[(c,r)]
-        for (c, r), a in occ.items():
-            sa = set(self._get_sinergias_cartucho(a))
-            # só direita/baixo pra evitar dupla contagem
-            for dc, dr in ((1, 0), (0, 1)):
-                b = occ.get((c + dc, r + dr))
-                if not b:
-                    continue
-                sb = set(self._get_sinergias_cartucho(b))
-                shared = sa & sb
-                for sym in shared:
-                    st = active_pos.setdefault(sym, set())
-                    st.add((c, r))
-                    st.add((c + dc, r + dr))
-
-        # transforma em contagem de brawlers envolvidos
-        return {sym: len(pos_set) for sym, pos_set in active_pos.items()}
+        return GridRules.de_ocupacao(occ).contagem_ativas()
 
     # ----------------------------
     # sync: recalcula tudo do campo
     # ----------------------------
+    def estatisticas_dados(self):
+        """{attr: distribuição exata da soma (DiceStats)} dos dados selecionados na ficha."""
+        return {
+            attr: distribuicao_soma([d.get("faces") for d in dados])
+            for attr, dados in self.dados_selecionados.items()
+            if dados
+        }
+
     def sync_from_grid(self, agora_ms: int):
         cartuchos = self.get_cartuchos_em_campo()
 
@@ -729,16 +743,10 @@ class PlayerEstrategista:
 
         def acumula_cartucho(c):
             nonlocal vida_total
-            mult = self._star_mult(c)
+            mult = multiplicador_estrelas(getattr(c, "estrelas", 0))
             vida_total += int(round(self._get_stat(c, "vida") * mult))
-            soma["dano_fisico"]   += int(round(self._get_stat(c, "dano_fisico") * mult))
-            soma["dano_magico"]   += int(round(self._get_stat(c, "dano_especial") * mult))
-            soma["defesa_fisica"] += int(round(self._get_stat(c, "defesa_fisica") * mult))
-            soma["defesa_magica"] += int(round(self._get_stat(c, "defesa_especial") * mult))
-            soma["regeneracao"]   += int(round(self._get_stat(c, "regeneracao") * mult))
-            soma["mana"]          += int(round(self._get_stat(c, "mana") * mult))
-            soma["velocidade"]    += int(round(self._get_stat(c, "velocidade") * mult))
-            soma["penetracao"]    += int(round(self._get_stat(c, "perfuracao") * mult))
+            for chave_csv, attr in MAPA_STATS_CSV.items():
+                soma[attr] += int(round(self._get_stat(c, chave_csv) * mult))
 
         for c in cartuchos:
             acumula_cartucho(c)
@@ -927,6 +935,10 @@ class PlayerEstrategista:
 
             dados_qtd = len(self.dados_selecionados.get(attr, []))
             if dados_qtd > 0:
+                media = distribuicao_soma([d.get("faces") for d in self.dados_selecionados[attr]])["media"]
+                tmedia = self._font_tiny.render(f"~{media:.1f}", True, (200, 200, 215))
+                tela.blit(tmedia, tmedia.get_rect(topright=(bx + cell_w - 10, by + 10)))
+
                 icon_size = 22
                 max_icons = max(1, (cell_w - 20) // (icon_size + 4))
                 x0 = bx + 10
@@ -2,7 +2,14 @@ import pygame
 import os
 import random
 import math
+import threading
+from bisect import bisect
 from collections import deque
+from itertools import accumulate
+
+import numpy as np
+
+from DiceStats import tabela_pouso
 
 # ============================================================
 # CONFIG
@@ -30,6 +37,157 @@ DICE_TYPES = {
 _BORDA_INIMIGO = (235, 70, 70)   # vermelho
 _BORDA_ALIADO  = (20, 20, 20)    # padrão (preto)
 
+MODOS_LANCAMENTO = ("normal", "forte")  # ordem do último eixo de tabela_pouso
+
+# mapa de pouso no hover: cor e alpha da célula com chance 0..1
+POUSO_COR = (255, 230, 120)
+POUSO_ALPHA = (30, 150)
+
+# atlas dos dados voando (ver _blit_dado_girado); compartilhado entre tabuleiros
+ROT_PASSO_GRAUS = 5
+ESCALA_PASSO = 0.01
+_ATLAS = {}
+
+
+# ============================================================
+# ESTADO EM ARRAYS
+# O tabuleiro é um int16 (CANAIS, BOARD_SIZE, BOARD_SIZE): código do attr
+# (-1 = vazia), valor, lado e pot. Soma = um bincount; empurrão = shift de
+# uma fatia da linha/coluna. `grid[r][c]` continua existindo (vista que monta
+# e desmonta os dicts), pra quem ainda fala em células.
+# ============================================================
+ATTRS = tuple(DICE_TYPES)
+LADOS = ("aliado", "inimigo")
+_ATTR_COD = {a: i for i, a in enumerate(ATTRS)}
+CH_ATTR, CH_VALOR, CH_LADO, CH_POT = range(4)
+CANAIS = 4
+VAZIA = -1
+
+_POTS = []       # pot é texto livre ("std", "rnd", ...): código = índice aqui
+_POT_COD = {}
+
+
+def _cod_pot(pot):
+    pot = str(pot)
+    cod = _POT_COD.get(pot)
+    if cod is None:
+        cod = _POT_COD[pot] = len(_POTS)
+        _POTS.append(pot)
+    return cod
+
+
+def tabuleiro_vazio(n=None):
+    """Arrays de um tabuleiro vazio; `n` = quantos de uma vez (simulação em lote)."""
+    forma = (CANAIS, BOARD_SIZE, BOARD_SIZE) if n is None else (int(n), CANAIS, BOARD_SIZE, BOARD_SIZE)
+    dados = np.zeros(forma, dtype=np.int16)
+    dados[..., CH_ATTR, :, :] = VAZIA
+    return dados
+
+
+def somas_em_array(dados):
+    """
+    Soma dos valores por (lado, attr) com um bincount só.
+    `dados`: (CANAIS, B, B) -> (2, len(ATTRS)); (N, CANAIS, B, B) -> (N, 2, len(ATTRS)).
+    """
+    lote = dados.reshape(-1, CANAIS, BOARD_SIZE * BOARD_SIZE)
+    n, na = lote.shape[0], len(ATTRS)
+    attr, lado = lote[:, CH_ATTR].astype(np.intp), lote[:, CH_LADO]
+    # vazia cai num balde extra por tabuleiro (descartado); sem máscara/nonzero
+    balde = (lado * na + attr) % (2 * na + 1)
+    balde += (np.arange(n) * (2 * na + 1))[:, None]
+    somas = np.bincount(balde.ravel(), weights=lote[:, CH_VALOR].ravel(), minlength=n * (2 * na + 1))
+    somas = somas.astype(np.int64).reshape(n, 2 * na + 1)[:, : 2 * na].reshape(n, 2, na)
+    return somas[0] if dados.ndim == 3 else somas
+
+
+def _celula_de(dados, c, r):
+    attr = int(dados[CH_ATTR, r, c])
+    if attr == VAZIA:
+        return None
+    return {
+        "attr": ATTRS[attr],
+        "pot": _POTS[dados[CH_POT, r, c]],
+        "valor": int(dados[CH_VALOR, r, c]),
+        "lado": LADOS[int(dados[CH_LADO, r, c])],
+    }
+
+
+def _por_celula(dados, c, r, cell):
+    if cell is None:
+        dados[:, r, c] = 0
+        dados[CH_ATTR, r, c] = VAZIA
+        return
+    attr = cell.get("attr")
+    if attr not in _ATTR_COD:
+        raise ValueError(f"attr inválido: {attr}")
+    lado = 1 if cell.get("lado") == "inimigo" else 0
+    dados[:, r, c] = (_ATTR_COD[attr], int(cell.get("valor", 0)), lado, _cod_pot(cell.get("pot", "normal")))
+
+
+class _LinhaGrade:
+    __slots__ = ("_tab", "_r")
+
+    def __init__(self, tab, r):
+        self._tab, self._r = tab, r
+
+    def __len__(self):
+        return BOARD_SIZE
+
+    def __getitem__(self, c):
+        return _celula_de(self._tab.dados, c, self._r)
+
+    def __setitem__(self, c, cell):
+        self._tab._por(c, self._r, cell)
+
+    def __iter__(self):
+        return (self[c] for c in range(BOARD_SIZE))
+
+
+class _GradeDados:
+    """Vista grid[r][c] -> dict/None sobre os arrays (leitura monta dict novo, escrita codifica)."""
+    __slots__ = ("_tab",)
+
+    def __init__(self, tab):
+        self._tab = tab
+
+    def __len__(self):
+        return BOARD_SIZE
+
+    def __getitem__(self, r):
+        return _LinhaGrade(self._tab, r)
+
+    def __iter__(self):
+        return (self[r] for r in range(BOARD_SIZE))
+
+
+_ANEIS = {}
+
+
+def _anel(dist):
+    """Offsets (dx, dy) a distância Chebyshev `dist`, sempre na mesma ordem (cacheado)."""
+    anel = _ANEIS.get(dist)
+    if anel is None:
+        anel = _ANEIS[dist] = [
+            (dx, dy)
+            for dx in range(-dist, dist + 1)
+            for dy in range(-dist, dist + 1)
+            if max(abs(dx), abs(dy)) == dist
+        ]
+    return anel
+
+
+_ACUMULADOS = {}
+
+
+def _acumulados(pesos):
+    """(pesos acumulados, total) por distância; o sorteio é o mesmo de random.choices sem refazer a soma."""
+    chave = tuple(pesos)
+    acum = _ACUMULADOS.get(chave)
+    if acum is None:
+        cum = list(accumulate(chave))
+        acum = _ACUMULADOS[chave] = (cum, cum[-1] + 0.0)
+    return acum
+
 
 class Tabuleiro:
     # ---------- lançamento ----------
@@ -44,12 +202,21 @@ class Tabuleiro:
     # ---------- push ----------
     PUSH_MS = 140
 
-    def __init__(self, tela: pygame.Surface):
-        self.tela = tela
+    def __init__(self, tela: pygame.Surface | None, rng=None):
+        self.tela = tela  # None = sem tela (simulação headless, nunca desenha)
         self.operacional = True
 
-        # grid: None ou {"attr","pot","valor","lado"}  lado: "aliado" | "inimigo"
-        self.grid = [[None for _ in range(BOARD_SIZE)] for _ in range(BOARD_SIZE)]
+        # fonte de aleatoriedade (random.Random seedado pra simulação; padrão = random global)
+        self.rng = rng if rng is not None else random
+
+        # dados fixos: arrays (ver ESTADO EM ARRAYS); self.grid[r][c] = None ou
+        # {"attr","pot","valor","lado"}  lado: "aliado" | "inimigo"
+        self.dados = tabuleiro_vazio()
+
+        # somas por lado mantidas a cada dado que entra/sai (empurrão dentro do
+        # tabuleiro não muda soma); versao_somas sobe a cada mudança
+        self._somas = {lado: dict.fromkeys(ATTRS, 0) for lado in LADOS}
+        self.versao_somas = 0
 
         # mãos separadas
         self.mao_aliada = []   # [{"attr","pot","faces"}, ...]
@@ -63,21 +230,42 @@ class Tabuleiro:
         self.push = []  # dados empurrados (slide)
 
         # listas coletáveis (você pediu “um self para dados inimigos e aliados”)
-        # -> aqui são listas dos DADOS FIXADOS no tabuleiro, no formato da célula (dict)
-        self.dados_aliados = []
-        self.dados_inimigos = []
+        # -> aqui são listas dos DADOS FIXADOS no tabuleiro, no formato da célula (dict);
+        # montadas dos arrays só quando alguém lê (ver dados_aliados/dados_inimigos)
+        self._listas_dados = None
 
         self._dado_cache = {}  # cache da face/cor
         self.hover = None
+        self.hover_modo = "normal"  # Shift segurado = mapa do lançamento forte
+
+        # mapa de pouso desenhado (só o último: muda quando o hover/mão/modo muda)
+        self._pouso_chave = None
+        self._pouso_camada = None
+        # tabelas de pouso montadas fora do frame (ver aquecer_pouso)
+        self._pouso_pedidos = set()
+        self._pouso_prontos = set()
+
+        # desenho: xadrez fixo + camada dos dados assentados, refeita só quando
+        # _versao_grade muda (dado caiu, empurrão, limpeza)
+        self._versao_grade = 0
+        self._fundo = None
+        self._camada = None
+        self._camada_versao = None
 
     # ============================================================
     # API pública
     # ============================================================
+    @property
+    def grid(self):
+        return _GradeDados(self)
+
     def limpar_tabuleiro(self):
-        self.grid = [[None for _ in range(BOARD_SIZE)] for _ in range(BOARD_SIZE)]
+        self.dados = tabuleiro_vazio()
+        self._somas = {lado: dict.fromkeys(ATTRS, 0) for lado in LADOS}
+        self.versao_somas += 1
         self.fly.clear()
         self.push.clear()
-        self._rebuild_listas_dados()
+        self._mudou_grade()
 
     def set_lado_ativo(self, lado: str):
         if lado in ("aliado", "inimigo"):
@@ -123,7 +311,7 @@ class Tabuleiro:
 
         attrs = list(DICE_TYPES.keys())
         for _ in range(3):
-            attr = random.choice(attrs)
+            attr = self.rng.choice(attrs)
             # faces simples (você pode mudar depois)
             faces = [1, 2, 3, 4, 5, 6]
             pot = "rnd"
@@ -135,10 +323,43 @@ class Tabuleiro:
         if lado not in ("aliado", "inimigo"):
             return
         self.lado_ativo = lado
-        base_cell = (random.randint(0, BOARD_SIZE - 1), random.randint(0, BOARD_SIZE - 1))
+        base_cell = (self.rng.randint(0, BOARD_SIZE - 1), self.rng.randint(0, BOARD_SIZE - 1))
         base_pos = self._grid_center(base_cell[0], base_cell[1])
         self._lancar_mao(base_pos, base_cell, agora_ms, modo="normal")
 
+    def lancar_direto(self, lado: str, modo="normal"):
+        """
+        Igual lancar_automatico, mas sem animação: os dados já caem e empurram na hora
+        (mesmas regras de alvo/push). Pra simulação headless.
+        """
+        if lado not in ("aliado", "inimigo"):
+            return
+        self.lado_ativo = lado
+        mao = self.mao_inimiga if lado == "inimigo" else self.mao_aliada
+        base_cell = (self.rng.randint(0, BOARD_SIZE - 1), self.rng.randint(0, BOARD_SIZE - 1))
+        if not mao:
+            return
+
+        maxd, pesos, _anim = self._params_modo(modo)
+        alvos, dc, dr = self._escolher_alvos(base_cell, len(mao), maxd, pesos, modo)
+        for dado, (tc, tr) in zip(mao, alvos):
+            cell = {"attr": dado["attr"], "pot": dado["pot"], "valor": self.rng.choice(dado["faces"]), "lado": lado}
+            if self._ocupada(tc, tr):
+                self._push_chain_animated(tc, tr, dc, dr, 0, animar=False)
+            self._por(tc, tr, cell)
+        mao.clear()
+        self.push.clear()
+
+    def assentar(self, agora_ms: int = 0):
+        """Termina na hora tudo que está voando/deslizando (dados vão pro destino final)."""
+        for s in self.fly:
+            c, r = s["target_cell"]
+            d = s["dado"]
+            cell = {"attr": d["attr"], "pot": d["pot"], "valor": s["face_final"], "lado": s["lado"]}
+            self._colocar_com_empurrao_animado(c, r, cell, s["push_dc"], s["push_dr"], agora_ms)
+        self.fly = []
+        self.push = []
+
     # ============================================================
     # update: processa eventos + atualiza animações + desenha
     # (com teclas extras de teste dentro da classe)
@@ -187,6 +408,7 @@ class Tabuleiro:
         # -------- hover (só se operacional) --------
         if self.operacional:
             self.hover = self._pixel_to_grid(pygame.mouse.get_pos())
+            self.hover_modo = "forte" if pygame.key.get_mods() & pygame.KMOD_SHIFT else "normal"
         else:
             self.hover = None
 
@@ -229,17 +451,37 @@ class Tabuleiro:
     def _in_bounds(self, c, r):
         return 0 <= c < BOARD_SIZE and 0 <= r < BOARD_SIZE
 
+    def _ocupada(self, c, r):
+        return self.dados[CH_ATTR, r, c] != VAZIA
+
+    def _ajusta_somas(self, c, r, sinal):
+        attr = self.dados[CH_ATTR, r, c]
+        if attr == VAZIA:
+            return
+        self._somas[LADOS[self.dados[CH_LADO, r, c]]][ATTRS[attr]] += sinal * int(self.dados[CH_VALOR, r, c])
+        self.versao_somas += 1
+
+    def _por(self, c, r, cell):
+        """Escreve uma célula (dict ou None) mantendo as somas em O(1)."""
+        self._ajusta_somas(c, r, -1)
+        _por_celula(self.dados, c, r, cell)
+        if cell is not None:
+            # soma direto do dict (já validado em _por_celula), sem reler o array
+            lado = "inimigo" if cell.get("lado") == "inimigo" else "aliado"
+            self._somas[lado][cell["attr"]] += int(cell.get("valor", 0))
+            self.versao_somas += 1
+        self._mudou_grade()
+
+    def _mudou_grade(self):
+        self._listas_dados = None
+        self._versao_grade += 1
+
     def _escolher_offset_por_dist(self, max_dist, pesos_por_dist):
-        dist = random.choices(range(max_dist + 1), weights=pesos_por_dist, k=1)[0]
+        cum, total = _acumulados(pesos_por_dist)
+        dist = bisect(cum, self.rng.random() * total, 0, max_dist)
         if dist == 0:
             return 0, 0
-
-        candidatos = []
-        for dx in range(-dist, dist + 1):
-            for dy in range(-dist, dist + 1):
-                if max(abs(dx), abs(dy)) == dist:
-                    candidatos.append((dx, dy))
-        return random.choice(candidatos)
+        return self.rng.choice(_anel(dist))
 
     def _dir_from_center(self, cell):
         c, r = cell
@@ -252,29 +494,37 @@ class Tabuleiro:
         else:
             return (0, 1) if vy >= 0 else (0, -1)
 
-    def _rebuild_listas_dados(self):
-        self.dados_aliados = []
-        self.dados_inimigos = []
-        for r in range(BOARD_SIZE):
-            for c in range(BOARD_SIZE):
-                cell = self.grid[r][c]
-                if cell is None:
-                    continue
-                if cell.get("lado") == "inimigo":
-                    self.dados_inimigos.append(cell)
-                else:
-                    self.dados_aliados.append(cell)
+    def _montar_listas_dados(self):
+        aliados, inimigos = [], []
+        ocup = self.dados[CH_ATTR] != VAZIA
+        attrs, valores, lados, pots = (self.dados[ch][ocup].tolist() for ch in range(CANAIS))
+        for attr, valor, lado, pot in zip(attrs, valores, lados, pots):
+            cell = {"attr": ATTRS[attr], "pot": _POTS[pot], "valor": valor, "lado": LADOS[lado]}
+            (inimigos if lado else aliados).append(cell)
+        self._listas_dados = (aliados, inimigos)
+
+    @property
+    def dados_aliados(self):
+        if self._listas_dados is None:
+            self._montar_listas_dados()
+        return self._listas_dados[0]
+
+    @property
+    def dados_inimigos(self):
+        if self._listas_dados is None:
+            self._montar_listas_dados()
+        return self._listas_dados[1]
 
     # ============================================================
     # Surface dado (todo colorido) + borda por lado
     # ============================================================
-    def _criar_surface_dado(self, face, tam, cor_fill, lado):
-        # cache precisa considerar lado (borda muda)
-        key = (int(face), int(tam), tuple(cor_fill), lado)
-        if key in self._dado_cache:
-            return self._dado_cache[key]
+    def _fonte_dado(self, tam):
+        fonte = self._dado_cache.get(("fonte", tam))
+        if fonte is None:
+            fonte = self._dado_cache[("fonte", tam)] = pygame.font.Font(os.path.join("Fontes", "FontePadrão.ttf"), int(tam * 0.75))
+        return fonte
 
-        surf = pygame.Surface((tam, tam), pygame.SRCALPHA)
+    def _desenha_corpo(self, surf, tam, cor_fill, lado):
         r = pygame.Rect(0, 0, tam, tam)
 
         # corpo
@@ -284,8 +534,8 @@ class Tabuleiro:
         borda = _BORDA_INIMIGO if lado == "inimigo" else _BORDA_ALIADO
         pygame.draw.rect(surf, borda, r, 4, border_radius=12)
 
-        # número
-        font = pygame.font.Font(os.path.join("Fontes", "FontePadrão.ttf"), int(tam * 0.75))
+    def _desenha_numero(self, surf, face, tam):
+        font = self._fonte_dado(tam)
         txt_shadow = font.render(str(face), True, (0, 0, 0))
         txt = font.render(str(face), True, (255, 255, 255))
 
@@ -297,9 +547,81 @@ class Tabuleiro:
         surf.blit(txt_shadow, rect_s)
         surf.blit(txt, rect)
 
+    def _criar_surface_dado(self, face, tam, cor_fill, lado):
+        # cache precisa considerar lado (borda muda)
+        key = (int(face), int(tam), tuple(cor_fill), lado)
+        if key in self._dado_cache:
+            return self._dado_cache[key]
+
+        surf = pygame.Surface((tam, tam), pygame.SRCALPHA)
+        self._desenha_corpo(surf, tam, cor_fill, lado)
+        self._desenha_numero(surf, face, tam)
+
         self._dado_cache[key] = surf
         return surf
 
+    # ============================================================
+    # Atlas dos dados voando
+    # O giro é em passos de ROT_PASSO_GRAUS e fica em duas peças: corpo por
+    # (cor, lado) e número por face, cada uma girada só 1x por passo/escala.
+    # Assim a 1ª volta de um lançamento preenche o atlas e o resto é só blit
+    # (face sorteada a cada troca não multiplica as rotações por 6).
+    # O rastro usa o dado parado com o alpha já multiplicado nos pixels.
+    # ============================================================
+    def _peca_girada(self, chave, montar, passo, esc):
+        img = _ATLAS.get(chave)
+        if img is None:
+            img = _ATLAS[chave] = pygame.transform.rotozoom(montar(), passo * ROT_PASSO_GRAUS, esc * ESCALA_PASSO)
+            img.set_alpha(255, pygame.RLEACCEL)  # sprite fixo: blit RLE (mesmo resultado, mais rápido)
+        return img
+
+    def _pecas_giradas(self, face, cor_fill, lado, passo, esc):
+        def corpo():
+            surf = pygame.Surface((DADO_TAM, DADO_TAM), pygame.SRCALPHA)
+            self._desenha_corpo(surf, DADO_TAM, cor_fill, lado)
+            return surf
+
+        def numero():
+            surf = pygame.Surface((DADO_TAM, DADO_TAM), pygame.SRCALPHA)
+            self._desenha_numero(surf, face, DADO_TAM)
+            return surf
+
+        return (
+            self._peca_girada(("corpo", tuple(cor_fill), lado, passo, esc), corpo, passo, esc),
+            self._peca_girada(("numero", int(face), passo, esc), numero, passo, esc),
+        )
+
+    def _blit_dado_girado(self, tela, face, cor_fill, lado, angulo, escala, centro):
+        passo = int(round(angulo / ROT_PASSO_GRAUS)) % (360 // ROT_PASSO_GRAUS)
+        esc = int(round(escala / ESCALA_PASSO))
+        if passo == 0 and esc * ESCALA_PASSO == 1.0:
+            img = self._criar_surface_dado(face, DADO_TAM, cor_fill, lado)
+            tela.blit(img, img.get_rect(center=centro))
+            return
+        for img in self._pecas_giradas(face, cor_fill, lado, passo, esc):
+            tela.blit(img, img.get_rect(center=centro))
+
+    def _fantasma_dado(self, face, cor_fill, lado, alpha):
+        chave = ("rastro", int(face), tuple(cor_fill), lado, int(alpha))
+        img = _ATLAS.get(chave)
+        if img is None:
+            img = self._criar_surface_dado(face, DADO_TAM, cor_fill, lado).copy()
+            img.fill((255, 255, 255, int(alpha)), special_flags=pygame.BLEND_RGBA_MULT)
+            img.set_alpha(255, pygame.RLEACCEL)
+            _ATLAS[chave] = img
+        return img
+
+    def aquecer_atlas(self, mao, lado):
+        """
+        Gera antes (ex. ao abrir a batalha) todas as rotações dos dados de uma mão
+        ([{"attr","faces"}, ...]), pra que o 1º lançamento forte já seja só blit.
+        """
+        for dado in mao:
+            cor_fill = DICE_TYPES[dado["attr"]]
+            for face in set(dado.get("faces") or [1]):
+                for passo in range(360 // ROT_PASSO_GRAUS):
+                    self._pecas_giradas(face, cor_fill, lado, passo, int(round(1.0 / ESCALA_PASSO)))
+
     # ============================================================
     # Push animado
     # ============================================================
@@ -312,61 +634,75 @@ class Tabuleiro:
             "dur": self.PUSH_MS,
         })
 
-    def _push_chain_animated(self, start_c, start_r, dc, dr, agora):
-        chain = []
-        c, r = start_c, start_r
-        while self._in_bounds(c, r) and self.grid[r][c] is not None:
-            chain.append((c, r))
-            c += dc
-            r += dr
-
-        if not chain:
+    def _fatia_empurrao(self, c, r, dc, dr):
+        """Vista (CANAIS, n) da linha/coluna de (c, r) até a borda, na direção do empurrão."""
+        if dc:
+            return self.dados[:, r, c::dc] if dc > 0 else self.dados[:, r, c::-1]
+        return self.dados[:, r::dr, c] if dr > 0 else self.dados[:, r::-1, c]
+
+    def _push_chain_animated(self, start_c, start_r, dc, dr, agora, animar=True):
+        fatia = self._fatia_empurrao(start_c, start_r, dc, dr)
+        vazias = np.flatnonzero(fatia[CH_ATTR] == VAZIA)
+        n = int(vazias[0]) if vazias.size else fatia.shape[1]  # tamanho da corrente
+        if n == 0:
             return
 
-        beyond_in = self._in_bounds(c, r)
-
-        if beyond_in:
-            for i in range(len(chain) - 1, -1, -1):
-                sc, sr = chain[i]
-                tc, tr = sc + dc, sr + dr
-                cell = self.grid[sr][sc]
-                self.grid[tr][tc] = cell
-                self._queue_push_anim(sc, sr, tc, tr, cell, agora)
-            self.grid[start_r][start_c] = None
-        else:
-            last_c, last_r = chain[-1]
-            self.grid[last_r][last_c] = None
-
-            for i in range(len(chain) - 2, -1, -1):
-                sc, sr = chain[i]
-                tc, tr = sc + dc, sr + dr
-                cell = self.grid[sr][sc]
-                self.grid[tr][tc] = cell
-                self._queue_push_anim(sc, sr, tc, tr, cell, agora)
+        # sem vaga depois da corrente: o último cai pra fora (e sai da soma)
+        movidos = n if n < fatia.shape[1] else n - 1
+        if movidos < n:
+            self._ajusta_somas(start_c + movidos * dc, start_r + movidos * dr, -1)
+        for i in range(movidos - 1, -1, -1) if animar else ():
+            sc, sr = start_c + i * dc, start_r + i * dr
+            self._queue_push_anim(sc, sr, sc + dc, sr + dr, _celula_de(self.dados, sc, sr), agora)
 
-            self.grid[start_r][start_c] = None
+        fatia[:, 1:movidos + 1] = fatia[:, :movidos].copy()
+        fatia[:, 0] = 0
+        fatia[CH_ATTR, 0] = VAZIA
+        self._mudou_grade()
 
     def _colocar_com_empurrao_animado(self, c, r, novo_cell, dc, dr, agora):
-        if self.grid[r][c] is not None:
+        if self._ocupada(c, r):
             self._push_chain_animated(c, r, dc, dr, agora)
-        self.grid[r][c] = novo_cell
-        # atualiza listas coletáveis
-        self._rebuild_listas_dados()
+        self._por(c, r, novo_cell)
 
     # ============================================================
     # Lançamento
     # ============================================================
-    def _lancar_mao(self, base_pos, base_cell, agora, modo):
-        # escolhe mão conforme lado ativo
-        mao = self.mao_inimiga if self.lado_ativo == "inimigo" else self.mao_aliada
-        if not mao:
+    def _params_modo(self, modo):
+        if modo == "normal":
+            return self.NORMAL_MAX, self.NORMAL_PESOS, self.ANIM_NORMAL
+        return self.FORTE_MAX, self.FORTE_PESOS, self.ANIM_FORTE
+
+    def tabela_pouso(self, n):
+        """Tabela exata (100, 100, 2) de pouso pra mão de n dados (DiceStats.tabela_pouso, memorizada)."""
+        modos = tuple((maxd, tuple(pesos)) for maxd, pesos, _anim in map(self._params_modo, MODOS_LANCAMENTO))
+        return tabela_pouso(int(n), BOARD_SIZE, modos)
+
+    def aquecer_pouso(self, tamanhos):
+        """
+        Monta numa thread as tabelas de pouso das mãos de n dados (n em `tamanhos`,
+        na ordem dada). _draw_pouso só mostra o mapa de um n com a tabela pronta.
+        """
+        faltam = [n for n in dict.fromkeys(int(n) for n in tamanhos) if n > 0 and n not in self._pouso_pedidos]
+        if not faltam:
             return
+        self._pouso_pedidos.update(faltam)
 
-        if modo == "normal":
-            maxd, pesos, anim = self.NORMAL_MAX, self.NORMAL_PESOS, self.ANIM_NORMAL
-        else:
-            maxd, pesos, anim = self.FORTE_MAX, self.FORTE_PESOS, self.ANIM_FORTE
+        def montar():
+            for n in faltam:
+                self.tabela_pouso(n)
+                self._pouso_prontos.add(n)
+
+        threading.Thread(target=montar, name="tabela-pouso", daemon=True).start()
 
+    def mapa_pouso(self, base_cell, n, modo="normal"):
+        """(BOARD_SIZE, BOARD_SIZE): nº esperado de dados em cada célula mirando em base_cell."""
+        c, r = base_cell
+        linha = self.tabela_pouso(n)[r * BOARD_SIZE + c, :, MODOS_LANCAMENTO.index(modo)]
+        return linha.reshape(BOARD_SIZE, BOARD_SIZE)
+
+    def _escolher_alvos(self, base_cell, n, maxd, pesos, modo):
+        """Células de destino (distintas enquanto der) e direção do push de um lançamento."""
         base_c, base_r = base_cell
 
         # direção do push: normal = pra fora, forte = pro centro
@@ -379,13 +715,13 @@ class Tabuleiro:
         usados = set()
         alvos = []
         tent = 0
-        n = len(mao)
-
+        ultimo = BOARD_SIZE - 1
         while len(alvos) < n and tent < 2200:
             tent += 1
             dx, dy = self._escolher_offset_por_dist(maxd, pesos)
-            c = self._clamp(base_c + dx, 0, BOARD_SIZE - 1)
-            r = self._clamp(base_r + dy, 0, BOARD_SIZE - 1)
+            c, r = base_c + dx, base_r + dy
+            c = 0 if c < 0 else ultimo if c > ultimo else c
+            r = 0 if r < 0 else ultimo if r > ultimo else r
             if (c, r) in usados:
                 continue
             usados.add((c, r))
@@ -396,10 +732,22 @@ class Tabuleiro:
         while len(alvos) < n:
             alvos.append((base_c, base_r))
 
+        return alvos, dc, dr
+
+    def _lancar_mao(self, base_pos, base_cell, agora, modo):
+        # escolhe mão conforme lado ativo
+        mao = self.mao_inimiga if self.lado_ativo == "inimigo" else self.mao_aliada
+        if not mao:
+            return
+
+        maxd, pesos, anim = self._params_modo(modo)
+
+        alvos, dc, dr = self._escolher_alvos(base_cell, len(mao), maxd, pesos, modo)
+
         for dado, (tc, tr) in zip(mao, alvos):
             faces = dado["faces"]
-            face_atual = random.choice(faces)
-            face_final = random.choice(faces)
+            face_atual = self.rng.choice(faces)
+            face_final = self.rng.choice(faces)
 
             self.fly.append({
                 "dado": dado,
@@ -452,7 +800,7 @@ class Tabuleiro:
 
                 troca_ms = s["troca_min_ms"] + (s["troca_max_ms"] - s["troca_min_ms"]) * e
                 if agora - s["t_ultima_troca"] >= troca_ms:
-                    s["face"] = random.choice(s["dado"]["faces"])
+                    s["face"] = self.rng.choice(s["dado"]["faces"])
                     s["t_ultima_troca"] = agora
 
                 sx, sy = s["start_pos"]
@@ -503,28 +851,10 @@ class Tabuleiro:
             "inimigo": {attr: soma_valores, ...}
           }
         Somente do que está FIXO no grid (não considera fly/push em voo).
+        Cópia dos totais mantidos (sem varrer o tabuleiro); use versao_somas
+        pra saber se mudou desde a última leitura.
         """
-        somas = {
-            "aliado":  {k: 0 for k in DICE_TYPES.keys()},
-            "inimigo": {k: 0 for k in DICE_TYPES.keys()},
-        }
-
-        for r in range(BOARD_SIZE):
-            for c in range(BOARD_SIZE):
-                cell = self.grid[r][c]
-                if cell is None:
-                    continue
-
-                lado = cell.get("lado", "aliado")
-                attr = cell.get("attr")
-                val = int(cell.get("valor", 0))
-
-                if lado not in somas:
-                    lado = "aliado"
-                if attr in somas[lado]:
-                    somas[lado][attr] += val
-
-        return somas
+        return {lado: dict(somas) for lado, somas in self._somas.items()}
 
     def esta_estavel(self):
         """
@@ -545,38 +875,78 @@ class Tabuleiro:
     # ============================================================
     # Draw
     # ============================================================
+    def _render_fundo(self):
+        """Xadrez + moldura do tabuleiro (coordenadas locais, origem no canto do tabuleiro)."""
+        fundo = pygame.Surface((BOARD_W, BOARD_H), 0, self.tela)
+        for r in range(BOARD_SIZE):
+            for c in range(BOARD_SIZE):
+                cor = (190, 190, 190) if (r + c) % 2 == 0 else (120, 120, 120)
+                pygame.draw.rect(fundo, cor, (c * CELL_SIZE, r * CELL_SIZE, CELL_SIZE, CELL_SIZE))
+        pygame.draw.rect(fundo, (60, 60, 70), (0, 0, BOARD_W, BOARD_H), 5)
+        return fundo
+
+    def _camada_dados(self):
+        """Fundo + dados assentados; só redesenha quando a grade mudou."""
+        if self._camada is not None and self._camada_versao == self._versao_grade:
+            return self._camada
+        if self._fundo is None:
+            self._fundo = self._render_fundo()
+        camada = self._camada = self._fundo.copy()
+        bx, by = BOARD_ORIGIN
+        rs, cs = np.nonzero(self.dados[CH_ATTR] != VAZIA)
+        for r, c in zip(rs.tolist(), cs.tolist()):
+            attr, valor, lado = (int(v) for v in self.dados[(CH_ATTR, CH_VALOR, CH_LADO), r, c])
+            img = self._criar_surface_dado(valor, DADO_TAM, DICE_TYPES[ATTRS[attr]], LADOS[lado])
+            cx, cy = self._grid_center(c, r)
+            camada.blit(img, img.get_rect(center=(cx - bx, cy - by)))
+        self._camada_versao = self._versao_grade
+        return camada
+
+    def _render_pouso(self, mapa):
+        """Camada (recortada no que tem chance > 0) com a % de cair dado em cada célula."""
+        rs, cs = np.nonzero(mapa > 0)
+        c0, r0 = int(cs.min()), int(rs.min())
+        camada = pygame.Surface(((int(cs.max()) - c0 + 1) * CELL_SIZE, (int(rs.max()) - r0 + 1) * CELL_SIZE), pygame.SRCALPHA)
+        fonte = self._fonte_dado(24)
+        a0, a1 = POUSO_ALPHA
+        for r, c in zip(rs.tolist(), cs.tolist()):
+            chance = min(1.0, float(mapa[r, c]))
+            rect = pygame.Rect((c - c0) * CELL_SIZE, (r - r0) * CELL_SIZE, CELL_SIZE, CELL_SIZE)
+            camada.fill((*POUSO_COR, int(a0 + (a1 - a0) * chance)), rect)
+            txt = fonte.render(f"{chance * 100:.0f}%", True, (20, 20, 20))
+            camada.blit(txt, txt.get_rect(bottomright=(rect.right - 4, rect.bottom - 2)))
+        camada.set_alpha(255, pygame.RLEACCEL)
+        return camada, (BOARD_ORIGIN[0] + c0 * CELL_SIZE, BOARD_ORIGIN[1] + r0 * CELL_SIZE)
+
+    def _draw_pouso(self, tela):
+        """Onde a mão ativa cai se lançar na célula do hover (tabela exata, só lookup + 1 blit)."""
+        mao = self.mao_inimiga if self.lado_ativo == "inimigo" else self.mao_aliada
+        if not mao:
+            return
+        if len(mao) not in self._pouso_prontos:
+            self.aquecer_pouso((len(mao),))  # tabela sai na thread; até lá, sem mapa
+            return
+        chave = (self.hover, len(mao), self.hover_modo)
+        if chave != self._pouso_chave:
+            self._pouso_camada = self._render_pouso(self.mapa_pouso(self.hover, len(mao), self.hover_modo))
+            self._pouso_chave = chave
+        camada, pos = self._pouso_camada
+        tela.blit(camada, pos)
+
     def _draw(self):
         tela = self.tela
         tela.fill((18, 18, 22))
 
-        # grid + hover + dados fixos
-        for r in range(BOARD_SIZE):
-            for c in range(BOARD_SIZE):
-                cor = (190, 190, 190) if (r + c) % 2 == 0 else (120, 120, 120)
-                rect = pygame.Rect(
-                    BOARD_ORIGIN[0] + c * CELL_SIZE,
-                    BOARD_ORIGIN[1] + r * CELL_SIZE,
-                    CELL_SIZE,
-                    CELL_SIZE
-                )
-                pygame.draw.rect(tela, cor, rect)
-
-                if self.hover == (c, r):
-                    pygame.draw.rect(tela, (255, 230, 120), rect, 5)
-
-                cell = self.grid[r][c]
-                if cell is not None:
-                    cor_fill = DICE_TYPES[cell["attr"]]
-                    lado = cell.get("lado", "aliado")
-                    img = self._criar_surface_dado(cell["valor"], DADO_TAM, cor_fill, lado)
-                    tela.blit(img, img.get_rect(center=self._grid_center(c, r)))
-
-        pygame.draw.rect(
-            tela,
-            (60, 60, 70),
-            (BOARD_ORIGIN[0], BOARD_ORIGIN[1], BOARD_W, BOARD_H),
-            5
-        )
+        # tabuleiro + dados fixos (camada cacheada) e hover por cima
+        tela.blit(self._camada_dados(), BOARD_ORIGIN)
+        if self.hover is not None:
+            self._draw_pouso(tela)
+            c, r = self.hover
+            area = pygame.Rect(BOARD_ORIGIN, (BOARD_W, BOARD_H))
+            clip = tela.get_clip()
+            tela.set_clip(area.inflate(-10, -10).clip(clip))  # moldura fica por cima do hover
+            pygame.draw.rect(tela, (255, 230, 120), (area.x + c * CELL_SIZE, area.y + r * CELL_SIZE, CELL_SIZE, CELL_SIZE), 5)
+            tela.set_clip(clip)
 
         # push overlay
         for p in self.push:
@@ -598,15 +968,13 @@ class Tabuleiro:
         for s in self.fly:
             cor_fill = DICE_TYPES[s["dado"]["attr"]]
             lado = s.get("lado", "aliado")
-            base = self._criar_surface_dado(s["face"], DADO_TAM, cor_fill, lado)
 
             if s["rolando"]:
                 for i, pos in enumerate(s["trail"]):
                     alpha = max(0, 110 - i * 14)
                     if alpha <= 0:
                         break
-                    ghost = base.copy()
-                    ghost.set_alpha(alpha)
+                    ghost = self._fantasma_dado(s["face"], cor_fill, lado, alpha)
                     tela.blit(ghost, ghost.get_rect(center=pos))
 
             scale = 1.0
@@ -614,5 +982,4 @@ class Tabuleiro:
                 dt = self._clamp((pygame.time.get_ticks() - s["t_impacto"]) / s["impacto_ms"], 0.0, 1.0)
                 scale = 1.0 - 0.06 * math.sin(math.pi * dt)
 
-            img = pygame.transform.rotozoom(base, s["angulo"], scale)
-            tela.blit(img, img.get_rect(center=s["pos"]))
+            self._blit_dado_girado(tela, s["face"], cor_fill, lado, s["angulo"], scale, s["pos"])
@@ -0,0 +1,202 @@
+# TeamCombat.py
+import numpy as np
+
+from CombatMath import CombatProfile
+from Player import MAPA_STATS_CSV, multiplicador_estrelas
+from CombatSim import SEM_VENCEDOR, VENCE_A, VENCE_B, _resumo
+
+# ============================================================
+# COMBATE POR UNIDADE (times de até 4 brawlers)
+# Cada brawler escalado em combate_slots luta como unidade própria (vida,
+# velocidade, alvo). Tudo em colunas NumPy: stats (2, U) e vida (n, 2, U),
+# com n lutas independentes resolvidas de uma vez, igual CombatSim.
+#
+# Regras de um round (adaptação de execute_round pra times):
+#   - ordem fixa por velocidade (maior primeiro; empate: lado A, depois slot);
+#   - fase física: cada unidade viva ataca a unidade inimiga viva com menos vida;
+#   - fase mágica: mesma ordem e mesma escolha de alvo;
+#   - regra de _hit_slots: se o inimigo vivo mais rápido tem 2x a velocidade da
+#     unidade, ela perde o ataque físico; com 3x, perde o mágico também;
+#   - no fim, regeneração das unidades vivas.
+# Percentuais (acerto, crit, vampirismo...) vão por unidade, lidos do perfil de
+# cada uma: as montadas a partir de Cartucho/CSV recebem os do player, e um
+# CombatProfile pronto mantém os seus.
+# ============================================================
+SLOTS = 4
+MAX_RONDAS = 200
+
+_COLUNAS = ("velocidade", "raw_fisico", "raw_magico", "defesa_fisica", "defesa_magica", "pen_split", "regen", "vida_max")
+_PCT = ("p_hit", "p_crit", "crit_mult", "amp", "red", "vamp")
+
+
+def perfil_unidade(fonte, percentuais=None, estrelas=None) -> CombatProfile:
+    """
+    CombatProfile de um brawler sozinho: Cartucho (usa .estrelas) ou dict do CSV.
+    Stats escalam por multiplicador_estrelas, igual sync_from_grid.
+    """
+    if estrelas is None:
+        estrelas = getattr(fonte, "estrelas", 0) or 0
+    mult = multiplicador_estrelas(estrelas)
+    st = fonte.get("stats", {}) if isinstance(fonte, dict) else getattr(fonte, "stats", {})
+    st = st or {}
+
+    def stat(k):
+        return int(round(int(st.get(k, 0) or 0) * mult))
+
+    totais = {attr: stat(k) for k, attr in MAPA_STATS_CSV.items()}
+    vida = stat("vida")
+    return CombatProfile(totais, percentuais, vida=vida, vida_max=vida)
+
+
+def montar_equipe(unidades, percentuais=None):
+    """
+    Colunas do time: {stat: array (SLOTS,)} + "presente" (slot ocupado).
+    `unidades`: até SLOTS itens (CombatProfile, Cartucho ou dict do CSV; None = slot vazio).
+    `percentuais` só valem pras unidades montadas aqui; CombatProfile usa os próprios.
+    """
+    unidades = list(unidades)[:SLOTS]
+    unidades += [None] * (SLOTS - len(unidades))
+
+    perfis = [None if u is None else u if isinstance(u, CombatProfile) else perfil_unidade(u, percentuais) for u in unidades]
+    equipe = {col: np.zeros(SLOTS, dtype=np.float64) for col in _COLUNAS + _PCT}
+    equipe["presente"] = np.array([p is not None for p in perfis])
+    for i, p in enumerate(perfis):
+        if p is None:
+            continue
+        for col in _COLUNAS + _PCT:
+            equipe[col][i] = getattr(p, col)
+    return equipe
+
+
+def equipe_do_player(player):
+    """Time de um PlayerEstrategista: os brawlers em combate_slots + percentuais dele."""
+    return montar_equipe(player.combate_slots, getattr(player, "percentuais", None))
+
+
+def _armor_mult(armor):
+    # mesma curva de _armor_multiplier_lol, vetorizada
+    m = 100.0 / (100.0 + np.abs(armor))
+    return np.where(armor >= 0, m, 2.0 - m)
+
+
+def _ordem(eq_a, eq_b):
+    """Atores (lado, slot) em ordem de velocidade; só slots ocupados."""
+    atores = []
+    for lado, eq in enumerate((eq_a, eq_b)):
+        for s in range(SLOTS):
+            if eq["presente"][s]:
+                atores.append((-eq["velocidade"][s], lado, s))
+    atores.sort()
+    return [(lado, s) for _v, lado, s in atores]
+
+
+def _fase(kind, ordem, st, pct, vida, vivo, rng, acc):
+    """Uma fase (física ou mágica): cada ator, na ordem, bate no inimigo vivo com menos vida."""
+    n = vida.shape[0]
+    linhas = np.arange(n)
+    raw_col = "raw_fisico" if kind == "fisico" else "raw_magico"
+    def_col = "defesa_fisica" if kind == "fisico" else "defesa_magica"
+    # razão de velocidade a partir da qual a unidade fica sem esse ataque
+    razao_perde = 2.0 if kind == "fisico" else 3.0
+    vel = np.maximum(1.0, st["velocidade"])
+
+    for lado, s in ordem:
+        ini = 1 - lado
+        mais_rapido = np.where(vivo[:, ini], vel[ini], 0.0).max(axis=1)
+        ativo = vivo[:, lado, s] & vivo[:, ini].any(axis=1) & (mais_rapido / vel[lado, s] < razao_perde)
+        if not ativo.any():
+            continue
+
+        alvo = np.argmin(np.where(vivo[:, ini], vida[:, ini], np.iinfo(np.int64).max), axis=1)
+
+        raw = st[raw_col][lado, s]
+        mitigado = raw * _armor_mult(st[def_col][ini, alvo] - st["pen_split"][lado, s])
+        base = mitigado * pct["amp"][lado, s] * pct["red"][ini, alvo]
+        rola = mitigado > 0
+
+        hit = ativo & (rng.random(n) <= pct["p_hit"][lado, s])
+        crit = hit & rola & (rng.random(n) <= pct["p_crit"][lado, s])
+        mult = np.where(crit, pct["crit_mult"][lado, s], 1.0)
+        dano = np.where(hit & rola, np.rint(np.maximum(0.0, base * mult)), 0).astype(np.int64)
+        heal = np.rint(dano * pct["vamp"][lado, s]).astype(np.int64)
+
+        vida[linhas, ini, alvo] = np.maximum(0, vida[linhas, ini, alvo] - dano)
+        vivo[linhas, ini, alvo] &= vida[linhas, ini, alvo] > 0
+        vida[:, lado, s] = np.minimum(int(st["vida_max"][lado, s]), vida[:, lado, s] + heal)
+
+        acc["damage"][:, lado] += dano
+        acc["heal"][:, lado] += heal
+
+
+def simular_equipes(a, b, n, *, ate_vencedor=True, max_rondas=MAX_RONDAS, seed=None,
+                    percentuais_a=None, percentuais_b=None):
+    """
+    n lutas independentes do time a contra o time b (dicts de montar_equipe,
+    ou listas de unidades). Retorna vencedor (SEM_VENCEDOR / VENCE_A / VENCE_B),
+    rondas e vida final por unidade (n, 2, SLOTS), mais um "resumo".
+    percentuais_a/_b vão pro montar_equipe quando a/b são listas.
+    """
+    eq_a = a if isinstance(a, dict) else montar_equipe(a, percentuais_a)
+    eq_b = b if isinstance(b, dict) else montar_equipe(b, percentuais_b)
+    n = max(0, int(n))
+    rng = np.random.default_rng(seed)
+
+    st = {col: np.stack([eq_a[col], eq_b[col]]) for col in _COLUNAS}
+    pct = {col: np.stack([eq_a[col], eq_b[col]]) for col in _PCT}
+    regen = st["regen"].astype(np.int64)
+    vida_max = st["vida_max"].astype(np.int64)
+    presente = np.stack([eq_a["presente"], eq_b["presente"]])
+    ordem = _ordem(eq_a, eq_b)
+
+    vida = np.broadcast_to(np.where(presente, vida_max, 0), (n, 2, SLOTS)).copy()
+    vivo = vida > 0
+    acc = {k: np.zeros((n, 2), dtype=np.int64) for k in ("damage", "heal")}
+    rondas = np.zeros(n, dtype=np.int32)
+
+    vivos = np.arange(n)
+    limite = max(1, int(max_rondas)) if ate_vencedor else 1
+    for _ in range(limite):
+        if vivos.size == 0:
+            break
+        sub_vida, sub_vivo = vida[vivos], vivo[vivos]
+        sub_acc = {k: v[vivos] for k, v in acc.items()}
+
+        _fase("fisico", ordem, st, pct, sub_vida, sub_vivo, rng, sub_acc)
+        _fase("magico", ordem, st, pct, sub_vida, sub_vivo, rng, sub_acc)
+
+        ganho = np.where(sub_vivo, regen, 0)
+        sub_vida = np.where(sub_vivo, np.minimum(vida_max, sub_vida + ganho), sub_vida)
+        sub_acc["heal"] += ganho.sum(axis=2)
+
+        vida[vivos], vivo[vivos] = sub_vida, sub_vivo
+        for k, v in sub_acc.items():
+            acc[k][vivos] = v
+        rondas[vivos] += 1
+
+        de_pe = sub_vivo.any(axis=2)
+        vivos = vivos[de_pe[:, 0] & de_pe[:, 1]]
+
+    de_pe = vivo.any(axis=2)
+    vencedor = np.full(n, SEM_VENCEDOR, dtype=np.int8)
+    vencedor[~de_pe[:, 1]] = VENCE_A
+    vencedor[de_pe[:, 1] & ~de_pe[:, 0]] = VENCE_B
+
+    total = max(1, n)
+    resumo = {
+        "vitoria_a": float(np.count_nonzero(vencedor == VENCE_A)) / total,
+        "vitoria_b": float(np.count_nonzero(vencedor == VENCE_B)) / total,
+        "sem_vencedor": float(np.count_nonzero(vencedor == SEM_VENCEDOR)) / total,
+        "rondas": _resumo(rondas),
+        "sobreviventes": (_resumo(vivo[:, 0].sum(axis=1)), _resumo(vivo[:, 1].sum(axis=1))),
+    }
+    for k, arr in acc.items():
+        resumo[k] = (_resumo(arr[:, 0]), _resumo(arr[:, 1]))
+
+    return {
+        "n": n,
+        "vida": vida,
+        "rondas": rondas,
+        "vencedor": vencedor,
+        **acc,
+        "resumo": resumo,
+    }
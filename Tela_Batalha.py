@@ -1,12 +1,17 @@
 import pygame
-import random
 
 from Tabuleiro import Tabuleiro
-from Player import PlayerBatalha, PlayerEstrategista, ATRIBUTOS
+from Player import ATRIBUTOS
+from BattleEngine import MotorBatalha, preparar_players, FASE_ESCOLHA_MS, FASE_PRE_DANO_MS, ANIM_STEP_MS, BONUS_VITORIA
 from VisualEffects import aplicar_filtro_luminosidade
-from CombatMath import execute_round
+from CombatExact import previa_round, PreviaVitoria
 from BattleAnimation import build_anim_steps, draw_acao_batalha, calc_collision_t
 
+# resolução do indicador de vitória (menos baldes/rondas = tabela nova sai mais rápido
+# quando os stats mudam; o que passar de ITER_INDICADOR rondas conta como sem fim)
+BALDES_INDICADOR = 24
+ITER_INDICADOR = 2000
+
 
 def _draw_pause_btn(tela, rect, label, font, mouse_pos):
     hover = rect.collidepoint(mouse_pos)
@@ -23,98 +28,56 @@ def _draw_status(tela, texto, timer_s):
     tela.blit(t, (tela.get_width() // 2 - t.get_width() // 2, 18))
 
 
+def _draw_previa(tela, fonte, p1, p2, perfis):
+    # mesmos perfis do round (MotorBatalha.perfis()), com as vidas de agora
+    previa = previa_round(*perfis, p1.vida, p2.vida)
+    esp_1, esp_2 = previa["vida_esperada"]
+    ko_1, ko_2 = previa["prob_ko"]
+    txt = (
+        f"Prévia: {p1.nome} ~{int(round(esp_1))} HP (KO {ko_1 * 100:.0f}%)"
+        f"   |   {p2.nome} ~{int(round(esp_2))} HP (KO {ko_2 * 100:.0f}%)"
+    )
+    t = fonte.render(txt, True, (225, 230, 245))
+    tela.blit(t, (tela.get_width() // 2 - t.get_width() // 2, 62))
+
+
+def _draw_chance_vitoria(tela, fonte, chance, pos):
+    t = fonte.render(f"Vitória: {chance * 100:.0f}%", True, (255, 230, 120))
+    tela.blit(t, pos)
+
+
 def TelaBatalha(tela, relogio, estados, config, info=None):
     tabuleiro = Tabuleiro(tela)
 
-    p1_compartilhado = PlayerEstrategista("PLAYER", lado="aliado", ouro_inicial=0)
     dados_player = (info or {}).get("player_aliado") if isinstance(info, dict) else None
-    if isinstance(dados_player, dict):
-        p1_compartilhado.carregar_estado_compartilhado(dados_player)
-
-    nome_player = str(p1_compartilhado.nome or "PLAYER")
-    nivel_player = 2
-    if isinstance(dados_player, dict):
-        nivel_player = max(1, int(dados_player.get("nivel", nivel_player) or nivel_player))
-    p1 = PlayerBatalha(nome_player, lado="aliado", nivel=nivel_player)
-    p2 = PlayerBatalha("Inimigo", lado="inimigo", nivel=p1.nivel)
-
-    vida_player = max(1, int(p1_compartilhado.vida_max or 1))
-    p1.vida_max = vida_player
-    p1.vida = max(0, min(vida_player, int(p1_compartilhado.vida or vida_player)))
-
-    vida_ref = max(200, int(p1_compartilhado.vida_max or 0))
-    p2.vida_max = int(vida_ref * random.uniform(0.85, 1.15))
-    p2.vida = p2.vida_max
-
-    ativos_aliados = [a for a in ATRIBUTOS if p1_compartilhado.dados_selecionados.get(a)]
-    for attr in ativos_aliados[:p1.max_ativos()]:
-        p1.toggle_attr_ativo(attr)
-    if not p1.ativos_lista():
-        p1.toggle_attr_ativo("regeneracao")
-        p1.toggle_attr_ativo("dano_fisico")
-        p1.toggle_attr_ativo("dano_magico")
-
-    for attr in ATRIBUTOS:
-        base_player = int(p1_compartilhado.totais.get(attr, 0))
-        p1.set_base(attr, base_player)
-        if base_player <= 0:
-            p2.set_base(attr, random.randint(0, 40))
-        else:
-            p2.set_base(attr, int(base_player * random.uniform(0.8, 1.2)))
-
-    p1.ouro = int(p1_compartilhado.ouro)
-    p1.set_percentuais(p1_compartilhado.percentuais)
-    p2.set_percentuais(p1_compartilhado.percentuais)
-
-    ativos_inimigos = random.sample(ATRIBUTOS, k=min(p2.max_ativos(), len(ATRIBUTOS)))
-    for attr in ativos_inimigos:
-        p2.toggle_attr_ativo(attr)
-
-    last_somas = {
-        "aliado": {a: 0 for a in ATRIBUTOS},
-        "inimigo": {a: 0 for a in ATRIBUTOS},
-    }
-
-    def aplicar_somas_nos_players(agora):
-        nonlocal last_somas
-        somas = tabuleiro.get_somas_por_lado()
-        for attr in ATRIBUTOS:
-            novo = int(somas["aliado"].get(attr, 0))
-            if novo != last_somas["aliado"][attr]:
-                p1.set_intensificador(attr, novo, agora)
-                last_somas["aliado"][attr] = novo
-        for attr in ATRIBUTOS:
-            novo = int(somas["inimigo"].get(attr, 0))
-            if novo != last_somas["inimigo"][attr]:
-                p2.set_intensificador(attr, novo, agora)
-                last_somas["inimigo"][attr] = novo
-
-    def iniciar_round(agora):
-        tabuleiro.limpar_tabuleiro()
-        tabuleiro.mao_aliada = p1.get_dados_ativos_para_lancar()
-        tabuleiro.mao_inimiga = p2.get_dados_ativos_para_lancar()
-        tabuleiro.set_lado_ativo("aliado")
-        # inimigo já lança para o jogador ter 8s para responder
-        tabuleiro.lancar_automatico("inimigo", agora)
+    p1_compartilhado, p1, p2 = preparar_players(dados_player)
+    motor = MotorBatalha(p1, p2, tabuleiro=tabuleiro)
+    tabuleiro.aquecer_atlas(p1.get_dados_ativos_para_lancar(), "aliado")
+    tabuleiro.aquecer_atlas(p2.get_dados_ativos_para_lancar(), "inimigo")
+    # mapas de pouso de todo tamanho de mão possível (a mão atual primeiro), fora do frame
+    n_mao = len(p1.get_dados_ativos_para_lancar())
+    tabuleiro.aquecer_pouso([n_mao, *range(1, min(p1.max_ativos(), len(ATRIBUTOS)) + 1)])
 
     fonte_pausa = pygame.font.Font("Fontes/FontePadrão.ttf", 30)
+    fonte_previa = pygame.font.Font("Fontes/FontePadrão.ttf", 22)
+    chance_vitoria = None
+    previa_vitoria = PreviaVitoria(baldes=BALDES_INDICADOR, max_iter=ITER_INDICADOR)
     pausa_ativa = False
     btn_quitar = pygame.Rect(0, 0, 240, 70)
     btn_voltar = pygame.Rect(0, 0, 240, 70)
     btn_config = pygame.Rect(0, 0, 240, 70)
 
-    fase = "escolha"
     fase_inicio = pygame.time.get_ticks()
-    fase_duracao = 8000
+    fase_duracao = FASE_ESCOLHA_MS
     anim_steps = []
     anim_idx = 0
     anim_inicio = 0
-    anim_step_ms = 4200
+    anim_step_ms = ANIM_STEP_MS
     vencedor_nome = None
     fim_delay_ms = 1200
     fim_inicio = 0
-    bonus_vitoria = 8
-    iniciar_round(fase_inicio)
+    bonus_vitoria = BONUS_VITORIA
+    motor.iniciar_round(fase_inicio)
 
     def aplicar_efeito_acao(acao):
         atacante = p1 if acao["attacker"] == p1.nome else p2
@@ -167,28 +130,33 @@ def TelaBatalha(tela, relogio, estados, config, info=None):
             tabuleiro.update(events, agora)
 
         if tabuleiro.esta_estavel():
-            aplicar_somas_nos_players(agora)
+            motor.aplicar_somas(agora)
+            if vencedor_nome is None:
+                # tabela por stats sai na thread; até lá fica o último valor
+                perfil_1, perfil_2 = motor.perfis()
+                previa_vitoria.atualizar(perfil_1, perfil_2)
+                chance = previa_vitoria.consultar(perfil_1, perfil_2, p1.vida, p2.vida)
+                if chance is not None:
+                    chance_vitoria = chance["vitoria_a"]
 
         if not pausa_ativa and vencedor_nome is None:
             fase_elapsed = agora - fase_inicio
-            if fase == "escolha":
+            if motor.fase == "escolha":
                 if fase_elapsed >= fase_duracao:
-                    if tabuleiro.mao_aliada:
-                        tabuleiro.lancar_automatico("aliado", agora)
-                    fase = "pre_dano"
+                    motor.encerrar_escolha(agora)
                     fase_inicio = agora
-                    fase_duracao = 12000
-            elif fase == "pre_dano" and fase_elapsed >= fase_duracao and tabuleiro.esta_estavel():
+                    fase_duracao = FASE_PRE_DANO_MS
+            elif motor.fase == "pre_dano" and fase_elapsed >= fase_duracao and tabuleiro.esta_estavel():
+                # a vida só muda de verdade quando cada passo da animação termina
                 vida_p1_pre = p1.vida
                 vida_p2_pre = p2.vida
-                resultado = execute_round(p1, p2)
-                anim_steps = build_anim_steps(resultado["logs"])
+                resultado = motor.resolver_round()
+                anim_steps = build_anim_steps(resultado["logs"], resultado["inicio_log"])
                 p1.vida = vida_p1_pre
                 p2.vida = vida_p2_pre
                 anim_idx = 0
                 anim_inicio = agora
-                fase = "animacao"
-            elif fase == "animacao":
+            elif motor.fase == "animacao":
                 if anim_idx < len(anim_steps):
                     acao = anim_steps[anim_idx]
                     t_anim = min(1.0, (agora - anim_inicio) / max(1, anim_step_ms))
@@ -211,26 +179,29 @@ def TelaBatalha(tela, relogio, estados, config, info=None):
                         vencedor_nome = p1.nome
                         fim_inicio = agora
                     else:
-                        fase = "escolha"
                         fase_inicio = agora
-                        fase_duracao = 8000
-                        iniciar_round(agora)
+                        fase_duracao = FASE_ESCOLHA_MS
+                        motor.iniciar_round(agora)
 
         if not pausa_ativa:
             p1.draw_ficha(tela, agora, lado="esquerda", pos=(18, tela.get_height() - p1.FICHA_H - 18), mostrar_botoes=True)
             p2.draw_ficha(tela, agora, lado="direita", pos=(tela.get_width() - p2.FICHA_W - 18, 18), mostrar_botoes=True)
 
+            if chance_vitoria is not None and vencedor_nome is None:
+                _draw_chance_vitoria(tela, fonte_previa, chance_vitoria, (24, tela.get_height() - p1.FICHA_H - 18 - 34))
+
             timer_s = max(0, (fase_duracao - (agora - fase_inicio) + 999) // 1000)
             if vencedor_nome:
                 _draw_status(tela, f"Vencedor: {vencedor_nome}", 0)
-            elif fase == "escolha":
+            elif motor.fase == "escolha":
                 _draw_status(tela, "Escolha e lance os dados", timer_s)
-            elif fase == "pre_dano":
+            elif motor.fase == "pre_dano":
                 _draw_status(tela, "Preparando danos", timer_s)
+                _draw_previa(tela, fonte_previa, p1, p2, motor.perfis())
             else:
                 _draw_status(tela, "Aplicação de danos", timer_s)
 
-            if fase == "animacao" and anim_idx < len(anim_steps):
+            if motor.fase == "animacao" and anim_idx < len(anim_steps):
                 pos_por_nome = {
                     p1.nome: (18 + p1.FICHA_W // 2, tela.get_height() - p1.FICHA_H // 2 - 18),
                     p2.nome: (tela.get_width() - p2.FICHA_W // 2 - 18, 18 + p2.FICHA_H // 2),
@@ -271,4 +242,5 @@ def TelaBatalha(tela, relogio, estados, config, info=None):
         aplicar_filtro_luminosidade(tela, config.get("Luminosidade", 75))
         pygame.display.flip()
 
+    previa_vitoria.fechar()
     return
@@ -73,6 +73,10 @@ def TelaEstrategista(tela, relogio, estados, config, info=None):
     for d in start_defs:
         banco.add_to_first_free(Cartucho(d, BANK_CARD_W, BANK_CARD_H))
 
+    # raiz do desfazer só agora, com o banco inicial já semeado
+    if hasattr(grid, "iniciar_historico"):
+        grid.iniciar_historico()
+
     # força recálculo inicial
     if not hasattr(grid, "campo_dirty"):
         grid.campo_dirty = True
@@ -168,4 +172,6 @@ def TelaEstrategista(tela, relogio, estados, config, info=None):
         aplicar_filtro_luminosidade(tela, config.get("Luminosidade", 75))
         pygame.display.flip()
 
+    if hasattr(grid, "fechar"):
+        grid.fechar()
     return
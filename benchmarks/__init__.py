@@ -0,0 +1,24 @@
+# benchmarks/__init__.py
+"""
+Benchmarks headless (SDL_VIDEODRIVER=dummy) de combate, regras da grid e tabuleiro de dados.
+
+    python -m benchmarks                      # roda tudo, imprime JSON
+    python -m benchmarks -k grid              # só casos com "grid" no nome
+    python -m benchmarks --salvar-baseline    # grava benchmarks/baseline.json
+    python -m benchmarks --baseline           # compara com benchmarks/baseline.json (sai com 1 se regrediu)
+    python -m benchmarks --baseline outro.json
+
+benchmarks/baseline.json vai versionado; os tempos são da máquina que gerou,
+então em outra máquina rode --salvar-baseline antes de comparar.
+"""
+import os
+import sys
+
+# precisa vir antes de qualquer import de pygame
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if RAIZ not in sys.path:
+    sys.path.insert(0, RAIZ)
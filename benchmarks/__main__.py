@@ -0,0 +1,53 @@
+# benchmarks/__main__.py
+import argparse
+import json
+import os
+import sys
+
+import benchmarks  # noqa: F401  (driver dummy antes do pygame)
+from benchmarks import casos as _casos  # noqa: F401  (registra os casos)
+from benchmarks.harness import (
+    BASELINE_PADRAO,
+    TOLERANCIA_PADRAO,
+    carregar_json,
+    comparar,
+    rodar,
+    salvar_json,
+)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="python -m benchmarks", description="Benchmarks headless (ops/s, p50/p99).")
+    ap.add_argument("-k", dest="filtro", default=None, help="só casos cujo nome contém esse texto")
+    ap.add_argument("--escala", type=float, default=1.0, help="multiplica as repetições (ex.: 0.1 pra rodada rápida)")
+    ap.add_argument("--saida", default=None, help="grava o JSON do resultado nesse arquivo")
+    ap.add_argument(
+        "--baseline", nargs="?", const=BASELINE_PADRAO, default=None, metavar="ARQUIVO",
+        help="compara com esse JSON de baseline (sem ARQUIVO: benchmarks/baseline.json)",
+    )
+    ap.add_argument("--tolerancia", type=float, default=TOLERANCIA_PADRAO)
+    ap.add_argument("--salvar-baseline", nargs="?", const=BASELINE_PADRAO, default=None, metavar="ARQUIVO")
+    args = ap.parse_args(argv)
+    if args.baseline and not os.path.isfile(args.baseline):
+        ap.error(f"baseline não encontrado: {args.baseline} (gere com --salvar-baseline [ARQUIVO])")
+
+    resultado = rodar(args.filtro, escala=args.escala)
+
+    regrediu = False
+    if args.baseline:
+        comp = comparar(resultado, carregar_json(args.baseline), args.tolerancia)
+        resultado["comparacao"] = comp
+        regrediu = any(c["regrediu"] for c in comp.values())
+
+    texto = json.dumps(resultado, indent=2, ensure_ascii=False)
+    print(texto)
+    if args.saida:
+        salvar_json(args.saida, resultado)
+    if args.salvar_baseline:
+        salvar_json(args.salvar_baseline, {"meta": resultado["meta"], "casos": resultado["casos"]})
+
+    return 1 if regrediu else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
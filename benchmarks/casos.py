@@ -0,0 +1,258 @@
+# benchmarks/casos.py
+import itertools
+import random
+
+from benchmarks.harness import caso
+
+# ============================================================
+# CENÁRIOS
+# ============================================================
+_STATS_DUELO = {
+    "dano_fisico": 60,
+    "dano_magico": 40,
+    "defesa_fisica": 30,
+    "defesa_magica": 20,
+    "regeneracao": 10,
+    "mana": 5,
+    "velocidade": 30,
+    "penetracao": 10,
+}
+_PCT_DUELO = {"assertividade": 90, "chance_crit": 20, "dano_crit": 50, "vampirismo": 10}
+
+
+def _estado_player():
+    return {
+        "nome": "BENCH",
+        "vida_max": 900,
+        "vida": 900,
+        "totais": dict(_STATS_DUELO),
+        "percentuais": dict(_PCT_DUELO),
+        "nivel": 3,
+        "ativos": ["dano_fisico", "dano_magico", "regeneracao"],
+    }
+
+
+def _cartuchos(n):
+    from Brawl_Stars.Brawl import CARTUCHOS
+    from Cartucho import Cartucho
+
+    return [Cartucho(d, 80, 60) for d in itertools.islice(itertools.cycle(CARTUCHOS), n)]
+
+
+def _grid(tela, ocupacao, tamanho=None):
+    """Grid com `ocupacao` células preenchidas linha a linha (sem checar regra: só carga)."""
+    from Grid import Grid
+
+    grid = Grid(tela) if tamanho is None else Grid(tela, tamanho, tamanho)
+    for cartucho, (r, c) in zip(_cartuchos(ocupacao), itertools.product(range(grid.rows), range(grid.cols))):
+        grid.place(cartucho, c, r)
+    return grid
+
+
+def _grid_esparsa(tela):
+    return _grid(tela, 8)
+
+
+def _grid_grande(tela):
+    # 30x30 com a mesma carga da cheia: custo deve seguir as ocupadas, não a área
+    return _grid(tela, 90, tamanho=30)
+
+
+def _grid_cheia(tela):
+    # última linha livre: can_place ainda tem onde testar vizinhança/sinergia
+    return _grid(tela, 90)
+
+
+# ============================================================
+# COMBATE
+# ============================================================
+def _duelistas():
+    from Player import PlayerBatalha
+
+    random.seed(1)
+    p1 = PlayerBatalha("A", lado="aliado", nivel=3)
+    p2 = PlayerBatalha("B", lado="inimigo", nivel=3)
+    for p in (p1, p2):
+        for attr, v in _STATS_DUELO.items():
+            p.set_base(attr, v)
+        p.set_percentuais(_PCT_DUELO)
+        p.vida_max = 100_000
+    return p1, p2
+
+
+@caso("combate.execute_round", repeticoes=20000, aquecimento=500)
+def _execute_round(tela):
+    from CombatMath import execute_round
+
+    p1, p2 = _duelistas()
+
+    def op():
+        p1.vida = p2.vida = 100_000
+        execute_round(p1, p2)
+
+    return op
+
+
+@caso("combate.execute_round_perfis", repeticoes=20000, aquecimento=500)
+def _execute_round_perfis(tela):
+    # caminho do MotorBatalha: perfis montados fora do round
+    from CombatMath import CombatProfile, execute_round, CombatLog
+
+    p1, p2 = _duelistas()
+    pa, pd = CombatProfile.from_player(p1), CombatProfile.from_player(p2)
+    log = CombatLog()
+
+    def op():
+        p1.vida = p2.vida = 100_000
+        log.limpar()
+        execute_round(p1, p2, pa, pd, log=log)
+
+    return op
+
+
+@caso("combate.batalha_headless", repeticoes=300, aquecimento=10)
+def _batalha_headless(tela):
+    from BattleEngine import simular_batalha
+
+    estado = _estado_player()
+    seeds = itertools.count()
+
+    def op():
+        simular_batalha(estado, seed=next(seeds))
+
+    return op
+
+
+# ============================================================
+# GRID
+# ============================================================
+def _can_place(montar):
+    def setup(tela):
+        grid = montar(tela)
+        novo = _cartuchos(1)[0]
+        celulas = [(c, r) for r in range(grid.rows) for c in range(grid.cols) if (c, r) not in grid.occ]
+        alvos = itertools.cycle(celulas)
+
+        def op():
+            c, r = next(alvos)
+            grid.can_place(novo, c, r)
+
+        return op
+
+    return setup
+
+
+def _valid_cells(montar, frio=True):
+    """frio: versão nova a cada chamada (mapa recalculado); senão, o frame típico de arrasto."""
+    def setup(tela):
+        grid = montar(tela)
+        grid.dragging = _cartuchos(1)[0]
+        if not frio:
+            return grid._recompute_valid_cells
+
+        def op():
+            grid.regras.versao += 1
+            grid._recompute_valid_cells()
+
+        return op
+
+    return setup
+
+
+caso("grid.can_place.esparsa", repeticoes=20000, aquecimento=200)(_can_place(_grid_esparsa))
+caso("grid.can_place.cheia", repeticoes=20000, aquecimento=200)(_can_place(_grid_cheia))
+caso("grid.recompute_valid_cells.esparsa", repeticoes=300, aquecimento=10)(_valid_cells(_grid_esparsa))
+caso("grid.recompute_valid_cells.cheia", repeticoes=300, aquecimento=10)(_valid_cells(_grid_cheia))
+caso("grid.recompute_valid_cells.30x30", repeticoes=300, aquecimento=10)(_valid_cells(_grid_grande))
+caso("grid.valid_cells_arrasto.cheia", repeticoes=20000, aquecimento=200)(_valid_cells(_grid_cheia, frio=False))
+
+
+@caso("grid.sugerir_layout.banco12", repeticoes=50, aquecimento=2)
+def _sugerir_layout(tela):
+    from GridRules import GridRules
+    from GridSolver import sugerir_layout
+
+    banco = random.Random(0).sample(_cartuchos(40), 12)
+    regras = GridRules()
+    return lambda: sugerir_layout(regras, banco, orcamento_ms=1000)
+
+
+# ============================================================
+# TABULEIRO DE DADOS
+# ============================================================
+def _tabuleiro(tela, cheio):
+    from Tabuleiro import Tabuleiro, BOARD_SIZE, DICE_TYPES
+
+    tab = Tabuleiro(tela, rng=random.Random(1))
+    if cheio:
+        attrs = list(DICE_TYPES)
+        for r in range(BOARD_SIZE):
+            for c in range(BOARD_SIZE):
+                tab.grid[r][c] = {
+                    "attr": attrs[(r * BOARD_SIZE + c) % len(attrs)],
+                    "pot": "std",
+                    "valor": 1 + (r + c) % 6,
+                    "lado": "aliado" if (r + c) % 2 else "inimigo",
+                }
+    return tab
+
+
+@caso("tabuleiro.get_somas_por_lado", repeticoes=5000, aquecimento=100)
+def _somas(tela):
+    return _tabuleiro(tela, cheio=True).get_somas_por_lado
+
+
+@caso("tabuleiro.lancar_mao", repeticoes=5000, aquecimento=100)
+def _lancar_mao(tela):
+    tab = _tabuleiro(tela, cheio=False)
+    mao = [{"attr": a, "pot": "std", "faces": [1, 2, 3, 4, 5, 6]} for a in ("dano_fisico", "dano_magico", "regeneracao", "velocidade")]
+    celula = (4, 6)
+    pos = tab._grid_center(*celula)
+
+    def op():
+        tab.mao_aliada = list(mao)
+        tab.lado_ativo = "aliado"
+        tab._lancar_mao(pos, celula, 0, "normal")
+        tab.fly.clear()
+
+    return op
+
+
+@caso("tabuleiro.draw_voo_forte", repeticoes=1000, aquecimento=100)
+def _draw_voo_forte(tela):
+    # mão cheia lançada forte, congelada no meio do giro (rastro + rotação)
+    from Tabuleiro import DICE_TYPES
+
+    tab = _tabuleiro(tela, cheio=False)
+    attrs = list(DICE_TYPES)
+    tab.mao_aliada = [{"attr": attrs[i % len(attrs)], "pot": "std", "faces": [1, 2, 3, 4, 5, 6]} for i in range(10)]
+    tab._lancar_mao(tab._grid_center(1, 1), (1, 1), 0, "forte")
+    for agora in range(0, 400, 16):
+        tab._update_fly(agora)
+    return tab._draw
+
+
+# ============================================================
+# PLAYER
+# ============================================================
+def _sync(montar):
+    def setup(tela):
+        from Player import PlayerEstrategista
+
+        grid = montar(tela)
+        player = PlayerEstrategista("BENCH", lado="aliado")
+        player.grid = grid
+        em_campo = list(grid.occ.values())
+        player.combate_slots[:2] = em_campo[:2]
+        agora = itertools.count(0, 16)
+
+        def op():
+            player.sync_from_grid(next(agora))
+
+        return op
+
+    return setup
+
+
+caso("player.sync_from_grid.esparsa", repeticoes=5000, aquecimento=100)(_sync(_grid_esparsa))
+caso("player.sync_from_grid.cheia", repeticoes=2000, aquecimento=50)(_sync(_grid_cheia))
@@ -0,0 +1,128 @@
+# benchmarks/harness.py
+import gc
+import json
+import os
+import platform
+import time
+
+import pygame
+
+from benchmarks import RAIZ
+
+# baseline versionado junto do código (gerado com --salvar-baseline); os tempos são
+# da máquina de quem gerou: em outra máquina, gere o seu antes de comparar
+BASELINE_PADRAO = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+TOLERANCIA_PADRAO = 0.20  # 20% mais lento que o baseline = regressão (abaixo disso é ruído)
+
+_CASOS = {}
+
+
+def caso(nome, *, repeticoes=2000, aquecimento=50):
+    """
+    Registra um benchmark. A função decorada faz o setup e devolve a operação
+    (callable sem argumentos) que vai ser cronometrada chamada a chamada.
+    """
+    def deco(fn):
+        _CASOS[nome] = {"setup": fn, "repeticoes": repeticoes, "aquecimento": aquecimento}
+        return fn
+    return deco
+
+
+def casos():
+    return dict(_CASOS)
+
+
+def iniciar_headless(tamanho=(1920, 1080)):
+    """pygame com driver dummy + cwd na raiz (fontes/imagens são caminhos relativos)."""
+    os.chdir(RAIZ)
+    pygame.init()
+    return pygame.display.set_mode(tamanho)
+
+
+def _percentil(ordenado, p):
+    if not ordenado:
+        return 0.0
+    k = min(len(ordenado) - 1, max(0, int(round(p / 100.0 * (len(ordenado) - 1)))))
+    return ordenado[k]
+
+
+def medir(op, *, repeticoes, aquecimento):
+    for _ in range(aquecimento):
+        op()
+
+    amostras = []
+    gc_ativo = gc.isenabled()
+    gc.disable()
+    try:
+        relogio = time.perf_counter_ns
+        for _ in range(repeticoes):
+            t0 = relogio()
+            op()
+            amostras.append(relogio() - t0)
+    finally:
+        if gc_ativo:
+            gc.enable()
+
+    total_ns = sum(amostras)
+    amostras.sort()
+    return {
+        "repeticoes": repeticoes,
+        "ops_s": repeticoes / (total_ns / 1e9) if total_ns else float("inf"),
+        "p50_us": _percentil(amostras, 50) / 1e3,
+        "p99_us": _percentil(amostras, 99) / 1e3,
+    }
+
+
+def rodar(filtro=None, *, escala=1.0, tela=None):
+    tela = tela or iniciar_headless()
+    resultados = {}
+    for nome, c in _CASOS.items():
+        if filtro and filtro not in nome:
+            continue
+        op = c["setup"](tela)
+        resultados[nome] = medir(
+            op,
+            repeticoes=max(1, int(c["repeticoes"] * escala)),
+            aquecimento=max(0, int(c["aquecimento"] * escala)),
+        )
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "maquina": platform.machine(),
+            "escala": escala,
+        },
+        "casos": resultados,
+    }
+
+
+def comparar(atual, baseline, tolerancia=TOLERANCIA_PADRAO):
+    """
+    Por caso: razão ops/s (atual / baseline) e se regrediu além da tolerância.
+    Casos que não existem dos dois lados ficam de fora.
+    """
+    comp = {}
+    base = baseline.get("casos", {})
+    for nome, r in atual.get("casos", {}).items():
+        b = base.get(nome)
+        if not b or not b.get("ops_s"):
+            continue
+        razao = r["ops_s"] / b["ops_s"]
+        comp[nome] = {
+            "razao_ops_s": razao,
+            "p50_base_us": b.get("p50_us"),
+            "p99_base_us": b.get("p99_us"),
+            "regrediu": razao < (1.0 - tolerancia),
+        }
+    return comp
+
+
+def carregar_json(caminho):
+    with open(caminho, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def salvar_json(caminho, dados):
+    with open(caminho, "w", encoding="utf-8") as f:
+        json.dump(dados, f, indent=2, ensure_ascii=False)
+        f.write("\n")